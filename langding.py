@@ -2,4 +2,5 @@
 
 from src import main
 
-main.main()
+if __name__ == "__main__":
+    main.main()
@@ -0,0 +1,468 @@
+"""
+async_translator.py
+~~~~~~~~~~~~~~~~~~~
+
+Async API for embedding Langding in an asyncio service.
+AsyncLangdingTranslator sends requests with the providers' async clients
+and runs parsing, templating and file writes in worker threads, so many
+pages are translated at once in one event loop without blocking other
+coroutines. The translation memory, run budget, rate-limit scheduler,
+metrics and output stages are those of a wrapped LangdingTranslator.
+
+Usage:
+    async with AsyncLangdingTranslator("input", "output", batch=True) as translator:
+        await translator.process_files(html_files, ["Spanish", "French"])
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.batching import (
+    BATCH_SYSTEM_PROMPT,
+    BatchResponseError,
+    Untranslated,
+    batch_max_tokens,
+    build_batch_prompt,
+    build_prompt,
+    estimate_tokens,
+    parse_batch_response,
+    plan_batches,
+    reply_max_tokens,
+)
+from src.budget import BudgetExceeded
+from src.config import settings
+from src.http_client import build_http_client
+from src.logger import logger
+from src.main import SYSTEM_PROMPT, LangdingTranslator
+from src.metrics import token_usage
+from src.mock_provider import AsyncMockClient
+
+# LangdingTranslator options that rely on its thread pools and are not supported here
+UNSUPPORTED_OPTIONS = ("fallback_provider", "hedge", "multi_language", "checkpoint", "resume")
+
+
+class AsyncLangdingTranslator:
+    """Translator with coroutine methods, for use inside a running event loop."""
+
+    def __init__(self, input_dir: str, output_dir: str, **options: Any):
+        """
+        Initialize the translator.
+
+        Args:
+            input_dir: Directory containing input HTML files.
+            output_dir: Directory to save output files.
+            **options: Options of LangdingTranslator, such as cache_dir, batch,
+                concurrency (requests in flight at once), provider, incremental,
+                minify, precompress or negotiation.
+
+        Raises:
+            ValueError: If an option listed in UNSUPPORTED_OPTIONS is set.
+        """
+        unsupported = [name for name in UNSUPPORTED_OPTIONS if options.get(name)]
+        if unsupported:
+            raise ValueError(f"Not supported by the async translator: {', '.join(unsupported)}")
+
+        self.translator = LangdingTranslator(input_dir, output_dir, **options)
+        self._client = None
+        self._requests = asyncio.Semaphore(self.translator.concurrency)
+        # Pages share the redirect, negotiation table and manifest files
+        self._write_lock = asyncio.Lock()
+        self._cache_loaded = False
+
+    async def __aenter__(self) -> "AsyncLangdingTranslator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def client(self):
+        """Async AI provider client, created on first use."""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        """Replace the provider client, e.g. with a custom or mock async client."""
+        self._client = client
+
+    def _create_client(self):
+        """Import the provider's SDK and build its async client on a dedicated HTTP pool."""
+        provider = self.translator.provider
+        if provider == "mock":
+            return AsyncMockClient.from_settings()
+
+        # Retries are left to the scheduler, as in LangdingTranslator._create_client
+        options = {"max_retries": 0}
+        http_client = build_http_client(self.translator.concurrency, asynchronous=True)
+        if http_client is not None:
+            options["http_client"] = http_client
+
+        if provider == "anthropic":
+            from anthropic import AsyncAnthropic
+
+            return AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, **options)
+
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, **options)
+
+    async def _load_cache(self) -> None:
+        """Read the translation memory in a worker thread before the first lookup."""
+        if self.translator.cache is not None and not self._cache_loaded:
+            await asyncio.to_thread(self.translator.cache.load)
+            self._cache_loaded = True
+
+    async def _complete(self, system: str, prompt: str, max_tokens: int) -> str:
+        """Async variant of LangdingTranslator._complete."""
+        translator = self.translator
+        input_tokens = estimate_tokens(system) + estimate_tokens(prompt)
+        reservation = translator.budget.reserve(input_tokens, max_tokens)
+        try:
+            return await translator.scheduler.submit_async(
+                lambda: self._send(system, prompt, max_tokens), input_tokens + max_tokens
+            )
+        finally:
+            translator.budget.release(reservation)
+
+    async def _send_anthropic(self, system: str, prompt: str, max_tokens: int) -> Tuple[str, Any]:
+        """Anthropic Messages request; returns the reply and the object carrying usage."""
+        request = {
+            "model": self.translator.model,
+            "max_tokens": max_tokens,
+            "temperature": 0.3,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if self.translator.stream:
+            async with self.client.messages.stream(**request) as stream:
+                reply = "".join([text async for text in stream.text_stream])
+                return reply.strip(), await stream.get_final_message()
+
+        response = await self.client.messages.create(**request)
+        return response.content[0].text.strip(), response
+
+    async def _send_openai(self, system: str, prompt: str, max_tokens: int) -> Tuple[str, Any]:
+        """OpenAI chat completion request; returns the reply and the object carrying usage."""
+        request = {
+            "model": self.translator.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+        }
+        if self.translator.stream:
+            parts = []
+            usage_chunk = None
+            stream = await self.client.chat.completions.create(
+                **request, stream=True, stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if chunk.choices:
+                    parts.append(chunk.choices[0].delta.content or "")
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunk = chunk
+            return "".join(parts).strip(), usage_chunk
+
+        response = await self.client.chat.completions.create(**request)
+        return response.choices[0].message.content.strip(), response
+
+    async def _send(self, system: str, prompt: str, max_tokens: int) -> str:
+        """Perform the API request for _complete, at most concurrency at once."""
+        translator = self.translator
+        async with self._requests:
+            start = time.perf_counter()
+            try:
+                if translator.provider == "anthropic":
+                    reply, response = await self._send_anthropic(system, prompt, max_tokens)
+                else:
+                    reply, response = await self._send_openai(system, prompt, max_tokens)
+            except Exception:
+                translator.metrics.observe_request(
+                    translator.provider, time.perf_counter() - start, failed=True
+                )
+                raise
+
+        usage = token_usage(response)
+        translator.metrics.observe_request(translator.provider, time.perf_counter() - start, *usage)
+        if not any(usage):
+            # The response reports no usage, count the estimate instead
+            usage = (estimate_tokens(system) + estimate_tokens(prompt), estimate_tokens(reply))
+        translator.budget.record(*usage)
+        return reply
+
+    async def translate_text_with_context(
+        self, text: str, target_language: str, context: str
+    ) -> str:
+        """
+        Translate text to target language using AI API with context.
+
+        Args:
+            text: Text to translate.
+            target_language: Target language name.
+            context: Context for better translation.
+
+        Returns:
+            Translated text, the original text on error or once over budget.
+        """
+        await self._load_cache()
+        cache = self.translator.cache
+        cache_key = None
+        if cache is not None:
+            cache_key = self.translator._cache_key(text, target_language, context)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            prompt = build_prompt(text, target_language, context)
+            translated = await self._complete(SYSTEM_PROMPT, prompt, reply_max_tokens(text))
+
+        except BudgetExceeded:
+            return Untranslated(text, "budget")  # Over budget, keep the original text
+
+        except Exception as e:
+            logger.error(f"Translation error for '{text}': {e}")
+            return Untranslated(text)  # Return original text on error
+
+        if cache_key is not None:
+            cache.set(cache_key, translated)
+        return translated
+
+    async def _translate_chunk(
+        self, texts: List[str], target_language: str, context: str
+    ) -> List[str]:
+        """
+        Translate one token-bounded batch.
+
+        An unparseable reply falls back to one request per text, a failed request
+        keeps the source texts, as in LangdingTranslator.translate_batch.
+        """
+        if len(texts) > 1:
+            try:
+                reply = await self._complete(
+                    BATCH_SYSTEM_PROMPT,
+                    build_batch_prompt(texts, target_language, context),
+                    batch_max_tokens(texts),
+                )
+                translated = parse_batch_response(reply, len(texts))
+            except BudgetExceeded:
+                return [Untranslated(text, "budget") for text in texts]
+            except BatchResponseError as e:
+                logger.warning(
+                    f"Batch reply for {len(texts)} texts to {target_language} could not be "
+                    f"parsed ({e}), falling back to single requests"
+                )
+            except Exception as e:
+                logger.error(f"Batch of {len(texts)} texts to {target_language} failed: {e}")
+                return [Untranslated(text) for text in texts]  # Keep the originals on error
+            else:
+                cache = self.translator.cache
+                if cache is not None:
+                    for text, translation in zip(texts, translated):
+                        cache.set(
+                            self.translator._cache_key(text, target_language, context),
+                            translation,
+                        )
+                return translated
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self.translate_text_with_context(text, target_language, context)
+                    for text in texts
+                )
+            )
+        )
+
+    async def translate_batch(
+        self, texts: List[str], target_language: str, context: str
+    ) -> List[str]:
+        """
+        Translate many texts to one language with as few API calls as possible.
+
+        Cached texts are served from the translation memory, the rest are sent in
+        token-bounded batches, all awaited concurrently.
+
+        Args:
+            texts: Texts to translate.
+            target_language: Target language name.
+            context: Context for better translation.
+
+        Returns:
+            Translated texts in the same order as texts.
+        """
+        await self._load_cache()
+        cache = self.translator.cache
+        results: List[Optional[str]] = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            if cache is not None:
+                cached = cache.get(self.translator._cache_key(text, target_language, context))
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.append(index)
+
+        batches = [
+            [pending[position] for position in batch]
+            for batch in plan_batches([texts[index] for index in pending])
+        ]
+        translated = await asyncio.gather(
+            *(
+                self._translate_chunk([texts[index] for index in indices], target_language, context)
+                for indices in batches
+            )
+        )
+        for indices, batch_translations in zip(batches, translated):
+            for index, translation in zip(indices, batch_translations):
+                results[index] = translation
+        return results
+
+    async def translate_texts(
+        self,
+        texts: List[str],
+        target_languages: List[str],
+        existing: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Translate every text into every target language.
+
+        Jobs are planned as by LangdingTranslator.translate_texts and awaited
+        concurrently, bounded by the concurrency semaphore instead of a thread pool.
+
+        Args:
+            texts: Texts to translate.
+            target_languages: Target language names.
+            existing: Known translations to reuse instead of calling the provider.
+
+        Returns:
+            Mapping of each text to its translation per language.
+        """
+        translator = self.translator
+        existing = existing or {}
+        jobs = translator._plan_jobs(texts, target_languages, existing)
+        translator._log_plan(jobs)
+
+        async def run_job(lang: str, job_texts: List[str]) -> List[str]:
+            context = translator._translation_context(lang)
+            if translator.batch:
+                return await self.translate_batch(job_texts, lang, context)
+            return [await self.translate_text_with_context(job_texts[0], lang, context)]
+
+        translations = await asyncio.gather(
+            *(run_job(languages[0], job_texts) for languages, job_texts in jobs)
+        )
+        results: Dict[Tuple[str, str], str] = {}
+        for (languages, job_texts), job_translations in zip(jobs, translations):
+            for text, translated in zip(job_texts, job_translations):
+                results[(text, languages[0])] = translated
+        return translator._assemble(texts, target_languages, results, existing)
+
+    async def process_html_file(self, html_file: Path, target_languages: List[str]) -> bool:
+        """
+        Process a single HTML file for translation.
+
+        Args:
+            html_file: Input HTML file.
+            target_languages: Target language names.
+
+        Returns:
+            True if output files were generated, False if the file was skipped.
+        """
+        translator = self.translator
+        html_file = Path(html_file)
+        logger.info(f"Processing: {html_file}")
+
+        digest, up_to_date = await asyncio.to_thread(
+            translator._check_manifest, html_file, target_languages
+        )
+        if up_to_date:
+            logger.info(f"Unchanged since last build, skipping: {html_file}")
+            return False
+
+        page = await asyncio.to_thread(translator._prepare_page, html_file)
+        if page is None:
+            return False
+
+        # Reuse translations of unchanged strings from the last build
+        previous = {}
+        if digest:
+            previous = await asyncio.to_thread(
+                translator._previous_translations, html_file, page.texts
+            )
+        if previous:
+            logger.info(f"Reusing previous translations for {len(previous)} unchanged texts")
+
+        logger.info(
+            f"Translating {len(page.texts)} text blocks into {len(target_languages)} languages"
+        )
+        with translator.metrics.stage("translate"):
+            translations = await self.translate_texts(page.texts, target_languages, previous)
+
+        async with self._write_lock:
+            await asyncio.to_thread(
+                translator._finish_page, page, translations, target_languages, digest
+            )
+        return True
+
+    async def process_files(
+        self, html_files: List[Path], target_languages: List[str]
+    ) -> Dict[str, int]:
+        """
+        Process many HTML files at once; a failure only drops the affected file.
+
+        Args:
+            html_files: Input HTML files.
+            target_languages: Target language names.
+
+        Returns:
+            Number of files processed, skipped and failed.
+        """
+        start_time = time.time()
+        outcomes = await asyncio.gather(
+            *(self.process_html_file(html_file, target_languages) for html_file in html_files),
+            return_exceptions=True,
+        )
+
+        summary = {"processed": 0, "skipped": 0, "failed": 0}
+        for html_file, outcome in zip(html_files, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error processing {html_file}: {outcome}")
+                summary["failed"] += 1
+            else:
+                summary["processed" if outcome else "skipped"] += 1
+        for status, count in summary.items():
+            self.translator.metrics.increment(f"files_{status}", count)
+
+        logger.info(
+            f"Files: {summary['processed']} processed, {summary['skipped']} skipped, "
+            f"{summary['failed']} failed of {len(html_files)} in {time.time() - start_time:.2f}s"
+        )
+        return summary
+
+    async def process_input_directory(self, target_languages: List[str]) -> Dict[str, int]:
+        """Process all HTML files in the input directory."""
+        input_dir = self.translator.input_dir
+        html_files = await asyncio.to_thread(lambda: sorted(input_dir.glob("*.html")))
+        if not html_files:
+            logger.warning(f"No HTML files found in input directory: {input_dir}")
+            return {"processed": 0, "skipped": 0, "failed": 0}
+        return await self.process_files(html_files, target_languages)
+
+    async def write_run_report(self, prometheus: bool = False) -> Path:
+        """Write the run report in a worker thread, see LangdingTranslator.write_run_report."""
+        return await asyncio.to_thread(self.translator.write_run_report, prometheus)
+
+    async def aclose(self) -> None:
+        """Save the translation memory and close the provider client."""
+        if self.translator.cache is not None:
+            await asyncio.to_thread(self.translator.cache.save)
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
@@ -0,0 +1,308 @@
+"""
+batching.py
+~~~~~~~~~~~
+
+Helpers for translating many strings in a single provider request.
+Texts are grouped into token-bounded batches, sent as a JSON array and the
+reply is parsed back into one translation per source string. Multi-language
+requests ask for every target language at once and are parsed back into one
+translation per source string and language. Single-text prompts, the token
+estimates used to plan requests and the Untranslated marker of texts whose
+request failed live here as well.
+"""
+
+import json
+import math
+from typing import Dict, List, Optional, Sequence
+
+from src.config import settings
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a professional translator. "
+    "Reply only with a JSON array of translated strings, without any explanations."
+)
+
+MULTI_SYSTEM_PROMPT = (
+    "You are a professional translator. "
+    "Reply only with a JSON object of translated strings keyed by language, "
+    "without any explanations."
+)
+
+
+# Output token limit of batch and multi-language replies
+MAX_REPLY_TOKENS = 4096
+
+
+class BatchResponseError(ValueError):
+    """Raised when a batch reply cannot be mapped back to its source strings."""
+
+
+class Untranslated(str):
+    """
+    Source text standing in for a translation that failed or was refused by the budget.
+
+    It renders like the source text, but is never cached and is left out of the
+    saved translations, the journal and the manifest, so the next run requests it again.
+    """
+
+    reason: str
+
+    def __new__(cls, text: str, reason: str = "error") -> "Untranslated":
+        value = super().__new__(cls, text)
+        value.reason = reason
+        return value
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        Estimated token count (about four characters per token).
+    """
+    return max(1, math.ceil(len(text) / 4))
+
+
+def plan_batches(
+    texts: List[str],
+    max_tokens: Optional[int] = None,
+    max_items: Optional[int] = None,
+    languages: int = 1,
+) -> List[List[int]]:
+    """
+    Group texts into batches bounded by estimated tokens and item count.
+
+    Args:
+        texts: Texts to group, in order.
+        max_tokens: Maximum estimated source tokens per batch. Defaults to
+            settings.BATCH_MAX_TOKENS.
+        max_items: Maximum number of texts per batch. Defaults to
+            settings.BATCH_MAX_ITEMS.
+        languages: Target languages requested at once. The token bound is shared
+            between them, and a multi-language batch is closed before its expected
+            reply for every language exceeds MAX_REPLY_TOKENS.
+
+    Returns:
+        Lists of indices into texts, one list per batch, preserving order.
+    """
+    max_tokens = settings.BATCH_MAX_TOKENS if max_tokens is None else max_tokens
+    max_tokens = max(1, max_tokens // max(1, languages))
+    max_items = settings.BATCH_MAX_ITEMS if max_items is None else max_items
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        full = current_tokens + tokens > max_tokens or len(current) >= max_items
+        if languages > 1:
+            reply = _multi_reply_tokens(current_tokens + tokens, len(current) + 1, languages)
+            full = full or reply > MAX_REPLY_TOKENS
+        if current and full:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def batch_max_tokens(texts: List[str]) -> int:
+    """
+    Output token limit for a batch reply.
+
+    Args:
+        texts: Source texts in the batch.
+
+    Returns:
+        Room for translations that run longer than their source, plus JSON overhead.
+    """
+    source_tokens = sum(estimate_tokens(text) for text in texts)
+    return min(MAX_REPLY_TOKENS, max(500, 2 * source_tokens + 8 * len(texts)))
+
+
+def _multi_reply_tokens(source_tokens: int, items: int, languages: int) -> int:
+    """Expected multi-language reply: a batch reply per language plus its key."""
+    return (2 * source_tokens + 8 * items + 8) * languages
+
+
+def multi_max_tokens(texts: List[str], languages: Sequence[str]) -> int:
+    """
+    Output token limit for a multi-language reply.
+
+    Args:
+        texts: Source texts in the request.
+        languages: Target languages of the request.
+
+    Returns:
+        Room for a batch reply per language, plus the language keys.
+    """
+    source_tokens = sum(estimate_tokens(text) for text in texts)
+    reply = _multi_reply_tokens(source_tokens, len(texts), len(languages))
+    return min(MAX_REPLY_TOKENS, max(64 * len(languages), reply))
+
+
+def reply_max_tokens(text: str) -> int:
+    """
+    Output token limit for a single-text reply.
+
+    Args:
+        text: Source text.
+
+    Returns:
+        Room for a translation up to three times longer than its source.
+    """
+    return min(4096, max(64, 3 * estimate_tokens(text) + 32))
+
+
+def build_prompt(text: str, target_language: str, context: str) -> str:
+    """
+    Build the user prompt for a single-text translation request.
+
+    Args:
+        text: Text to translate.
+        target_language: Target language name.
+        context: Context for better translation.
+
+    Returns:
+        Prompt asking for the translated text only.
+    """
+    return (
+        f"{context}\n\n"
+        f'Text to translate: "{text}"\n\n'
+        f"Return ONLY the translated text in {target_language}. "
+        f"Keep technical terms, proper names, and brand names unchanged. "
+        f"Maintain the original formatting and tone."
+    )
+
+
+def build_batch_prompt(texts: List[str], target_language: str, context: str) -> str:
+    """
+    Build the user prompt for a batch translation request.
+
+    Args:
+        texts: Texts to translate.
+        target_language: Target language name.
+        context: Context for better translation.
+
+    Returns:
+        Prompt asking for a JSON array with one translation per text.
+    """
+    return (
+        f"{context}\n\n"
+        f"Texts to translate (JSON array):\n{json.dumps(texts, ensure_ascii=False)}\n\n"
+        f"Return ONLY a JSON array of exactly {len(texts)} strings containing the "
+        f"translations in {target_language}, in the same order. "
+        f"Keep technical terms, proper names, and brand names unchanged. "
+        f"Maintain the original formatting and tone."
+    )
+
+
+def build_multi_prompt(texts: List[str], languages: Sequence[str], context: str) -> str:
+    """
+    Build the user prompt for a request translating texts into several languages.
+
+    Args:
+        texts: Texts to translate.
+        languages: Target language names.
+        context: Context for better translation.
+
+    Returns:
+        Prompt asking for a JSON object with one array of translations per language.
+    """
+    return (
+        f"{context}\n\n"
+        f"Texts to translate (JSON array):\n{json.dumps(texts, ensure_ascii=False)}\n\n"
+        f"Target languages (JSON array):\n{json.dumps(list(languages), ensure_ascii=False)}\n\n"
+        f"Return ONLY a JSON object whose keys are exactly these target languages. "
+        f"The value of each language is a JSON array of exactly {len(texts)} strings "
+        f"containing the translations in that language, in the same order as the texts. "
+        f"Keep technical terms, proper names, and brand names unchanged. "
+        f"Maintain the original formatting and tone."
+    )
+
+
+def _check_translations(items, expected: int) -> List[str]:
+    """Validate a parsed JSON array of translations and strip them."""
+    if not isinstance(items, list) or len(items) != expected:
+        raise BatchResponseError(
+            f"expected {expected} translations, got {len(items) if isinstance(items, list) else 0}"
+        )
+    if not all(isinstance(item, str) for item in items):
+        raise BatchResponseError("reply contains non-string translations")
+
+    return [item.strip() for item in items]
+
+
+def parse_batch_response(raw: str, expected: int) -> List[str]:
+    """
+    Parse a batch reply into one translation per source string.
+
+    Args:
+        raw: Raw reply text from the provider.
+        expected: Number of source strings in the batch.
+
+    Returns:
+        Translations in source order.
+
+    Raises:
+        BatchResponseError: If the reply is not a JSON array of the expected strings.
+    """
+    start, end = raw.find("["), raw.rfind("]")
+    if start == -1 or end < start:
+        raise BatchResponseError("reply does not contain a JSON array")
+
+    try:
+        items = json.loads(raw[start : end + 1])
+    except ValueError as e:
+        raise BatchResponseError(f"invalid JSON array: {e}") from e
+
+    return _check_translations(items, expected)
+
+
+def parse_multi_response(raw: str, languages: Sequence[str], expected: int) -> Dict[str, List[str]]:
+    """
+    Parse a multi-language reply into one translation per source string and language.
+
+    Language keys are matched case-insensitively, and a bare string is accepted
+    for a single source string.
+
+    Args:
+        raw: Raw reply text from the provider.
+        languages: Target languages of the request.
+        expected: Number of source strings in the request.
+
+    Returns:
+        Translations in source order, per language.
+
+    Raises:
+        BatchResponseError: If the reply is not a JSON object with the expected
+            translations for every language.
+    """
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end < start:
+        raise BatchResponseError("reply does not contain a JSON object")
+
+    try:
+        reply = json.loads(raw[start : end + 1])
+    except ValueError as e:
+        raise BatchResponseError(f"invalid JSON object: {e}") from e
+    if not isinstance(reply, dict):
+        raise BatchResponseError("reply is not a JSON object")
+
+    by_language = {str(key).strip().lower(): items for key, items in reply.items()}
+    translations: Dict[str, List[str]] = {}
+    for lang in languages:
+        if lang.lower() not in by_language:
+            raise BatchResponseError(f"reply has no translations in {lang}")
+        items = by_language[lang.lower()]
+        if isinstance(items, str) and expected == 1:
+            items = [items]
+        translations[lang] = _check_translations(items, expected)
+    return translations
@@ -0,0 +1,179 @@
+"""
+benchmark.py
+~~~~~~~~~~~~
+
+End-to-end throughput benchmark on the offline mock provider.
+Synthetic corpora of increasing size are translated into an increasing number
+of languages with process_input_directory, reporting pages/sec, provider
+calls/sec and peak traced memory of the main process for each run.
+
+Usage:
+    python -m src.benchmark --pages 10 50 200 --languages 1 4 --json bench.json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+
+BENCHMARK_LANGUAGES = [
+    "Spanish",
+    "French",
+    "German",
+    "Italian",
+    "Portuguese",
+    "Japanese",
+    "Chinese",
+    "Korean",
+]
+
+# Texts repeated on every page, like navigation and footers
+SHARED_TEXTS = ["Home", "About us", "Contact", "Privacy policy", "All rights reserved"]
+
+
+def make_corpus(directory: Path, pages: int, texts_per_page: int = 20) -> List[Path]:
+    """
+    Write a synthetic website of similar pages sharing navigation texts.
+
+    Args:
+        directory: Directory receiving the pages.
+        pages: Number of pages to write.
+        texts_per_page: Unique paragraphs per page.
+
+    Returns:
+        Paths of the written pages.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    navigation = "".join(f'<a href="#">{text}</a>' for text in SHARED_TEXTS)
+
+    paths = []
+    for page in range(pages):
+        paragraphs = "".join(
+            f"<p>Paragraph {i} of page {page} describing a product feature.</p>"
+            for i in range(texts_per_page)
+        )
+        path = directory / f"page_{page:04d}.html"
+        path.write_text(
+            f"<!DOCTYPE html><html><head><title>Page {page} title</title></head>"
+            f"<body><nav>{navigation}</nav><h1>Heading of page {page}</h1>"
+            f'<img src="hero.png" alt="Illustration for page {page}">{paragraphs}'
+            f"<footer>{SHARED_TEXTS[-1]}</footer></body></html>",
+            encoding="utf-8",
+        )
+        paths.append(path)
+    return paths
+
+
+def run_benchmark(
+    pages: int,
+    languages: int,
+    workdir: Path,
+    latency: float = 0.0,
+    batch: bool = False,
+    concurrency: int = 1,
+    workers: int = 1,
+) -> Dict[str, float]:
+    """
+    Translate a synthetic corpus with the mock provider and measure it.
+
+    Args:
+        pages: Number of pages in the corpus.
+        languages: Number of target languages.
+        workdir: Scratch directory for the corpus and output.
+        latency: Simulated provider latency in seconds.
+        batch: Send many texts per provider call.
+        concurrency: Translation requests in flight at once.
+        workers: Processes parsing and rendering files.
+
+    Returns:
+        Measurements of the run.
+    """
+    run_dir = Path(workdir) / f"p{pages}_l{languages}"
+    make_corpus(run_dir / "input", pages)
+    target_languages = BENCHMARK_LANGUAGES[:languages]
+
+    translator = LangdingTranslator(
+        input_dir=str(run_dir / "input"),
+        output_dir=str(run_dir / "output"),
+        batch=batch,
+        concurrency=concurrency,
+        workers=workers,
+        provider="mock",
+    )
+    translator.client = MockClient(latency=latency)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        translator.process_input_directory(target_languages)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "pages": pages,
+        "languages": languages,
+        "seconds": round(elapsed, 3),
+        "calls": translator.client.calls,
+        "pages_per_sec": round(pages / elapsed, 2),
+        "calls_per_sec": round(translator.client.calls / elapsed, 2),
+        "peak_memory_mb": round(peak / 2**20, 2),
+    }
+
+
+def format_results(results: List[Dict[str, float]]) -> str:
+    """Render benchmark results as a plain-text table."""
+    columns = list(results[0]) if results else []
+    lines = ["  ".join(f"{column:>14}" for column in columns)]
+    lines.extend("  ".join(f"{result[column]:>14}" for column in columns) for result in results)
+    return "\n".join(lines)
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse benchmark command line arguments."""
+    parser = argparse.ArgumentParser(description="Langding throughput benchmark (mock provider)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--languages", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency (s)")
+    parser.add_argument("--batch", action="store_true", help="Send many texts per call")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--json", type=str, help="Write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    """Run the benchmark matrix and print the results."""
+    args = parse_arguments(argv)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for pages in args.pages:
+            for languages in args.languages:
+                results.append(
+                    run_benchmark(
+                        pages,
+                        min(languages, len(BENCHMARK_LANGUAGES)),
+                        Path(workdir),
+                        latency=args.latency,
+                        batch=args.batch,
+                        concurrency=args.concurrency,
+                        workers=args.workers,
+                    )
+                )
+
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+budget.py
+~~~~~~~~~
+
+Token and cost accounting for the provider requests of a run.
+Every request reserves its estimated input and output tokens before it is
+sent and records the usage reported by the provider once it completes. When
+the configured token or cost budget would be exceeded the request is refused
+with BudgetExceeded. Once the recorded spend leaves no room for even the
+smallest request, every further request is refused and the run only serves
+translations from the translation memory.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.config import settings
+from src.logger import logger
+
+# USD per million (input, output) tokens, matched by the longest model name prefix
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-7-sonnet": (3.00, 15.00),
+    "claude-sonnet-4": (3.00, 15.00),
+    "mock": (0.0, 0.0),
+}
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised when a request does not fit the remaining token or cost budget."""
+
+
+def model_prices(model: str) -> Optional[Tuple[float, float]]:
+    """
+    Look up the price of a model.
+
+    Args:
+        model: Provider model name.
+
+    Returns:
+        USD per million (input, output) tokens, from the PRICE_*_PER_MTOK settings
+        when set, else from MODEL_PRICES. None when the model is unknown.
+    """
+    if settings.PRICE_INPUT_PER_MTOK or settings.PRICE_OUTPUT_PER_MTOK:
+        return settings.PRICE_INPUT_PER_MTOK, settings.PRICE_OUTPUT_PER_MTOK
+
+    matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+class RunBudget:
+    """Thread-safe token and cost budget shared by all requests of a run."""
+
+    def __init__(
+        self,
+        max_tokens: int = 0,
+        max_cost: float = 0.0,
+        prices: Optional[Tuple[float, float]] = None,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            max_tokens: Input plus output tokens allowed for the run. Zero disables it.
+            max_cost: USD allowed for the run. Zero disables it.
+            prices: USD per million (input, output) tokens of requests that do not
+                name their model. None leaves their cost unknown, so a cost budget
+                cannot be enforced on them.
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.prices = prices
+        self._lock = threading.Lock()
+
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.spent_cost = 0.0
+        self.reserved_input = 0
+        self.reserved_output = 0
+        self.reserved_cost = 0.0
+        self.requests = 0
+        self.refused = 0
+        self.exhausted = False
+
+        if max_cost > 0 and prices is None:
+            logger.warning("No price known for the model, the cost budget is not enforced")
+
+    @classmethod
+    def for_model(cls, model: str, max_tokens: int = 0, max_cost: float = 0.0) -> "RunBudget":
+        """
+        Build a budget priced for a model.
+
+        Args:
+            model: Provider model name, see model_prices().
+            max_tokens: Token budget. Zero disables it.
+            max_cost: Cost budget in USD. Zero disables it.
+
+        Returns:
+            The budget.
+        """
+        return cls(max_tokens, max_cost, model_prices(model))
+
+    def cost(self, input_tokens: int, output_tokens: int, model: Optional[str] = None) -> float:
+        """
+        USD price of a number of tokens, zero when the model price is unknown.
+
+        Args:
+            input_tokens: Prompt tokens.
+            output_tokens: Reply tokens.
+            model: Model the tokens were sent to. None uses the budget's prices.
+        """
+        prices = self.prices if model is None else model_prices(model)
+        if prices is None:
+            return 0.0
+        return (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+    def _fits(
+        self, input_tokens: int, output_tokens: int, cost: float, in_flight: bool = True
+    ) -> bool:
+        """Check whether spent, optionally in-flight, and new usage stay within the limits."""
+        total_tokens = self.input_tokens + self.output_tokens + input_tokens + output_tokens
+        total_cost = self.spent_cost + cost
+        if in_flight:
+            total_tokens += self.reserved_input + self.reserved_output
+            total_cost += self.reserved_cost
+        if self.max_tokens > 0 and total_tokens > self.max_tokens:
+            return False
+        return self.max_cost <= 0 or total_cost <= self.max_cost
+
+    def reserve(
+        self, input_tokens: int, output_tokens: int, model: Optional[str] = None
+    ) -> Tuple[int, int, float]:
+        """
+        Reserve the estimated tokens of a request before sending it.
+
+        Args:
+            input_tokens: Estimated prompt tokens.
+            output_tokens: Reply token limit of the request.
+            model: Model the request is sent to, priced with model_prices(). None
+                uses the budget's prices.
+
+        Returns:
+            The reservation, to be passed to release() once the request is done.
+
+        Raises:
+            BudgetExceeded: If the request does not fit next to the spent and in-flight
+                tokens, or the budget already ran out.
+        """
+        with self._lock:
+            if self.exhausted:
+                self.refused += 1
+                raise BudgetExceeded("run token/cost budget exhausted")
+
+            cost = self.cost(input_tokens, output_tokens, model)
+            if not self._fits(input_tokens, output_tokens, cost):
+                self.refused += 1
+                self._check_exhausted()
+                logger.info(
+                    f"Request of {input_tokens + output_tokens} tokens does not fit the "
+                    f"run budget ({self._spent()} spent), keeping its source text"
+                )
+                raise BudgetExceeded("request does not fit the run token/cost budget")
+
+            self.reserved_input += input_tokens
+            self.reserved_output += output_tokens
+            self.reserved_cost += cost
+            return input_tokens, output_tokens, cost
+
+    def release(self, reservation: Tuple[int, int, float]) -> None:
+        """
+        Return a reservation once its request has completed or failed.
+
+        Args:
+            reservation: Value returned by reserve().
+        """
+        with self._lock:
+            self.reserved_input -= reservation[0]
+            self.reserved_output -= reservation[1]
+            self.reserved_cost -= reservation[2]
+
+    def record(self, input_tokens: int, output_tokens: int, model: Optional[str] = None) -> None:
+        """
+        Record the usage of a completed request.
+
+        Args:
+            input_tokens: Prompt tokens reported by the provider.
+            output_tokens: Reply tokens reported by the provider.
+            model: Model that answered. None uses the budget's prices.
+        """
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.spent_cost += self.cost(input_tokens, output_tokens, model)
+            self.requests += 1
+            self._check_exhausted()
+
+    def _check_exhausted(self) -> None:
+        """Close the budget once not even the smallest request fits; the caller holds the lock."""
+        if not self.exhausted and not self._fits(1, 1, self.cost(1, 1), in_flight=False):
+            self.exhausted = True
+            logger.warning(
+                f"Run budget reached ({self._spent()}), serving the remaining "
+                f"texts from the translation memory only"
+            )
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Spend, limits and refused requests for the current run."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "cost_usd": round(self.spent_cost, 6),
+                "max_tokens": self.max_tokens,
+                "max_cost_usd": self.max_cost,
+                "refused": self.refused,
+                "exhausted": self.exhausted,
+            }
+
+    def _spent(self) -> str:
+        """Spend summary; the caller holds the lock."""
+        spent = f"{self.input_tokens + self.output_tokens} tokens"
+        if self.prices is not None or self.spent_cost:
+            spent += f", ${self.spent_cost:.4f}"
+        return spent
+
+    def summary(self) -> str:
+        """Human readable spend for the end-of-run log."""
+        with self._lock:
+            return (
+                f"Provider spend: {self._spent()} in {self.requests} requests, "
+                f"{self.refused} refused over budget"
+            )
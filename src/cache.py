@@ -0,0 +1,208 @@
+"""
+cache.py
+~~~~~~~~
+
+Provides a persistent, content-addressed translation memory.
+Each translation is stored under a hash of everything that can change its
+result (source text, target language, provider, model and prompt version),
+so unchanged strings are served from disk instead of the AI provider.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config import settings
+from src.logger import logger
+
+
+class TranslationCache:
+    """On-disk translation memory with size and age based eviction."""
+
+    FILENAME = "translation_memory.json"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+    ):
+        """
+        Initialize the translation memory.
+
+        Args:
+            cache_dir: Directory where the memory file is stored.
+            max_entries: Maximum number of entries kept on disk. Defaults to
+                settings.CACHE_MAX_ENTRIES. Zero or less disables the limit.
+            max_age_days: Entries older than this are discarded. Defaults to
+                settings.CACHE_MAX_AGE_DAYS. Zero or less disables the limit.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / self.FILENAME
+        self.max_entries = settings.CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        if max_age_days is None:
+            max_age_days = settings.CACHE_MAX_AGE_DAYS
+        self.max_age = max_age_days * 86400
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        target_language: str,
+        provider: str,
+        model: str,
+        prompt_version: str,
+    ) -> str:
+        """
+        Build the content address of a translation.
+
+        Args:
+            text: Source text.
+            target_language: Target language name.
+            provider: AI provider name.
+            model: Model name used by the provider.
+            prompt_version: Version of the prompt and context sent with the text.
+
+        Returns:
+            Hex digest identifying the translation.
+        """
+        payload = json.dumps(
+            [text, target_language, provider, model, prompt_version], ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        """Check whether an entry is older than the configured maximum age."""
+        return self.max_age > 0 and now - entry.get("created", 0) > self.max_age
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load the memory file on first use."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if isinstance(data, dict):
+                    self._entries = data
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable translation memory {self.path}: {e}")
+        return self._entries
+
+    def load(self) -> None:
+        """Read the memory file now instead of on the first lookup."""
+        with self._lock:
+            self._load()
+
+    def get(self, key: str, *alternatives: str) -> Optional[str]:
+        """
+        Look up a translation, counting one hit or one miss.
+
+        Args:
+            key: Content address built with make_key.
+            alternatives: Addresses tried in order when key is missing, e.g. the
+                same text translated by another provider.
+
+        Returns:
+            The cached translation, or None on a miss.
+        """
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            for candidate in (key, *alternatives):
+                entry = entries.get(candidate)
+                if entry is not None and not self._expired(entry, now):
+                    break
+            else:
+                self.misses += 1
+                return None
+
+            entry["accessed"] = now
+            self._dirty = True
+            self.hits += 1
+            return entry["translation"]
+
+    def set(self, key: str, translation: str) -> None:
+        """
+        Store a translation.
+
+        Args:
+            key: Content address built with make_key.
+            translation: Translated text.
+        """
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            entries[key] = {"translation": translation, "created": now, "accessed": now}
+            self._dirty = True
+            self.writes += 1
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the least recently used ones above the size limit."""
+        entries = self._load()
+        now = time.time()
+
+        expired = [key for key, entry in entries.items() if self._expired(entry, now)]
+        for key in expired:
+            del entries[key]
+
+        overflow = len(entries) - self.max_entries if self.max_entries > 0 else 0
+        stale = []
+        if overflow > 0:
+            stale = sorted(entries, key=lambda k: entries[k].get("accessed", 0))[:overflow]
+            for key in stale:
+                del entries[key]
+
+        if expired or stale:
+            self.evictions += len(expired) + len(stale)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Apply eviction and write the memory to disk if it changed."""
+        with self._lock:
+            if self._entries is None:
+                return
+
+            self._evict()
+            if not self._dirty:
+                return
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, write and eviction counters for the current run."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def summary(self) -> str:
+        """Human readable counters for the end-of-run log."""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"Translation memory: {self.hits} hits, {self.misses} misses "
+            f"({hit_rate:.1f}% hit rate), {self.writes} stored, {self.evictions} evicted"
+        )
@@ -0,0 +1,172 @@
+"""
+checkpoint.py
+~~~~~~~~~~~~~
+
+Crash safety for translation runs.
+CheckpointJournal appends every finished translation to a JSON-lines file in
+the output directory as soon as it arrives, so a run that fails or is killed
+can be resumed with only the missing provider calls. atomic_open writes output
+files through a temporary file and a rename, so an interrupted run never
+leaves a half-written file behind.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, TextIO
+
+from src.batching import Untranslated
+from src.logger import logger
+
+
+@contextmanager
+def atomic_open(path: Path, newline: Optional[str] = None, binary: bool = False) -> Iterator[IO]:
+    """
+    Open a file for writing that only replaces path once it is complete.
+
+    Args:
+        path: Destination file.
+        newline: Newline translation of a text file, as for open().
+        binary: Open the file in binary mode instead of as UTF-8 text.
+
+    Yields:
+        The temporary file, renamed over path when the block exits without error.
+    """
+    path = Path(path)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        if binary:
+            file = open(temp_path, "wb")
+        else:
+            file = open(temp_path, "w", encoding="utf-8", newline=newline)
+        with file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+class CheckpointJournal:
+    """Append-only journal of finished translations, replayed by resumed runs."""
+
+    FILENAME = "langding_journal.jsonl"
+
+    def __init__(self, output_dir: Path, signature: Dict[str, Any], resume: bool = False):
+        """
+        Initialize the journal.
+
+        Args:
+            output_dir: Directory holding the journal.
+            signature: Provider, model and prompt version of the run. A journal
+                written with a different signature is not replayed.
+            resume: Replay the existing journal instead of starting a new one.
+        """
+        self.path = Path(output_dir) / self.FILENAME
+        self.signature = signature
+        self.recovered: Dict[str, Dict[str, str]] = self._load() if resume else {}
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Read the translations of a previous run, skipping a torn last line."""
+        if not self.path.exists():
+            logger.info("No checkpoint journal to resume from")
+            return {}
+
+        recovered: Dict[str, Dict[str, str]] = {}
+        with open(self.path, "r", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        if not lines:
+            return {}
+
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = None
+        if header != self.signature:
+            logger.warning("Checkpoint journal was written by another configuration, ignoring it")
+            return {}
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A record cut short by a crash; the translation is requested again
+                continue
+            recovered.setdefault(record["text"], {})[record["lang"]] = record["translation"]
+
+        logger.info(
+            f"Resuming {sum(len(langs) for langs in recovered.values())} translations "
+            f"from {self.path}"
+        )
+        return recovered
+
+    def _open(self) -> TextIO:
+        """Start the journal file with the signature and any recovered records."""
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+            lines = [json.dumps(self.signature)]
+            for text, translations in self.recovered.items():
+                for lang, translation in translations.items():
+                    lines.append(self._line(text, lang, translation))
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+        return self._file
+
+    @staticmethod
+    def _line(text: str, lang: str, translation: str) -> str:
+        return json.dumps(
+            {"text": text, "lang": lang, "translation": translation}, ensure_ascii=False
+        )
+
+    def record(self, lang: str, texts: List[str], translations: List[str]) -> None:
+        """
+        Append finished translations and flush them to the operating system.
+
+        Untranslated texts are not recorded, since their failed or refused
+        requests must be sent again on resume.
+
+        Args:
+            lang: Target language.
+            texts: Source texts.
+            translations: Translations in the same order as texts.
+        """
+        lines = [
+            self._line(text, lang, translation)
+            for text, translation in zip(texts, translations)
+            if not isinstance(translation, Untranslated)
+        ]
+        if not lines:
+            return
+        with self._lock:
+            file = self._open()
+            file.write("\n".join(lines) + "\n")
+            file.flush()
+
+    def known(self, texts: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Recovered translations of some texts.
+
+        Args:
+            texts: Source texts.
+
+        Returns:
+            Mapping of each text with recovered translations to them per language.
+        """
+        return {text: dict(self.recovered[text]) for text in texts if text in self.recovered}
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self) -> None:
+        """Delete the journal once the run it protects has completed."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.recovered = {}
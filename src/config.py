@@ -22,10 +22,156 @@ class Settings(BaseSettings):
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY")
 
     # Model selection
-    AI_PROVIDER: str = os.getenv("AI_PROVIDER", "openai")  # "openai" or "anthropic"
+    AI_PROVIDER: str = os.getenv("AI_PROVIDER", "openai")  # "openai", "anthropic" or "mock"
     OPENAI_MODEL: str = "gpt-3.5-turbo"
     ANTHROPIC_MODEL: str = "claude-3-haiku-20240307"
 
+    # Content extraction: text inside EXTRACT_TAGS, listed attributes and meta tags
+    # (by name or property) is translated; content of a fragment without <body>
+    # counts as body content; SKIP_TAGS, SKIP_CLASSES and translate="no"
+    # exclude an element with everything inside it. MAX_TEXTS=0 extracts everything.
+    # Texts listed in EXTRACT_KEEP_TERMS or fully matching EXTRACT_SKIP_PATTERN (by
+    # default capitals mixed with digits or symbols such as "S3" or "CI/CD", and
+    # identifiers such as "Node.js", "TypeScript" or "__init__") are kept as they are;
+    # plain capitalized words such as "HOME" or "CONTACT US" are still translated.
+    # An empty pattern disables the rule.
+    EXTRACT_TAGS: list = ["title", "body"]
+    EXTRACT_ATTRIBUTES: list = ["alt", "title", "aria-label", "placeholder"]
+    EXTRACT_META: list = [
+        "description",
+        "og:title",
+        "og:description",
+        "og:site_name",
+        "twitter:title",
+        "twitter:description",
+    ]
+    SKIP_TAGS: list = ["script", "style", "noscript", "code", "pre", "kbd", "samp", "svg"]
+    SKIP_CLASSES: list = ["notranslate"]
+    EXTRACT_MIN_LENGTH: int = 2
+    EXTRACT_KEEP_TERMS: list = [
+        "API",
+        "AWS",
+        "CSS",
+        "GCP",
+        "HTML",
+        "HTTP",
+        "JSON",
+        "SQL",
+        "UI",
+        "UX",
+    ]
+    EXTRACT_SKIP_PATTERN: str = (
+        r"[A-Z0-9&/+-]*(?:[A-Z][0-9&/+-]|[0-9&/+-][A-Z])[A-Z0-9&/+-]*"
+        r"|\S*(?:[a-z][A-Z]|_|\w\.\w|\(\))\S*"
+    )
+    MAX_TEXTS: int = 0
+
+    # HTML parser backend: "stream" (fast tokenizer, templates keep the original
+    # markup), "lxml" or "html.parser"; PRETTIFY_TEMPLATES re-indents tree-based ones
+    PARSER_BACKEND: str = "stream"
+    PRETTIFY_TEMPLATES: bool = False
+
+    # Stream files through templating and rendering in chunks of this many
+    # characters, keeping memory flat for very large documents
+    LOW_MEMORY: bool = False
+    LOW_MEMORY_CHUNK_SIZE: int = 65536
+
+    # Translation memory
+    CACHE_ENABLED: bool = True
+    CACHE_DIR: str = ".langding_cache"
+    CACHE_MAX_ENTRIES: int = 50000
+    CACHE_MAX_AGE_DAYS: int = 90
+
+    # Batch translation
+    BATCH_ENABLED: bool = True
+    BATCH_MAX_TOKENS: int = 1500  # Estimated source tokens per request
+    BATCH_MAX_ITEMS: int = 40
+
+    # Ask for every target language in one request per text or batch
+    MULTI_LANGUAGE: bool = False
+
+    # Maximum number of translation requests in flight at once
+    CONCURRENCY: int = 4
+
+    # Processes used to parse, template and render files of a directory
+    WORKERS: int = 1
+
+    # Skip unchanged files and strings using the manifest in the output directory
+    INCREMENTAL: bool = False
+
+    # Provider rate budgets per minute (0 disables a limit) and retry policy
+    OPENAI_RPM: int = 500
+    OPENAI_TPM: int = 200000
+    ANTHROPIC_RPM: int = 50
+    ANTHROPIC_TPM: int = 50000
+    MAX_RETRIES: int = 5
+    RETRY_BASE_DELAY: float = 1.0
+    RETRY_MAX_DELAY: float = 60.0
+
+    # Journal every finished translation in the output directory so an interrupted
+    # run can be resumed with --resume
+    CHECKPOINT: bool = True
+
+    # Second provider ("openai", "anthropic" or "mock"; empty disables routing).
+    # A provider is skipped for FAILOVER_COOLDOWN seconds after FAILOVER_ERROR_THRESHOLD
+    # failed attempts in a row. With HEDGE_REQUESTS, a request slower than the
+    # HEDGE_PERCENTILE of recent latencies is also sent to the other provider
+    FALLBACK_PROVIDER: str = ""
+    FAILOVER_ERROR_THRESHOLD: int = 3
+    FAILOVER_COOLDOWN: float = 30.0
+    HEDGE_REQUESTS: bool = False
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_MIN_SAMPLES: int = 20
+
+    # Per-run spend limits (0 disables a limit); once reached, texts are only served
+    # from the translation memory. Prices in USD per million tokens override the
+    # built-in table for the configured model
+    TOKEN_BUDGET: int = 0
+    COST_BUDGET: float = 0.0
+    PRICE_INPUT_PER_MTOK: float = 0.0
+    PRICE_OUTPUT_PER_MTOK: float = 0.0
+
+    # HTTP client shared by all provider requests of a run: pool size (raised to the
+    # concurrency if lower), keep-alive, timeouts in seconds and HTTP/2 (needs h2)
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 60.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP2: bool = False
+
+    # Minify generated pages and write precompressed siblings for static serving:
+    # "gzip" (.gz) and "br" (.br, needs the brotli package)
+    MINIFY_OUTPUT: bool = False
+    PRECOMPRESS: list = []
+
+    # Server-side language negotiation written next to the redirect page: "nginx"
+    # (map and locations), "apache" (type maps and .htaccess) and "wsgi" (table
+    # served by python -m src.negotiation). DEFAULT_LANGUAGE is served, there and by
+    # the redirect page, when no language of the visitor was generated
+    NEGOTIATION: list = []
+    DEFAULT_LANGUAGE: str = "English"
+
+    # Write each language's files as soon as it is translated, and read provider
+    # replies with the streaming APIs
+    EARLY_WRITE: bool = True
+    STREAM_RESPONSES: bool = False
+
+    # Run report (stage timings, latencies, tokens, retries) in the output directory
+    RUN_REPORT: bool = True
+    PROMETHEUS_REPORT: bool = False
+
+    # Detailed log file, created on the first record; empty logs to stdout only
+    LOG_FILE: str = "logs/langding.log"
+
+    # Offline mock provider (AI_PROVIDER="mock"): simulated latency in seconds and
+    # probabilities of injected 503 errors and 429 throttling per request
+    MOCK_LATENCY: float = 0.05
+    MOCK_JITTER: float = 0.02
+    MOCK_ERROR_RATE: float = 0.0
+    MOCK_RATE_LIMIT_RATE: float = 0.0
+    MOCK_SEED: int = 0
+
     class Config:
         """
         Config Object.
@@ -0,0 +1,580 @@
+"""
+document.py
+~~~~~~~~~~~
+
+Single-pass HTML parsing for extraction and templating.
+Each file is parsed once and walked once; the walk collects the translatable
+texts together with the text nodes and attributes where they appear, so the
+template can be emitted from the same tree without searching the document again.
+Which content is translatable is configured through ExtractionRules.
+
+Two kinds of backends are available: BeautifulSoup tree builders
+("html.parser", "lxml"), imported on the first parse, and "stream", a
+tokenizer that records where each text sits in the source and splices the
+placeholders into the original markup, so templates keep every other byte.
+stream_template() runs that tokenizer over a file chunk by chunk and writes the
+template as it goes, so memory stays flat however large the document is.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from src.checkpoint import atomic_open
+from src.config import settings
+from src.logger import logger
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, NavigableString, Tag
+
+# Input types whose value attribute is a visible button label
+BUTTON_INPUT_TYPES = {"submit", "button", "reset"}
+
+# A text node, or an element attribute holding translatable text
+Target = Union["NavigableString", Tuple["Tag", str]]
+
+PARSER_BACKENDS = ("html.parser", "lxml", "stream")
+
+# Elements without an end tag, never pushed on the stream parser's stack
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+# An attribute inside a raw start tag, with its double-quoted, single-quoted or bare value
+ATTRIBUTE_PATTERN = re.compile(r"""([^\s/>"'=]+)(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?""")
+
+
+@dataclass
+class ExtractionRules:
+    """Selectors and skip rules deciding which content is translated."""
+
+    tags: Set[str]
+    attributes: Set[str]
+    meta: Set[str]
+    skip_tags: Set[str]
+    skip_classes: Set[str]
+    min_length: int = 2
+    max_texts: int = 0
+    skip_pattern: Optional[Pattern[str]] = None
+    keep_terms: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_settings(cls) -> "ExtractionRules":
+        """Build the rules from the EXTRACT_* and SKIP_* settings."""
+        return cls(
+            tags={tag.lower() for tag in settings.EXTRACT_TAGS},
+            attributes={attr.lower() for attr in settings.EXTRACT_ATTRIBUTES},
+            meta={name.lower() for name in settings.EXTRACT_META},
+            skip_tags={tag.lower() for tag in settings.SKIP_TAGS},
+            skip_classes=set(settings.SKIP_CLASSES),
+            min_length=settings.EXTRACT_MIN_LENGTH,
+            max_texts=settings.MAX_TEXTS,
+            skip_pattern=(
+                re.compile(settings.EXTRACT_SKIP_PATTERN) if settings.EXTRACT_SKIP_PATTERN else None
+            ),
+            keep_terms=set(settings.EXTRACT_KEEP_TERMS),
+        )
+
+    def is_meaningful(self, content: str) -> bool:
+        """Check whether stripped content is worth translating."""
+        if content in self.keep_terms:
+            return False
+        if self.skip_pattern is not None and self.skip_pattern.fullmatch(content):
+            return False
+        return len(content) >= self.min_length and any(char.isalpha() for char in content)
+
+    @property
+    def top_level(self) -> bool:
+        """
+        Whether content outside <head> and any extracted tag is extracted.
+
+        Browsers place such content, e.g. a page fragment without <body>, into the
+        body, so it is extracted whenever body is.
+        """
+        return "body" in self.tags
+
+    def is_inside(self, name: str, inside: bool) -> bool:
+        """Check whether content of an element is extracted, given its parent's state."""
+        return name in self.tags or (inside and name != "head")
+
+    def is_skipped(self, name: str, attrs: Mapping[str, Any]) -> bool:
+        """Check whether an element and everything inside it must stay untranslated."""
+        if name in self.skip_tags:
+            return True
+        if str(attrs.get("translate") or "").lower() == "no":
+            return True
+        classes = attrs.get("class") or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        return bool(self.skip_classes.intersection(classes))
+
+
+class ParsedDocument:
+    """An HTML document parsed once, with its translatable text indexed by position."""
+
+    def __init__(self, soup: "BeautifulSoup", texts: List[str], nodes: Dict[str, List[Target]]):
+        """
+        Initialize the parsed document.
+
+        Args:
+            soup: Parsed tree. Templating replaces text nodes in place.
+            texts: Translatable texts in document order, without duplicates.
+            nodes: Text nodes and (element, attribute) pairs keyed by their stripped content.
+        """
+        self.soup = soup
+        self.texts = texts
+        self.nodes = nodes
+
+    def apply_placeholders(self, placeholders_dict: Dict[str, str]) -> None:
+        """
+        Replace every occurrence of a text with its placeholder.
+
+        Whitespace around a text node is kept so inline text stays separated from
+        neighbouring elements.
+
+        Args:
+            placeholders_dict: Mapping of an original text to placeholders.
+        """
+        for text, placeholder in placeholders_dict.items():
+            marker = f"{{{{{placeholder}}}}}"
+            for node in self.nodes.get(text, []):
+                if isinstance(node, tuple):
+                    element, attribute = node
+                    element[attribute] = marker
+                    continue
+                leading = node[: len(node) - len(node.lstrip())]
+                trailing = node[len(node.rstrip()) :]
+                node.replace_with(f"{leading}{marker}{trailing}")
+
+    def serialize(self, prettify: bool = False) -> str:
+        """
+        Serialize the tree.
+
+        Args:
+            prettify: Re-indent the markup. Slower, and rewrites whitespace.
+
+        Returns:
+            The document markup.
+        """
+        return self.soup.prettify() if prettify else str(self.soup)
+
+
+class SourceDocument:
+    """An HTML document tokenized once, with its translatable text indexed by source span."""
+
+    def __init__(
+        self, source: str, texts: List[str], spans: Dict[str, List[Tuple[int, int, bool]]]
+    ):
+        """
+        Initialize the source document.
+
+        Args:
+            source: Original markup.
+            texts: Translatable texts in document order, without duplicates.
+            spans: (start, end, is_attribute) source ranges keyed by stripped content.
+                Attribute ranges cover the value including "=" and quotes.
+        """
+        self.source = source
+        self.texts = texts
+        self.spans = spans
+        self.output = source
+
+    def apply_placeholders(self, placeholders_dict: Dict[str, str]) -> None:
+        """
+        Splice placeholders into the original markup.
+
+        Args:
+            placeholders_dict: Mapping of an original text to placeholders.
+        """
+        edits = []
+        for text, placeholder in placeholders_dict.items():
+            marker = f"{{{{{placeholder}}}}}"
+            for start, end, is_attribute in self.spans.get(text, []):
+                edits.append((start, end, f'="{marker}"' if is_attribute else marker))
+
+        pieces = []
+        position = 0
+        for start, end, replacement in sorted(edits):
+            pieces.append(self.source[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(self.source[position:])
+        self.output = "".join(pieces)
+
+    def serialize(self, prettify: bool = False) -> str:
+        """
+        Return the markup with placeholders applied.
+
+        Args:
+            prettify: Ignored; the stream backend always preserves the source layout.
+
+        Returns:
+            The document markup.
+        """
+        return self.output
+
+
+def _attribute_targets(
+    name: str, attrs: Mapping[str, Any], rules: ExtractionRules
+) -> List[Tuple[str, str]]:
+    """Translatable (attribute, stripped value) pairs of an element."""
+    targets = []
+    for attribute, value in attrs.items():
+        if attribute in rules.attributes and isinstance(value, str):
+            targets.append((attribute, value.strip()))
+
+    if name == "meta":
+        key = attrs.get("name") or attrs.get("property") or ""
+        if key.lower() in rules.meta and isinstance(attrs.get("content"), str):
+            targets.append(("content", attrs["content"].strip()))
+
+    if name == "input" and str(attrs.get("type") or "").lower() in BUTTON_INPUT_TYPES:
+        if isinstance(attrs.get("value"), str):
+            targets.append(("value", attrs["value"].strip()))
+
+    return targets
+
+
+class _StreamParser(HTMLParser):
+    """Tokenizer collecting translatable texts with their source ranges."""
+
+    def __init__(self, source: str, rules: ExtractionRules):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            source: Markup to tokenize.
+            rules: Extraction rules.
+        """
+        super().__init__(convert_charrefs=True)
+        self.source = source
+        self.rules = rules
+        self.line_starts = [0] + [match.end() for match in re.finditer("\n", source)]
+        # Open elements as (name, inside an extracted tag, skipped)
+        self.stack: List[Tuple[str, bool, bool]] = []
+        self.texts: Dict[str, None] = {}
+        self.spans: Dict[str, List[Tuple[int, int, bool]]] = {}
+        self._data_start: Optional[int] = None
+        self._data: List[str] = []
+
+    def _offset(self) -> int:
+        """Source offset of the event being handled."""
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def _slice(self, start: int, end: int) -> str:
+        """Source text between two offsets."""
+        return self.source[start:end]
+
+    def _state(self) -> Tuple[bool, bool]:
+        """Whether the current position is inside an extracted tag, and whether it is skipped."""
+        return self.stack[-1][1:] if self.stack else (self.rules.top_level, False)
+
+    def _collect(self, content: str, start: int, end: int, is_attribute: bool) -> None:
+        if self.rules.is_meaningful(content):
+            self.texts.setdefault(content)
+            self.spans.setdefault(content, []).append((start, end, is_attribute))
+
+    def _flush(self, end: int) -> None:
+        """Index the text run that ends where the next event starts."""
+        if self._data_start is None:
+            return
+        start, text = self._data_start, "".join(self._data)
+        self._data_start, self._data = None, []
+
+        inside, skipped = self._state()
+        if not inside or skipped:
+            return
+        raw = self._slice(start, end)
+        leading = len(raw) - len(raw.lstrip())
+        trailing = len(raw) - len(raw.rstrip())
+        self._collect(text.strip(), start + leading, end - trailing, False)
+
+    def _start(self, tag: str, attrs: List[Tuple[str, Optional[str]]], void: bool) -> None:
+        start = self._offset()
+        self._flush(start)
+
+        values: Dict[str, Optional[str]] = {}
+        for name, value in attrs:
+            values.setdefault(name, value)
+
+        inside, skipped = self._state()
+        skipped = skipped or self.rules.is_skipped(tag, values)
+        if not skipped:
+            targets = dict(_attribute_targets(tag, values, self.rules))
+            if targets:
+                raw = self.get_starttag_text()
+                for match in ATTRIBUTE_PATTERN.finditer(raw, len(tag) + 1):
+                    name = match.group(1).lower()
+                    if name in targets:
+                        content = targets.pop(name)
+                        self._collect(
+                            content, start + match.end(1), start + match.end(), is_attribute=True
+                        )
+
+        if not void and tag not in VOID_ELEMENTS:
+            self.stack.append((tag, self.rules.is_inside(tag, inside), skipped))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs, void=False)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs, void=True)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush(self._offset())
+        # Close implicitly ended children too; stray end tags are ignored
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                del self.stack[index:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._data_start is None:
+            self._data_start = self._offset()
+        self._data.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush(self._offset())
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush(self._offset())
+
+    def handle_pi(self, data: str) -> None:
+        self._flush(self._offset())
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush(self._offset())
+
+    def _source_end(self) -> int:
+        """Offset of the end of the input."""
+        return len(self.source)
+
+    def close(self) -> None:
+        super().close()
+        self._flush(self._source_end())
+
+
+class _StreamTemplateWriter(_StreamParser):
+    """Incremental tokenizer writing the template while the input is fed."""
+
+    def __init__(self, output: TextIO, rules: ExtractionRules):
+        """
+        Initialize the writer.
+
+        Args:
+            output: Text file the template is written to.
+            rules: Extraction rules.
+        """
+        super().__init__("", rules)
+        self.output = output
+        self.placeholders: Dict[str, str] = {}
+        # Input not written yet, starting at offset buffer_start
+        self.buffer = ""
+        self.buffer_start = 0
+        self.written = 0
+        self.fed = 0
+        # Last resolved position as (line, column, offset)
+        self.cursor = (1, 0, 0)
+
+    def _offset(self) -> int:
+        """Source offset of the event being handled, counted from the last resolved one."""
+        line, column = self.getpos()
+        cursor_line, cursor_column, position = self.cursor
+        if line == cursor_line:
+            position += column - cursor_column
+        else:
+            for _ in range(line - cursor_line):
+                position = self.buffer.index("\n", position - self.buffer_start)
+                position += self.buffer_start + 1
+            position += column
+        self.cursor = (line, column, position)
+        return position
+
+    def _slice(self, start: int, end: int) -> str:
+        return self.buffer[start - self.buffer_start : end - self.buffer_start]
+
+    def _source_end(self) -> int:
+        return self.fed
+
+    def _write_until(self, position: int) -> None:
+        """Copy the input up to an offset to the template unchanged."""
+        if position > self.written:
+            self.output.write(self._slice(self.written, position))
+            self.written = position
+
+    def _collect(self, content: str, start: int, end: int, is_attribute: bool) -> None:
+        if not self.rules.is_meaningful(content):
+            return
+        placeholder = self.placeholders.get(content)
+        if placeholder is None:
+            if 0 < self.rules.max_texts <= len(self.placeholders):
+                return
+            placeholder = self.placeholders[content] = f"text_{len(self.placeholders)}"
+
+        self._write_until(start)
+        marker = f"{{{{{placeholder}}}}}"
+        self.output.write(f'="{marker}"' if is_attribute else marker)
+        self.written = end
+
+    def feed_chunk(self, chunk: str) -> None:
+        """
+        Tokenize the next piece of input and write out everything that is final.
+
+        Args:
+            chunk: Input text following the previously fed chunks.
+        """
+        self.buffer += chunk
+        self.fed += len(chunk)
+        self.feed(chunk)
+
+        # Input before the unparsed remainder and the pending text run cannot change
+        parsed = self.fed - len(self.rawdata)
+        self.cursor = (*self.getpos(), parsed)
+        final = parsed if self._data_start is None else min(parsed, self._data_start)
+        self._write_until(final)
+        self.buffer = self.buffer[final - self.buffer_start :]
+        self.buffer_start = final
+
+    def close(self) -> None:
+        super().close()
+        self._write_until(self.fed)
+
+
+def _parse_stream(source: str, rules: ExtractionRules) -> SourceDocument:
+    """Tokenize markup with the stream backend."""
+    tokenizer = _StreamParser(source, rules)
+    tokenizer.feed(source)
+    tokenizer.close()
+
+    unique_texts = list(tokenizer.texts)
+    if rules.max_texts > 0:
+        unique_texts = unique_texts[: rules.max_texts]
+    return SourceDocument(source, unique_texts, tokenizer.spans)
+
+
+def parse_document(
+    html_file: Path, parser: str = "html.parser", rules: Optional[ExtractionRules] = None
+) -> Union[ParsedDocument, SourceDocument]:
+    """
+    Parse an HTML file and collect its translatable content in one walk.
+
+    Args:
+        html_file: Path to the HTML file to parse.
+        parser: Backend: a BeautifulSoup tree builder ("html.parser", "lxml") or "stream".
+        rules: Extraction rules. Defaults to ExtractionRules.from_settings().
+
+    Returns:
+        The parsed document with extracted texts and indexed targets.
+    """
+    rules = rules or ExtractionRules.from_settings()
+
+    # The stream backend keeps line endings as they are in the file
+    newline = "" if parser == "stream" else None
+    with open(html_file, "r", encoding="utf-8", newline=newline) as file:
+        source = file.read()
+
+    if parser == "stream":
+        return _parse_stream(source, rules)
+
+    from bs4 import BeautifulSoup, FeatureNotFound, NavigableString, Tag
+
+    try:
+        soup = BeautifulSoup(source, parser)
+    except FeatureNotFound:
+        logger.warning(f"Parser backend {parser!r} is not installed, using html.parser")
+        soup = BeautifulSoup(source, "html.parser")
+
+    texts: Dict[str, None] = {}
+    nodes: Dict[str, List[Target]] = {}
+
+    def collect(content: str, target: Target) -> None:
+        if rules.is_meaningful(content):
+            texts.setdefault(content)
+            nodes.setdefault(content, []).append(target)
+
+    # Each entry is (element, whether it is inside an extracted tag)
+    stack = [(element, rules.top_level) for element in reversed(soup.contents)]
+    while stack:
+        element, inside = stack.pop()
+
+        if isinstance(element, Tag):
+            if rules.is_skipped(element.name, element.attrs):
+                continue
+            for attribute, value in _attribute_targets(element.name, element.attrs, rules):
+                collect(value, (element, attribute))
+            inside = rules.is_inside(element.name, inside)
+            stack.extend((child, inside) for child in reversed(element.contents))
+
+        # Exact type check skips comments, doctypes, CDATA and script/style strings
+        elif type(element) is NavigableString and inside:
+            collect(element.strip(), element)
+
+    unique_texts = list(texts)
+    if rules.max_texts > 0:
+        unique_texts = unique_texts[: rules.max_texts]
+    return ParsedDocument(soup, unique_texts, nodes)
+
+
+def stream_template(
+    html_file: Path,
+    template_path: Path,
+    rules: Optional[ExtractionRules] = None,
+    chunk_size: int = 1 << 16,
+) -> List[str]:
+    """
+    Extract the translatable texts of a file and write its template in one streaming pass.
+
+    The file is read and tokenized chunk by chunk like the "stream" backend, and
+    the template is written as soon as each part of it is final, so only the
+    unique texts are kept in memory, never the whole document. Texts get
+    placeholders "text_<index>" in document order.
+
+    Args:
+        html_file: Path to the HTML file to read.
+        template_path: Where to write the template.
+        rules: Extraction rules. Defaults to ExtractionRules.from_settings().
+        chunk_size: Characters read per chunk.
+
+    Returns:
+        Translatable texts in document order, without duplicates.
+    """
+    rules = rules or ExtractionRules.from_settings()
+
+    with (
+        open(html_file, "r", encoding="utf-8", newline="") as source,
+        atomic_open(template_path, newline="") as output,
+    ):
+        writer = _StreamTemplateWriter(output, rules)
+        for chunk in iter(lambda: source.read(chunk_size), ""):
+            writer.feed_chunk(chunk)
+        writer.close()
+
+    return list(writer.placeholders)
@@ -0,0 +1,83 @@
+"""
+http_client.py
+~~~~~~~~~~~~~~
+
+Shared, tuned HTTP client for the provider SDKs.
+The OpenAI and Anthropic SDKs accept an httpx client; one client with a
+connection pool sized for the translation concurrency, keep-alive, optional
+HTTP/2 and explicit timeouts is created per process and shared by every
+translator, so connections and TLS sessions are reused across all requests
+of a run instead of being set up per client. The async SDK clients get an
+httpx.AsyncClient built from the same settings.
+"""
+
+import threading
+from typing import Any, Optional
+
+from src.config import settings
+from src.logger import logger
+
+_lock = threading.Lock()
+_client: Optional[Any] = None
+
+
+def build_http_client(
+    max_connections: Optional[int] = None, asynchronous: bool = False
+) -> Optional[Any]:
+    """
+    Build an httpx client from the HTTP_* settings.
+
+    Args:
+        max_connections: Lower bound for the pool size, e.g. the request concurrency.
+        asynchronous: Build an httpx.AsyncClient for the async SDK clients.
+
+    Returns:
+        The client, or None when httpx is not installed and the SDK defaults apply.
+    """
+    try:
+        import httpx
+    except ImportError:
+        logger.warning("httpx is not installed, using the SDK's default HTTP client")
+        return None
+
+    limits = httpx.Limits(
+        max_connections=max(settings.HTTP_MAX_CONNECTIONS, max_connections or 0),
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+    client_class = httpx.AsyncClient if asynchronous else httpx.Client
+
+    if settings.HTTP2:
+        try:
+            return client_class(limits=limits, timeout=timeout, http2=True)
+        except ImportError:
+            # HTTP/2 needs the optional h2 package (httpx[http2])
+            logger.warning("HTTP2 is enabled but h2 is not installed, falling back to HTTP/1.1")
+    return client_class(limits=limits, timeout=timeout)
+
+
+def shared_http_client(max_connections: Optional[int] = None) -> Optional[Any]:
+    """
+    Return the process-wide HTTP client, creating it on first use.
+
+    Args:
+        max_connections: Lower bound for the pool size of a newly created client.
+
+    Returns:
+        The shared client, or None when httpx is not installed.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = build_http_client(max_connections)
+        return _client
+
+
+def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,175 @@
+"""
+languages.py
+~~~~~~~~~~~~
+
+Language names and the codes browsers send for them.
+Target languages are configured by name ("Spanish", "Brazilian Portuguese")
+or by BCP-47 tag ("pt-BR") and generated files are prefixed with the
+lowercased name ("spanish_index.html"), while browsers and servers negotiate
+with tags ("es", "es-MX"). LanguageRegistry precomputes, for the languages
+of a run, one flat table from every tag, name and prefix to the prefix of the
+generated files, which the redirect page and the server configuration embed.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from src.config import settings
+
+# Primary BCP-47 subtag of each supported language name
+LANGUAGE_CODES: Dict[str, str] = {
+    "arabic": "ar",
+    "bengali": "bn",
+    "bulgarian": "bg",
+    "catalan": "ca",
+    "chinese": "zh",
+    "croatian": "hr",
+    "czech": "cs",
+    "danish": "da",
+    "dutch": "nl",
+    "english": "en",
+    "farsi": "fa",
+    "filipino": "fil",
+    "finnish": "fi",
+    "french": "fr",
+    "german": "de",
+    "greek": "el",
+    "hebrew": "he",
+    "hindi": "hi",
+    "hungarian": "hu",
+    "indonesian": "id",
+    "italian": "it",
+    "japanese": "ja",
+    "korean": "ko",
+    "malay": "ms",
+    "mandarin": "zh",
+    "norwegian": "no",
+    "persian": "fa",
+    "polish": "pl",
+    "portuguese": "pt",
+    "romanian": "ro",
+    "russian": "ru",
+    "serbian": "sr",
+    "slovak": "sk",
+    "spanish": "es",
+    "swedish": "sv",
+    "tagalog": "tl",
+    "thai": "th",
+    "turkish": "tr",
+    "ukrainian": "uk",
+    "vietnamese": "vi",
+}
+
+
+# BCP-47 tags of regional and script variants configured by name
+VARIANT_CODES: Dict[str, str] = {
+    "american english": "en-us",
+    "australian english": "en-au",
+    "brazilian portuguese": "pt-br",
+    "british english": "en-gb",
+    "canadian french": "fr-ca",
+    "european portuguese": "pt-pt",
+    "european spanish": "es-es",
+    "latin american spanish": "es-419",
+    "mexican spanish": "es-mx",
+    "simplified chinese": "zh-hans",
+    "swiss german": "de-ch",
+    "traditional chinese": "zh-hant",
+}
+
+
+def _normalize(value: str) -> str:
+    """Lowercase a name or tag and spell tags with hyphens, as in "pt_BR"."""
+    return value.strip().lower().replace("_", "-")
+
+
+def language_prefix(name: str) -> str:
+    """File name prefix of a target language's generated files."""
+    return name.lower()
+
+
+def language_code(name: str) -> str:
+    """
+    BCP-47 tag of a target language.
+
+    Args:
+        name: Language name such as "Spanish" or "Mexican Spanish", or already a
+            tag such as "pt-BR".
+
+    Returns:
+        The lowercased tag; an unknown name is returned normalized as is.
+    """
+    key = _normalize(name)
+    return LANGUAGE_CODES.get(key) or VARIANT_CODES.get(key) or key
+
+
+def lookup(table: Mapping[str, str], value: str) -> Optional[str]:
+    """
+    Resolve a tag, name or prefix in a lookup table.
+
+    A tag that is not in the table falls back subtag by subtag, "zh-Hant-TW" to
+    "zh-hant" and "zh", so at most a few dictionary lookups are made.
+
+    Args:
+        table: Lookup table, see LanguageRegistry.lookup.
+        value: Tag, language name or file prefix, in any case.
+
+    Returns:
+        The file prefix, None when nothing matches.
+    """
+    key = _normalize(value)
+    while key:
+        prefix = table.get(key)
+        if prefix is not None:
+            return prefix
+        key = key.rpartition("-")[0]
+    return None
+
+
+class LanguageRegistry:
+    """Precomputed mapping of tags, names and prefixes to the languages of a run."""
+
+    def __init__(self, target_languages: Sequence[str], default_language: Optional[str] = None):
+        """
+        Build the lookup tables.
+
+        Args:
+            target_languages: Languages generated, by name or tag.
+            default_language: Language served when nothing matches. Defaults to
+                settings.DEFAULT_LANGUAGE, or the first target language when that
+                one is not generated.
+        """
+        self.languages = list(target_languages)
+
+        # Exact tags first, then the primary subtag of each regional variant, so
+        # "es-MX" visitors get "es" and "pt-PT" visitors get the only "pt-BR"
+        self.tags: Dict[str, str] = {}
+        for lang in self.languages:
+            self.tags.setdefault(language_code(lang), language_prefix(lang))
+        for tag, prefix in list(self.tags.items()):
+            self.tags.setdefault(tag.split("-")[0], prefix)
+
+        # Names and prefixes resolve too, as sent by ?lang= or stored by the redirect page
+        self.lookup: Dict[str, str] = dict(self.tags)
+        for lang in self.languages:
+            self.lookup.setdefault(_normalize(lang), language_prefix(lang))
+            self.lookup.setdefault(_normalize(language_prefix(lang)), language_prefix(lang))
+
+        prefixes = [language_prefix(lang) for lang in self.languages]
+        default = language_prefix(default_language or settings.DEFAULT_LANGUAGE)
+        self.default = default if default in prefixes or not prefixes else prefixes[0]
+
+    def resolve(self, value: Optional[str]) -> Optional[str]:
+        """
+        Prefix of the generated variant for a tag, name or prefix.
+
+        Args:
+            value: For example "es-MX", "Spanish" or "spanish".
+
+        Returns:
+            The file prefix, None when no generated language matches.
+        """
+        return lookup(self.lookup, value) if value else None
+
+    def codes(self, prefix: str) -> List[str]:
+        """Tags served by the variant with a prefix, the exact tag first."""
+        return [tag for tag, tag_prefix in self.tags.items() if tag_prefix == prefix]
@@ -3,7 +3,8 @@ logger.py
 ~~~~~~~~~
 
 Provides a global logger for the application.
-Logs to both stdout and a file with a consistent format.
+Logs to both stdout and a file (settings.LOG_FILE) with a consistent format.
+The log file and its directory are only created when the first record is written.
 """
 
 import logging
@@ -11,6 +12,27 @@ import sys
 import os
 from typing import Optional
 
+from src.config import settings
+
+
+class LazyFileHandler(logging.FileHandler):
+    """File handler that creates its directory and opens the file on the first record."""
+
+    def __init__(self, filename: str, encoding: Optional[str] = None):
+        """
+        Initialize the handler without touching the filesystem.
+
+        Args:
+            filename (str): Path of the log file.
+            encoding (Optional[str], optional): File encoding.
+        """
+        super().__init__(filename, encoding=encoding, delay=True)
+
+    def _open(self):
+        """Create the log directory, then open the file."""
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
 
 def setup_logger(
     name: str, level: int = logging.INFO, log_file: Optional[str] = None
@@ -33,9 +55,6 @@ def setup_logger(
     logger_instance = logging.getLogger(name)
     logger_instance.setLevel(level)
 
-    # Create logs directory if it doesn't exist
-    os.makedirs("logs", exist_ok=True)
-
     # Only configure handlers if none exist yet
     if not logger_instance.handlers:
         # 1. StreamHandler for stdout with a simplified formatter
@@ -44,9 +63,9 @@ def setup_logger(
         stream_handler.setFormatter(stream_formatter)
         logger_instance.addHandler(stream_handler)
 
-        # 2. Optional FileHandler with a detailed formatter
+        # 2. Optional FileHandler with a detailed formatter, opened on first use
         if log_file:
-            file_handler = logging.FileHandler(log_file, encoding="utf-8")
+            file_handler = LazyFileHandler(log_file, encoding="utf-8")
             file_formatter = logging.Formatter(
                 fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
                 datefmt="%Y-%m-%d %H:%M:%S",
@@ -59,4 +78,4 @@ def setup_logger(
 
 
 # Root logger for the entire system
-logger = setup_logger("app", level=logging.DEBUG, log_file="logs/langding.log")
+logger = setup_logger("app", level=logging.DEBUG, log_file=settings.LOG_FILE or None)
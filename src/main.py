@@ -1,118 +1,455 @@
 import json
 import argparse
+import threading
 import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
-
-from bs4 import BeautifulSoup
-from openai import OpenAI
-from anthropic import Anthropic
-
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.batching import (
+    BATCH_SYSTEM_PROMPT,
+    BatchResponseError,
+    MULTI_SYSTEM_PROMPT,
+    Untranslated,
+    batch_max_tokens,
+    build_batch_prompt,
+    build_multi_prompt,
+    build_prompt,
+    estimate_tokens,
+    multi_max_tokens,
+    parse_batch_response,
+    parse_multi_response,
+    plan_batches,
+    reply_max_tokens,
+)
+from src.budget import BudgetExceeded, RunBudget, model_prices
+from src.cache import TranslationCache
+from src.checkpoint import CheckpointJournal, atomic_open
 from src.config import settings
+from src.document import PARSER_BACKENDS, ParsedDocument, SourceDocument, parse_document
+from src.http_client import close_http_client, shared_http_client
+from src.languages import LanguageRegistry
 from src.logger import logger
+from src.manifest import BuildManifest, content_hash, file_hash
+from src.metrics import RunMetrics, token_usage
+from src.mock_provider import MockClient
+from src.negotiation import NEGOTIATION_FORMATS, write_negotiation_files
+from src.pipeline import (
+    PreparedPage,
+    language_file_path,
+    prepare_page,
+    render_language_files,
+    template_options,
+    write_template,
+)
+from src.postprocess import COMPRESSION_SUFFIXES, OutputStats, available_formats, postprocess_files
+from src.router import ProviderRouter, ProviderUnavailable
+from src.scheduler import RequestScheduler
+
+# Bump whenever the prompt or context wording changes so cached translations are not reused
+PROMPT_VERSION = "1"
+
+SYSTEM_PROMPT = (
+    "You are a professional translator. Provide only the translation without any explanations."
+)
 
 
 class LangdingTranslator:
     """Main translator class for Langding application."""
 
-    def __init__(self, input_dir: str, output_dir: str, template_dir: str = "templates"):
-        """Initialize the translator with directories."""
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        template_dir: str = "templates",
+        cache_dir: Optional[str] = None,
+        batch: bool = False,
+        concurrency: int = 1,
+        incremental: bool = False,
+        workers: int = 1,
+        provider: Optional[str] = None,
+        early_write: bool = False,
+        stream: bool = False,
+        parser: Optional[str] = None,
+        prettify: Optional[bool] = None,
+        chunk_size: int = 0,
+        token_budget: int = 0,
+        cost_budget: float = 0.0,
+        fallback_provider: Optional[str] = None,
+        hedge: bool = False,
+        checkpoint: bool = False,
+        resume: bool = False,
+        multi_language: bool = False,
+        minify: bool = False,
+        precompress: Sequence[str] = (),
+        negotiation: Sequence[str] = (),
+    ):
+        """
+        Initialize the translator with directories.
+
+        Args:
+            input_dir: Directory containing input HTML files.
+            output_dir: Directory to save output files.
+            template_dir: Directory containing template HTML files.
+            cache_dir: Directory of the persistent translation memory. None disables it.
+            batch: Send many texts per API call instead of one call per text.
+            concurrency: Maximum number of translation requests in flight at once.
+            incremental: Skip unchanged files and only translate new or changed strings,
+                tracked in a manifest in the output directory.
+            workers: Number of processes parsing, templating and rendering files
+                when processing a directory.
+            provider: AI provider ("openai", "anthropic" or "mock"). Defaults to
+                settings.AI_PROVIDER.
+            early_write: Render and write each language's files as soon as all of
+                its translations are done, instead of after every language.
+            stream: Read provider replies with the streaming APIs.
+            parser: Parser backend for extraction and templating: "html.parser",
+                "lxml" or "stream" (tokenizer keeping the original markup).
+                Defaults to settings.PARSER_BACKEND.
+            prettify: Re-indent templates of tree-based parsers. Defaults to
+                settings.PRETTIFY_TEMPLATES.
+            chunk_size: Template and render files as streams read in chunks of this
+                many characters, with the stream tokenizer whatever the parser, so
+                memory stays flat for very large documents. 0 loads whole files.
+            token_budget: Input plus output tokens the run may spend. 0 is unlimited.
+            cost_budget: USD the run may spend, priced per model. 0 is unlimited.
+                Once a budget runs out, texts are only served from the translation
+                memory and the rest keep their source text.
+            fallback_provider: Second provider ("openai", "anthropic" or "mock") that
+                requests fail over to when the first one errors. None uses only one.
+            hedge: With a fallback provider, also send a duplicate request to the
+                other provider when a reply is slower than its recent latency
+                percentile, and use the first reply.
+            checkpoint: Append every finished translation to a journal in the output
+                directory, deleted once a directory run completes without failures.
+            resume: Replay the journal of an interrupted run and only request the
+                missing translations. Implies checkpoint.
+            multi_language: Ask for every missing target language of a text, or of a
+                batch in batch mode, in one request returning translations keyed by
+                language, so the source and context are sent once for all languages.
+            minify: Minify generated language files and redirect pages in place.
+            precompress: Also write precompressed siblings of generated files in these
+                formats ("gzip" for .gz, "br" for .br, which needs brotli).
+            negotiation: Also write server-side language negotiation for these servers
+                ("nginx", "apache", "wsgi"), so visitors get their language on the
+                first request instead of through the redirect page.
+        """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.template_dir = Path(template_dir)
+        self.cache = TranslationCache(cache_dir) if cache_dir else None
+        self.batch = batch
+        self.concurrency = max(1, concurrency)
+        self.manifest = BuildManifest(self.output_dir) if incremental else None
+        self.workers = max(1, workers)
+        self.metrics = RunMetrics()
+        self.early_write = early_write
+        self.stream = stream
+        self.parser, self.prettify = template_options(parser, prettify)
+        self.chunk_size = max(0, chunk_size)
+        self.multi_language = multi_language
+        self.minify = minify
+        self.precompress = available_formats(precompress)
+        self.output_stats = OutputStats()
+        self.negotiation = list(negotiation)
+
+        # Select the AI provider; its client is created on the first request
+        self.provider, self.model = self._resolve_provider(provider or settings.AI_PROVIDER)
+        self.models = {self.provider: self.model}
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        # Requests reserve their estimated tokens against the run's spend limits
+        self.budget = RunBudget.for_model(self.model, token_budget, cost_budget)
+
+        # Every provider call goes through the rate-limit-aware scheduler
+        self.scheduler = RequestScheduler.for_provider(self.provider)
+        self.schedulers = {self.provider: self.scheduler}
+
+        # With a fallback provider, requests are routed with failover and hedging
+        self.fallback_provider = None
+        self._fallback_client = None
+        self.router = None
+        if fallback_provider:
+            fallback, fallback_model = self._resolve_provider(fallback_provider)
+            if fallback != self.provider:
+                self.fallback_provider = fallback
+                self.models[fallback] = fallback_model
+                self.schedulers[fallback] = RequestScheduler.for_provider(fallback)
+                self.router = ProviderRouter.from_settings(
+                    [self.provider, fallback], hedge, max_workers=2 * self.concurrency
+                )
+                if cost_budget > 0 and model_prices(fallback_model) is None:
+                    logger.warning(
+                        "No price known for the fallback model, its requests do not count "
+                        "against the cost budget"
+                    )
 
-        # Initialize AI client based on provider
-        if settings.AI_PROVIDER.lower() == "anthropic":
-            if not settings.ANTHROPIC_API_KEY:
-                raise ValueError("ANTHROPIC_API_KEY not set")
-            self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-            self.provider = "anthropic"
-        else:
-            if not settings.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not set")
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-            self.provider = "openai"
+        # Finished translations are journaled so an interrupted run can be resumed
+        self.journal = None
+        if checkpoint or resume:
+            signature = {"provider": self.provider, "model": self.model, "prompt": PROMPT_VERSION}
+            if self.fallback_provider is not None:
+                signature["fallback"] = f"{self.fallback_provider}:{fallback_model}"
+            self.journal = CheckpointJournal(self.output_dir, signature, resume)
 
         # Create directories if they don't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def extract_text_from_html(self, html_file: Path) -> List[str]:
+    @staticmethod
+    def _resolve_provider(provider: str) -> Tuple[str, str]:
+        """
+        Validate a provider name and its API key.
+
+        Args:
+            provider: "openai", "anthropic" or "mock"; anything else means OpenAI.
+
+        Returns:
+            The provider name and its configured model.
+
+        Raises:
+            ValueError: If the provider's API key is not set.
+        """
+        provider = provider.lower()
+        if provider == "mock":
+            # Offline provider with simulated latency and failures, see MOCK_* settings
+            return "mock", "mock"
+        if provider == "anthropic":
+            if not settings.ANTHROPIC_API_KEY:
+                raise ValueError("ANTHROPIC_API_KEY not set")
+            return "anthropic", settings.ANTHROPIC_MODEL
+        if not settings.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not set")
+        return "openai", settings.OPENAI_MODEL
+
+    @property
+    def client(self):
+        """
+        AI provider client, created on first use.
+
+        Only the SDK of the configured provider is imported, and only when a
+        request has to be sent, so runs served entirely from the translation
+        memory or the incremental manifest never load it.
+        """
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._create_client()
+            return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        """Replace the provider client, e.g. with a custom or mock client."""
+        self._client = client
+
+    def _client_for(self, provider: str):
+        """Client of the primary or the fallback provider, created on first use."""
+        if provider == self.provider:
+            return self.client
+        with self._client_lock:
+            if self._fallback_client is None:
+                self._fallback_client = self._create_client(provider)
+            return self._fallback_client
+
+    def _create_client(self, provider: Optional[str] = None):
+        """Import a provider's SDK and build its client on the shared HTTP pool."""
+        provider = provider or self.provider
+        if provider == "mock":
+            return MockClient.from_settings()
+
+        # The scheduler is the only retry layer, so SDK retries are turned off
+        options = {"max_retries": 0}
+        http_client = shared_http_client(self.concurrency)
+        if http_client is not None:
+            options["http_client"] = http_client
+
+        if provider == "anthropic":
+            from anthropic import Anthropic
+
+            return Anthropic(api_key=settings.ANTHROPIC_API_KEY, **options)
+
+        from openai import OpenAI
+
+        return OpenAI(api_key=settings.OPENAI_API_KEY, **options)
+
+    def extract_text_from_html(
+        self, html_file: Path, document: Optional[Union[ParsedDocument, SourceDocument]] = None
+    ) -> List[str]:
         """
         Extract all text content from an HTML file.
 
         Args:
             html_file: Path to the HTML file to parse.
+            document: Already parsed document, to avoid parsing the file again.
 
         Returns:
             List of text strings extracted from the HTML file.
         """
-        with open(html_file, "r", encoding="utf-8") as file:
-            soup = BeautifulSoup(file, "html.parser")
-
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-
-        # Extract meaningful text blocks, prioritizing important content
-        texts = []
-        important_tags = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "title", "meta"]
-
-        # First, get important content from specific tags
-        for tag in important_tags:
-            elements = soup.find_all(tag)
-            for element in elements:
-                if tag == "meta" and element.get("name") == "description":
-                    content = element.get("content", "").strip()
-                    if content and len(content) > 10:
-                        texts.append(content)
-                elif tag == "title":
-                    content = element.get_text().strip()
-                    if content and len(content) > 3:
-                        texts.append(content)
-                else:
-                    content = element.get_text().strip()
-                    # Only meaningful content (sentences or phrases)
-                    if content and (len(content) > 10 or " " in content):
-                        texts.append(content)
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_texts = []
-        for text in texts:
-            if text not in seen and len(text.strip()) > 0:
-                seen.add(text)
-                unique_texts.append(text)
+        if document is None:
+            document = parse_document(html_file, self.parser)
+        return list(document.texts)
 
-        return unique_texts[:15]  # Limit to 15 most important texts for speed
-
-    def create_template(self, html_file: Path, placeholders_dict: Dict[str, str]) -> Path:
+    def create_template(
+        self,
+        html_file: Path,
+        placeholders_dict: Dict[str, str],
+        document: Optional[Union[ParsedDocument, SourceDocument]] = None,
+    ) -> Path:
         """
         Create a template HTML file where text is replaced by placeholders.
 
         Args:
             html_file: Path to the original HTML file.
             placeholders_dict: Mapping of an original text to placeholders.
+            document: Already parsed document, to avoid parsing the file again.
+                Its tree is modified in place.
 
         Returns:
             Path to the generated template HTML file.
         """
-        with open(html_file, "r", encoding="utf-8") as file:
-            soup = BeautifulSoup(file, "html.parser")
+        if document is None:
+            document = parse_document(html_file, self.parser)
+
+        # Replace text with placeholders and save template
+        template_path = write_template(
+            document,
+            placeholders_dict,
+            self.output_dir / f"template_{html_file.name}",
+            self.prettify,
+        )
 
-        # Replace text with placeholders
-        for text, placeholder in placeholders_dict.items():
-            for element in soup.find_all(string=lambda s: s and s.strip() == text):
-                element.replace_with(f"{{{{{placeholder}}}}}")
+        logger.info(f"Created template: {template_path}")
+        return template_path
 
-        # Save template
-        template_filename = f"template_{html_file.name}"
-        template_path = self.output_dir / template_filename
+    def _cache_key(
+        self, text: str, target_language: str, context: str, provider: Optional[str] = None
+    ) -> str:
+        """Content address of a translation by provider (default: the primary one)."""
+        provider = provider or self.provider
+        return TranslationCache.make_key(
+            text, target_language, provider, self.models[provider], f"{PROMPT_VERSION}:{context}"
+        )
 
-        with open(template_path, "w", encoding="utf-8") as file:
-            file.write(str(soup.prettify()))
+    def _cached(self, text: str, target_language: str, context: str) -> Optional[str]:
+        """Translation memory entry of a text, from the primary provider first."""
+        return self.cache.get(
+            *(self._cache_key(text, target_language, context, provider) for provider in self.models)
+        )
 
-        logger.info(f"Created template: {template_path}")
-        return template_path
+    def _complete(self, system: str, prompt: str, max_tokens: int) -> Tuple[str, str]:
+        """
+        Send a single prompt to the configured AI provider.
+
+        The request waits for the provider's rate budgets and is retried on
+        throttling and transient errors by the scheduler. Every provider tried,
+        including a hedged duplicate, reserves its own estimate priced for its model.
+
+        Args:
+            system: System prompt.
+            prompt: User prompt.
+            max_tokens: Maximum number of tokens in the reply.
+
+        Returns:
+            Reply text and the provider that answered.
+        """
+        input_tokens = estimate_tokens(system) + estimate_tokens(prompt)
+
+        def request(provider: str, scheduler: RequestScheduler) -> Tuple[str, str]:
+            reservation = self.budget.reserve(input_tokens, max_tokens, self.models[provider])
+            try:
+                reply = scheduler.submit(
+                    lambda: self._send(system, prompt, max_tokens, provider),
+                    input_tokens + max_tokens,
+                )
+            finally:
+                self.budget.release(reservation)
+            return reply, provider
+
+        if self.router is None:
+            return request(self.provider, self.scheduler)
+        return self.router.call(lambda provider: request(provider, self.schedulers[provider]))
+
+    def _send_anthropic(
+        self, system: str, prompt: str, max_tokens: int, provider: str
+    ) -> Tuple[str, Any]:
+        """Anthropic Messages request; returns the reply and the object carrying usage."""
+        client = self._client_for(provider)
+        request = {
+            "model": self.models[provider],
+            "max_tokens": max_tokens,
+            "temperature": 0.3,
+            "system": system,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if self.stream:
+            with client.messages.stream(**request) as stream:
+                reply = "".join(stream.text_stream)
+                return reply.strip(), stream.get_final_message()
+
+        response = client.messages.create(**request)
+        return response.content[0].text.strip(), response
+
+    def _send_openai(
+        self, system: str, prompt: str, max_tokens: int, provider: str
+    ) -> Tuple[str, Any]:
+        """OpenAI chat completion request; returns the reply and the object carrying usage."""
+        client = self._client_for(provider)
+        request = {
+            "model": self.models[provider],
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+        }
+        if self.stream:
+            parts = []
+            usage_chunk = None
+            for chunk in client.chat.completions.create(
+                **request, stream=True, stream_options={"include_usage": True}
+            ):
+                if chunk.choices:
+                    parts.append(chunk.choices[0].delta.content or "")
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunk = chunk
+            return "".join(parts).strip(), usage_chunk
+
+        response = client.chat.completions.create(**request)
+        return response.choices[0].message.content.strip(), response
+
+    def _send(
+        self, system: str, prompt: str, max_tokens: int, provider: Optional[str] = None
+    ) -> str:
+        """Perform the API request for _complete, without rate limiting or retries."""
+        provider = provider or self.provider
+        if self.router is not None and not self.router.is_available(provider):
+            # Not retryable, so the scheduler gives up and the router fails over
+            raise ProviderUnavailable(f"{provider} is failing, circuit open")
+
+        start = time.perf_counter()
+        try:
+            if provider == "anthropic":
+                reply, response = self._send_anthropic(system, prompt, max_tokens, provider)
+            else:
+                reply, response = self._send_openai(system, prompt, max_tokens, provider)
+        except Exception:
+            elapsed = time.perf_counter() - start
+            self.metrics.observe_request(provider, elapsed, failed=True)
+            if self.router is not None:
+                self.router.observe(provider, elapsed, failed=True)
+            raise
+
+        elapsed = time.perf_counter() - start
+        usage = token_usage(response)
+        self.metrics.observe_request(provider, elapsed, *usage)
+        if self.router is not None:
+            self.router.observe(provider, elapsed)
+        if not any(usage):
+            # The response reports no usage, count the estimate instead
+            usage = (estimate_tokens(system) + estimate_tokens(prompt), estimate_tokens(reply))
+        self.budget.record(*usage, self.models[provider])
+        return reply
 
     def translate_text_with_context(self, text: str, target_language: str, context: str) -> str:
         """
@@ -126,42 +463,489 @@ class LangdingTranslator:
         Returns:
             Translated text.
         """
+        if self.cache is not None:
+            cached = self._cached(text, target_language, context)
+            if cached is not None:
+                return cached
+
+        try:
+            prompt = build_prompt(text, target_language, context)
+            translated, provider = self._complete(SYSTEM_PROMPT, prompt, reply_max_tokens(text))
+
+        except BudgetExceeded:
+            return Untranslated(text, "budget")  # Over budget, keep the original text
+
+        except Exception as e:
+            logger.error(f"Translation error for '{text}': {e}")
+            return Untranslated(text)  # Return original text on error
+
+        if self.cache is not None:
+            self.cache.set(self._cache_key(text, target_language, context, provider), translated)
+        return translated
+
+    def translate_batch(self, texts: List[str], target_language: str, context: str) -> List[str]:
+        """
+        Translate many texts to one language with as few API calls as possible.
+
+        Cached texts are served from the translation memory, the rest are sent in
+        token-bounded batches. A batch whose reply cannot be parsed falls back to
+        one translate_text_with_context call per text. A batch whose request
+        failed, after the scheduler's retries, keeps its source texts instead, so
+        a throttling provider is not sent one request per text.
+
+        Args:
+            texts: Texts to translate.
+            target_language: Target language name.
+            context: Context for better translation.
+
+        Returns:
+            Translated texts in the same order as texts.
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            if self.cache is not None:
+                cached = self._cached(text, target_language, context)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending.append(index)
+
+        for batch in plan_batches([texts[index] for index in pending]):
+            indices = [pending[position] for position in batch]
+            batch_texts = [texts[index] for index in indices]
+
+            if len(batch_texts) > 1:
+                try:
+                    reply, provider = self._complete(
+                        BATCH_SYSTEM_PROMPT,
+                        build_batch_prompt(batch_texts, target_language, context),
+                        batch_max_tokens(batch_texts),
+                    )
+                    translated = parse_batch_response(reply, len(batch_texts))
+                except BudgetExceeded:
+                    for index in indices:
+                        results[index] = Untranslated(texts[index], "budget")
+                    continue
+                except BatchResponseError as e:
+                    logger.warning(
+                        f"Batch reply for {len(batch_texts)} texts to {target_language} could "
+                        f"not be parsed ({e}), falling back to single requests"
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Batch of {len(batch_texts)} texts to {target_language} failed: {e}"
+                    )
+                    for index in indices:
+                        results[index] = Untranslated(texts[index])  # Keep the originals on error
+                    continue
+                else:
+                    for index, translation in zip(indices, translated):
+                        results[index] = translation
+                        if self.cache is not None:
+                            self.cache.set(
+                                self._cache_key(texts[index], target_language, context, provider),
+                                translation,
+                            )
+                    continue
+
+            for index in indices:
+                results[index] = self.translate_text_with_context(
+                    texts[index], target_language, context
+                )
+
+        return results
+
+    def translate_multi(
+        self, texts: List[str], target_languages: List[str]
+    ) -> Dict[str, List[str]]:
+        """
+        Translate texts into several languages with a single API call.
+
+        Translations are cached per language, so they are shared with the
+        single-language modes. Texts cached in every language are not sent. A
+        reply that cannot be parsed falls back to one request per language, a
+        request that failed after the scheduler's retries keeps the source texts.
+
+        Args:
+            texts: Texts to translate.
+            target_languages: Target language names.
+
+        Returns:
+            Translated texts in the same order as texts, per language.
+        """
+        contexts = {lang: self._translation_context(lang) for lang in target_languages}
+        results: Dict[str, List[Optional[str]]] = {
+            lang: [None] * len(texts) for lang in target_languages
+        }
+        pending = []
+        for index, text in enumerate(texts):
+            if self.cache is not None:
+                for lang in target_languages:
+                    results[lang][index] = self._cached(text, lang, contexts[lang])
+            if any(results[lang][index] is None for lang in target_languages):
+                pending.append(index)
+        if not pending:
+            return results
+
+        pending_texts = [texts[index] for index in pending]
+        fresh = False
         try:
-            prompt = (
-                f"{context}\n\n"
-                f'Text to translate: "{text}"\n\n'
-                f"Return ONLY the translated text in {target_language}. "
-                f"Keep technical terms, proper names, and brand names unchanged. "
-                f"Maintain the original formatting and tone."
+            reply, provider = self._complete(
+                MULTI_SYSTEM_PROMPT,
+                build_multi_prompt(
+                    pending_texts,
+                    target_languages,
+                    self._translation_context(", ".join(target_languages)),
+                ),
+                multi_max_tokens(pending_texts, target_languages),
+            )
+            translated = parse_multi_response(reply, target_languages, len(pending_texts))
+            fresh = True
+        except BudgetExceeded:
+            translated = {
+                lang: [Untranslated(text, "budget") for text in pending_texts]
+                for lang in target_languages
+            }
+        except BatchResponseError as e:
+            logger.warning(
+                f"Reply for {len(pending_texts)} texts in {len(target_languages)} languages "
+                f"could not be parsed ({e}), falling back to one request per language"
+            )
+            translated = {
+                lang: (
+                    self.translate_batch(pending_texts, lang, contexts[lang])
+                    if self.batch
+                    else [
+                        self.translate_text_with_context(text, lang, contexts[lang])
+                        for text in pending_texts
+                    ]
+                )
+                for lang in target_languages
+            }
+        except Exception as e:
+            logger.error(
+                f"Request for {len(pending_texts)} texts in {len(target_languages)} languages "
+                f"failed: {e}"
             )
+            translated = {
+                lang: [Untranslated(text) for text in pending_texts] for lang in target_languages
+            }
+
+        for lang in target_languages:
+            for index, translation in zip(pending, translated[lang]):
+                if results[lang][index] is not None:
+                    continue
+                results[lang][index] = translation
+                if fresh and self.cache is not None:
+                    self.cache.set(
+                        self._cache_key(texts[index], lang, contexts[lang], provider), translation
+                    )
+        return results
+
+    def _translation_context(self, target_language: str) -> str:
+        """Context sent along with every text translated into target_language."""
+        return f"Website content for a Full Stack Developer portfolio. Translate the following texts to {target_language}, maintaining professional tone and technical accuracy:"
+
+    def translate_texts(
+        self,
+        texts: List[str],
+        target_languages: List[str],
+        existing: Optional[Dict[str, Dict[str, str]]] = None,
+        on_language_done: Optional[Callable[[str, Dict[str, Dict[str, str]]], None]] = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Translate every text into every target language.
+
+        Translation jobs, one per (text, language) pair or one per batch and
+        language in batch mode (one per text or batch for all languages in
+        multi-language mode), run on a pool of at most self.concurrency
+        threads. Results are assembled in text and language order, so the
+        output does not depend on which call finishes first.
+
+        Args:
+            texts: Texts to translate.
+            target_languages: Target language names.
+            existing: Known translations to reuse instead of calling the provider.
+            on_language_done: Called with a language and its translations as soon
+                as that language is complete, while others may still be running.
+
+        Returns:
+            Mapping of each text to its translation per language.
+        """
+        existing = existing or {}
+
+        notify = None
+        if on_language_done is not None:
+
+            def notify(lang, results):
+                on_language_done(lang, self._assemble(texts, [lang], results, existing))
+
+        results = self._run_jobs(
+            self._plan_jobs(texts, target_languages, existing), notify, target_languages
+        )
+        return self._assemble(texts, target_languages, results, existing)
+
+    def translate_pages(
+        self,
+        pages: List[PreparedPage],
+        target_languages: List[str],
+        existing: Optional[List[Dict[str, Dict[str, str]]]] = None,
+        on_language_done: Optional[Callable[[str, List[Dict[str, Dict[str, str]]]], None]] = None,
+    ) -> List[Dict[str, Dict[str, str]]]:
+        """
+        Translate the texts of many pages in one shared, deduplicated stage.
+
+        Strings are gathered from every page first, so a header, footer or CTA
+        shared by many pages is translated once per language and the result
+        fanned out to every page. The translation context only depends on the
+        language, which makes this safe. A translation known for one page (for
+        example from an incremental build) is reused for all pages.
+
+        Args:
+            pages: Prepared pages.
+            target_languages: Target language names.
+            existing: Known translations per page, in page order.
+            on_language_done: Called with a language and the translations of every
+                page in that language as soon as the language is complete.
+
+        Returns:
+            Translations per page, in page order.
+        """
+        existing = existing or [{} for _ in pages]
+
+        known: Dict[str, Dict[str, str]] = {}
+        for page_known in existing:
+            for text, page_translations in page_known.items():
+                known.setdefault(text, {}).update(page_translations)
+
+        unique_texts = list(dict.fromkeys(text for page in pages for text in page.texts))
+        jobs = self._plan_jobs(unique_texts, target_languages, known)
+
+        undeduplicated = sum(
+            len(self._plan_jobs(page.texts, target_languages, page_known))
+            for page, page_known in zip(pages, existing)
+        )
+        logger.info(
+            f"Deduplicated {sum(len(page.texts) for page in pages)} strings from {len(pages)} "
+            f"files into {len(unique_texts)} unique texts: {len(jobs)} translation requests "
+            f"instead of {undeduplicated}, {undeduplicated - len(jobs)} saved"
+        )
+
+        notify = None
+        if on_language_done is not None:
 
-            if self.provider == "anthropic":
-                response = self.client.messages.create(
-                    model=settings.ANTHROPIC_MODEL,
-                    max_tokens=500,
-                    temperature=0.3,
-                    system="You are a professional translator. Provide only the translation without any explanations.",
-                    messages=[{"role": "user", "content": prompt}],
+            def notify(lang, results):
+                on_language_done(
+                    lang, [self._assemble(page.texts, [lang], results, known) for page in pages]
                 )
-                return response.content[0].text.strip()
-            else:
-                response = self.client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a professional translator. Provide only the translation without any explanations.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0.3,
-                    max_tokens=500,
+
+        results = self._run_jobs(jobs, notify, target_languages)
+        return [self._assemble(page.texts, target_languages, results, known) for page in pages]
+
+    def _plan_jobs(
+        self,
+        texts: List[str],
+        target_languages: List[str],
+        existing: Dict[str, Dict[str, str]],
+    ) -> List[Tuple[Tuple[str, ...], List[str]]]:
+        """Split the missing translations into (languages, texts) request jobs."""
+        if self.multi_language:
+            # Texts missing the same languages share their requests
+            groups: Dict[Tuple[str, ...], List[str]] = {}
+            for text in texts:
+                languages = tuple(
+                    lang for lang in target_languages if lang not in existing.get(text, {})
                 )
-                return response.choices[0].message.content.strip()
+                if languages:
+                    groups.setdefault(languages, []).append(text)
+
+            if self.batch:
+                return [
+                    (languages, [group[index] for index in batch])
+                    for languages, group in groups.items()
+                    for batch in plan_batches(group, languages=len(languages))
+                ]
+            return [(languages, [text]) for languages, group in groups.items() for text in group]
+
+        missing = {
+            lang: [text for text in texts if lang not in existing.get(text, {})]
+            for lang in target_languages
+        }
+
+        if self.batch:
+            return [
+                ((lang,), [missing[lang][index] for index in batch])
+                for lang in target_languages
+                for batch in plan_batches(missing[lang])
+            ]
+        return [((lang,), [text]) for lang in target_languages for text in missing[lang]]
+
+    def _estimate_job(self, languages: Tuple[str, ...], job_texts: List[str]) -> Tuple[int, int]:
+        """Estimated (input, output) tokens of a job if none of its texts is cached."""
+        if len(languages) > 1:
+            context = self._translation_context(", ".join(languages))
+            prompt = build_multi_prompt(job_texts, languages, context)
+            return (
+                estimate_tokens(MULTI_SYSTEM_PROMPT) + estimate_tokens(prompt),
+                multi_max_tokens(job_texts, languages),
+            )
 
-        except Exception as e:
-            logger.error(f"Translation error for '{text}': {e}")
-            return text  # Return original text on error
+        lang = languages[0]
+        context = self._translation_context(lang)
+        if self.batch and len(job_texts) > 1:
+            prompt = build_batch_prompt(job_texts, lang, context)
+            return (
+                estimate_tokens(BATCH_SYSTEM_PROMPT) + estimate_tokens(prompt),
+                batch_max_tokens(job_texts),
+            )
+
+        input_tokens = output_tokens = 0
+        for text in job_texts:
+            input_tokens += estimate_tokens(SYSTEM_PROMPT)
+            input_tokens += estimate_tokens(build_prompt(text, lang, context))
+            output_tokens += reply_max_tokens(text)
+        return input_tokens, output_tokens
+
+    def _log_plan(self, jobs: List[Tuple[Tuple[str, ...], List[str]]]) -> None:
+        """Log the estimated spend of a set of jobs and warn if it exceeds the budget."""
+        input_tokens = output_tokens = 0
+        for languages, job_texts in jobs:
+            job_input, job_output = self._estimate_job(languages, job_texts)
+            input_tokens += job_input
+            output_tokens += job_output
+
+        cost = self.budget.cost(input_tokens, output_tokens)
+        logger.info(
+            f"Planned spend before cache hits: up to {input_tokens} input and "
+            f"{output_tokens} output tokens (${cost:.4f})"
+        )
+        budget = self.budget
+        if (budget.max_tokens and input_tokens + output_tokens > budget.max_tokens) or (
+            budget.max_cost and cost > budget.max_cost
+        ):
+            logger.warning(
+                "Planned spend may exceed the run budget; once it runs out, texts are "
+                "served from the translation memory only"
+            )
+
+    def _run_jobs(
+        self,
+        jobs: List[Tuple[Tuple[str, ...], List[str]]],
+        on_language_done: Optional[Callable[[str, Dict[Tuple[str, str], str]], None]] = None,
+        target_languages: Sequence[str] = (),
+    ) -> Dict[Tuple[str, str], str]:
+        """
+        Run translation jobs on the bounded thread pool, keyed by (text, language).
+
+        on_language_done is called from this thread with a language and the results
+        so far as soon as the last job of that language finishes, so its files can
+        be written while slower languages are still being translated. Languages of
+        target_languages without any job are reported before the first request.
+        """
+
+        def run_job(job):
+            languages, job_texts = job
+            if len(languages) > 1:
+                return self.translate_multi(job_texts, list(languages))
+            lang = languages[0]
+            context = self._translation_context(lang)
+            if self.batch:
+                return {lang: self.translate_batch(job_texts, lang, context)}
+            return {lang: [self.translate_text_with_context(job_texts[0], lang, context)]}
+
+        logger.info(
+            f"Running {len(jobs)} translation requests with up to {self.concurrency} in parallel"
+        )
+        self._log_plan(jobs)
+
+        results: Dict[Tuple[str, str], str] = {}
+        remaining = Counter(lang for languages, _ in jobs for lang in languages)
+        if on_language_done is not None:
+            for lang in target_languages:
+                if not remaining[lang]:
+                    on_language_done(lang, results)
+
+        workers = max(1, min(self.concurrency, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_job, job): job for job in jobs}
+            for job_idx, future in enumerate(as_completed(futures), 1):
+                if job_idx % 10 == 0:  # Progress every 10 requests
+                    logger.info(f"  Progress: {job_idx}/{len(jobs)} requests")
+                languages, job_texts = futures[future]
+                translations = future.result()
+                for lang in languages:
+                    for text, translated in zip(job_texts, translations[lang]):
+                        results[(text, lang)] = translated
+                    if self.journal is not None:
+                        self.journal.record(lang, job_texts, translations[lang])
+
+                    remaining[lang] -= 1
+                    if remaining[lang] == 0 and on_language_done is not None:
+                        logger.info(
+                            f"All {lang} translations done after {job_idx}/{len(jobs)} requests"
+                        )
+                        on_language_done(lang, results)
+
+        return results
+
+    @staticmethod
+    def _assemble(
+        texts: List[str],
+        target_languages: List[str],
+        results: Dict[Tuple[str, str], str],
+        existing: Dict[str, Dict[str, str]],
+    ) -> Dict[str, Dict[str, str]]:
+        """Build the translations mapping in text and language order."""
+        return {
+            text: {
+                lang: results[(text, lang)] if (text, lang) in results else existing[text][lang]
+                for lang in target_languages
+            }
+            for text in texts
+        }
+
+    def _with_checkpoint(
+        self, texts: List[str], known: Dict[str, Dict[str, str]]
+    ) -> Dict[str, Dict[str, str]]:
+        """Add the translations recovered from the checkpoint journal to known ones."""
+        if self.journal is None:
+            return known
+        merged = self.journal.known(texts)
+        for text, translations in known.items():
+            merged.setdefault(text, {}).update(translations)
+        return merged
+
+    def _previous_translations(
+        self, html_file: Path, texts: List[str]
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Load the translations of the last build for strings that did not change.
+
+        Args:
+            html_file: Input HTML file.
+            texts: Strings extracted from the current version of the file.
+
+        Returns:
+            Previous translations of texts recorded in the manifest for this file.
+        """
+        translations_file = self.output_dir / f"{html_file.stem}_translations.json"
+        if not translations_file.exists():
+            return {}
+
+        try:
+            with open(translations_file, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable translations {translations_file}: {e}")
+            return {}
+
+        known = self.manifest.known_strings(html_file.name)
+        return {
+            text: previous[text]
+            for text in texts
+            if isinstance(previous.get(text), dict) and content_hash(text) in known
+        }
 
     def generate_language_files(
         self,
@@ -171,53 +955,63 @@ class LangdingTranslator:
         placeholders_dict: Dict[str, str],
     ) -> None:
         """Generate HTML files for each language with translated text."""
-        with open(template_path, "r", encoding="utf-8") as file:
-            template_html = file.read()
-
-        for lang in target_languages:
-            translated_html = template_html
-
-            # Replace placeholders with translations
-            for original_text, placeholder in placeholders_dict.items():
-                if lang in translations.get(original_text, {}):
-                    translated_text = translations[original_text][lang]
-                    translated_html = translated_html.replace(
-                        f"{{{{{placeholder}}}}}", translated_text
-                    )
-
-            # Save language-specific file
-            lang_filename = f"{lang.lower()}_{template_path.name.replace('template_', '')}"
-            lang_file_path = self.output_dir / lang_filename
-
-            with open(lang_file_path, "w", encoding="utf-8") as file:
-                file.write(translated_html)
-
+        for lang_file_path in render_language_files(
+            template_path,
+            translations,
+            target_languages,
+            placeholders_dict,
+            self.output_dir,
+            self.chunk_size,
+        ):
             logger.info(f"Generated: {lang_file_path}")
 
     def generate_redirect_file(self, original_filename: str, target_languages: List[str]) -> None:
-        """Generate an HTML file that detects user's language and redirects accordingly."""
+        """
+        Generate an HTML file that detects the user's language and redirects accordingly.
+
+        The page embeds the lookup table of a LanguageRegistry, so the ?lang=
+        parameter, the stored preference and every navigator language, whether
+        a tag such as "es-MX" or a name, resolve with a few dictionary lookups.
+        """
+        registry = LanguageRegistry(target_languages)
+        lookup_table = json.dumps(registry.lookup, ensure_ascii=False, separators=(",", ":"))
         redirect_html = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <title>Language Selection</title>
     <script>
-        function getPreferredLanguage() {{
-            const urlParams = new URLSearchParams(window.location.search);
-            let lang = urlParams.get('lang') || localStorage.getItem('preferred_language');
-
-            if (!lang) {{
-                lang = navigator.language || navigator.userLanguage;
-                lang = lang.split('-')[0].toLowerCase();
+        // Language tags, names and file prefixes mapped to generated file prefixes
+        const languages = {lookup_table};
+        const defaultLanguage = {json.dumps(registry.default)};
+
+        function resolveLanguage(value) {{
+            let key = String(value || '').trim().toLowerCase().replace(/_/g, '-');
+            while (key) {{
+                if (Object.prototype.hasOwnProperty.call(languages, key)) {{
+                    return languages[key];
+                }}
+                key = key.includes('-') ? key.slice(0, key.lastIndexOf('-')) : '';
             }}
+            return null;
+        }}
 
-            const supportedLangs = {json.dumps([lang.lower() for lang in target_languages])};
-
-            if (!supportedLangs.includes(lang)) {{
-                lang = 'english';
+        function getPreferredLanguage() {{
+            const urlParams = new URLSearchParams(window.location.search);
+            const candidates = [
+                urlParams.get('lang'),
+                localStorage.getItem('preferred_language'),
+                ...(navigator.languages || []),
+                navigator.language || navigator.userLanguage,
+            ];
+
+            for (const candidate of candidates) {{
+                const lang = resolveLanguage(candidate);
+                if (lang) {{
+                    return lang;
+                }}
             }}
-
-            return lang;
+            return defaultLanguage;
         }}
 
         const lang = getPreferredLanguage();
@@ -233,64 +1027,394 @@ class LangdingTranslator:
 </html>"""
 
         redirect_path = self.output_dir / original_filename
-        with open(redirect_path, "w", encoding="utf-8") as file:
+        with atomic_open(redirect_path) as file:
             file.write(redirect_html)
 
         logger.info(f"Generated redirect file: {redirect_path}")
 
-    def process_html_file(self, html_file: Path, target_languages: List[str]) -> None:
-        """Process a single HTML file for translation."""
+    def _check_manifest(
+        self, html_file: Path, target_languages: List[str]
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Hash an input file and compare it with the incremental manifest.
+
+        Args:
+            html_file: Input HTML file.
+            target_languages: Languages requested for this run.
+
+        Returns:
+            The file's content hash (None when incremental mode is off) and whether
+            the file and languages match the last build with its outputs in place.
+        """
+        if self.manifest is None:
+            return None, False
+
+        digest = file_hash(html_file)
+        outputs = [
+            language_file_path(self.output_dir, lang, html_file.name) for lang in target_languages
+        ]
+        up_to_date = self.manifest.is_up_to_date(html_file.name, digest, target_languages) and all(
+            path.exists() for path in outputs
+        )
+        return digest, up_to_date
+
+    def _finish_page(
+        self,
+        page: PreparedPage,
+        translations: Dict[str, Dict[str, str]],
+        target_languages: List[str],
+        digest: Optional[str],
+        render: bool = True,
+    ) -> None:
+        """Save translations, language files, redirect file and manifest entry of a page."""
+        html_file = page.html_file
+
+        # Save translations, leaving out the ones that kept their source text
+        missing = Counter(
+            translation.reason
+            for by_language in translations.values()
+            for translation in by_language.values()
+            if isinstance(translation, Untranslated)
+        )
+        saved = {}
+        for text, by_language in translations.items():
+            kept = {
+                lang: translation
+                for lang, translation in by_language.items()
+                if not isinstance(translation, Untranslated)
+            }
+            if kept:
+                saved[text] = kept
+
+        translations_file = self.output_dir / f"{html_file.stem}_translations.json"
+        with self.metrics.stage("write"):
+            with atomic_open(translations_file) as f:
+                json.dump(saved, f, ensure_ascii=False, indent=2)
+
+        logger.info(f"Saved translations: {translations_file}")
+        if missing:
+            logger.warning(
+                f"{html_file.name}: {sum(missing.values())} translations kept their source "
+                f"text ({missing['budget']} over budget, {missing['error']} failed), "
+                f"they are requested again on the next run"
+            )
+            self.metrics.increment("translations_missing", sum(missing.values()))
+
+        # Generate language files
+        if render:
+            with self.metrics.stage("render"):
+                self.generate_language_files(
+                    translations, target_languages, page.template_path, page.placeholders_dict
+                )
+
+        # Generate redirect file and record the build
+        with self.metrics.stage("write"):
+            self.generate_redirect_file(html_file.name, target_languages)
+
+            if self.negotiation:
+                for path in write_negotiation_files(
+                    self.output_dir, html_file.name, target_languages, self.negotiation
+                ):
+                    logger.info(f"Generated negotiation file: {path}")
+
+            if self.manifest is not None:
+                translated = [
+                    text
+                    for text in page.texts
+                    if not any(
+                        isinstance(translation, Untranslated)
+                        for translation in translations.get(text, {}).values()
+                    )
+                ]
+                self.manifest.record(
+                    html_file.name,
+                    digest,
+                    translated,
+                    target_languages,
+                    complete=len(translated) == len(page.texts),
+                )
+
+        if self.minify or self.precompress:
+            with self.metrics.stage("postprocess"):
+                self.postprocess_outputs(html_file.name, target_languages)
+
+    def postprocess_outputs(self, filename: str, target_languages: List[str]) -> None:
+        """
+        Minify the generated files of a page and write their precompressed siblings.
+
+        Args:
+            filename: Name of the input file.
+            target_languages: Languages whose files were generated.
+        """
+        groups = {
+            language_file_path(self.output_dir, lang, filename): lang for lang in target_languages
+        }
+        groups[self.output_dir / filename] = "redirect"
+
+        sizes = postprocess_files(list(groups), self.minify, self.precompress)
+        for path, file_sizes in sizes.items():
+            self.output_stats.add(groups[path], file_sizes)
+            written = ", ".join(path.name + COMPRESSION_SUFFIXES[name] for name in self.precompress)
+            logger.debug(f"Post-processed: {path}" + (f" ({written})" if written else ""))
+
+    def _prepare_page(self, html_file: Path) -> Optional[PreparedPage]:
+        """
+        Extract the texts of an input file and write its template.
+
+        Args:
+            html_file: Input HTML file.
+
+        Returns:
+            The prepared page, None when the file has no translatable text.
+        """
+        if self.chunk_size:
+            # Extract and template in one streaming pass, without loading the document
+            with self.metrics.stage("template"):
+                page = prepare_page(html_file, self.output_dir, chunk_size=self.chunk_size)
+            if not page.texts:
+                logger.warning(f"No translatable text found in {html_file}")
+                return None
+            logger.info(f"Created template: {page.template_path}")
+        else:
+            # Parse once; extraction and templating share the same tree
+            with self.metrics.stage("parse"):
+                document = parse_document(html_file, self.parser)
+
+                # Extract text
+                texts = self.extract_text_from_html(html_file, document)
+            if not texts:
+                logger.warning(f"No translatable text found in {html_file}")
+                return None
+
+            # Create placeholders
+            placeholders_dict = {text: f"text_{i}" for i, text in enumerate(texts)}
+
+            # Create template
+            with self.metrics.stage("template"):
+                template_path = self.create_template(html_file, placeholders_dict, document)
+            page = PreparedPage(html_file, texts, placeholders_dict, template_path)
+        return page
+
+    def process_html_file(self, html_file: Path, target_languages: List[str]) -> bool:
+        """
+        Process a single HTML file for translation.
+
+        Args:
+            html_file: Input HTML file.
+            target_languages: Target language names.
+
+        Returns:
+            True if output files were generated, False if the file was skipped.
+        """
         logger.info(f"Processing: {html_file}")
 
-        # Extract text
-        texts = self.extract_text_from_html(html_file)
-        if not texts:
-            logger.warning(f"No translatable text found in {html_file}")
-            return
+        digest, up_to_date = self._check_manifest(html_file, target_languages)
+        if up_to_date:
+            logger.info(f"Unchanged since last build, skipping: {html_file}")
+            return False
+
+        page = self._prepare_page(html_file)
+        if page is None:
+            return False
+        texts, placeholders_dict, template_path = (
+            page.texts,
+            page.placeholders_dict,
+            page.template_path,
+        )
 
-        # Create placeholders
-        placeholders_dict = {text: f"text_{i}" for i, text in enumerate(texts)}
+        # Reuse translations of unchanged strings from the last build or the journal
+        previous = self._previous_translations(html_file, texts) if digest else {}
+        previous = self._with_checkpoint(texts, previous)
+        if previous:
+            logger.info(f"Reusing previous translations for {len(previous)} unchanged texts")
 
-        # Create template
-        template_path = self.create_template(html_file, placeholders_dict)
+        on_language_done = None
+        if self.early_write:
 
-        # Batch translates all texts for efficiency
-        translations = {}
-        total_texts = len(texts)
+            def on_language_done(lang, lang_translations):
+                with self.metrics.stage("render"):
+                    self.generate_language_files(
+                        lang_translations, [lang], template_path, placeholders_dict
+                    )
 
-        logger.info(f"Translating {total_texts} text blocks into {len(target_languages)} languages")
+        logger.info(f"Translating {len(texts)} text blocks into {len(target_languages)} languages")
+        with self.metrics.stage("translate"):
+            translations = self.translate_texts(texts, target_languages, previous, on_language_done)
 
-        for lang_idx, lang in enumerate(target_languages, 1):
-            logger.info(f"Translating to {lang} ({lang_idx}/{len(target_languages)})")
+        self._finish_page(page, translations, target_languages, digest, render=not self.early_write)
+        return True
 
-            # Create batch context for better translations
-            context = f"Website content for a Full Stack Developer portfolio. Translate the following texts to {lang}, maintaining professional tone and technical accuracy:"
+    def _process_files_staged(
+        self, html_files: List[Path], target_languages: List[str], summary: Dict[str, int]
+    ) -> None:
+        """
+        Process files stage by stage: prepare all, translate once, render all.
 
-            for text_idx, text in enumerate(texts, 1):
-                if text_idx % 10 == 0:  # Progress every 10 texts
-                    logger.info(f"  Progress: {text_idx}/{total_texts} texts")
+        Parsing, templating and rendering run on a process pool when more than one
+        worker is configured. Translation requests of all files run in one shared,
+        deduplicated concurrent stage in this process. A failure in any stage only
+        drops the affected file.
+        """
+        digests = {}
+        for html_file in html_files:
+            logger.info(f"Processing: {html_file}")
+            try:
+                digest, up_to_date = self._check_manifest(html_file, target_languages)
+            except Exception as e:
+                logger.error(f"Error processing {html_file}: {e}")
+                summary["failed"] += 1
+                continue
+            if up_to_date:
+                logger.info(f"Unchanged since last build, skipping: {html_file}")
+                summary["skipped"] += 1
+                continue
+            digests[html_file] = digest
+
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers=1)
+
+        with pool:
+            # Stage 1: parse, extract and template every file
+            futures = [
+                (
+                    html_file,
+                    pool.submit(
+                        prepare_page,
+                        html_file,
+                        self.output_dir,
+                        self.parser,
+                        self.prettify,
+                        self.chunk_size,
+                    ),
+                )
+                for html_file in digests
+            ]
+            pages = []
+            for html_file, future in futures:
+                try:
+                    with self.metrics.stage("prepare"):
+                        page = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {html_file}: {e}")
+                    summary["failed"] += 1
+                    continue
+                if not page.texts:
+                    logger.warning(f"No translatable text found in {html_file}")
+                    summary["skipped"] += 1
+                    continue
+                logger.info(f"Created template: {page.template_path}")
+                pages.append(page)
+
+            # Stage 2: translate all pages together
+            previous = [
+                self._with_checkpoint(
+                    page.texts,
+                    (
+                        self._previous_translations(page.html_file, page.texts)
+                        if digests[page.html_file]
+                        else {}
+                    ),
+                )
+                for page in pages
+            ]
+            renders: Dict[Path, List[Future]] = {page.html_file: [] for page in pages}
+
+            def submit_renders(languages, translations_per_page):
+                for page, page_translations in zip(pages, translations_per_page):
+                    renders[page.html_file].append(
+                        pool.submit(
+                            render_language_files,
+                            page.template_path,
+                            page_translations,
+                            languages,
+                            page.placeholders_dict,
+                            self.output_dir,
+                            self.chunk_size,
+                        )
+                    )
 
-                if text not in translations:
-                    translations[text] = {}
+            # With early write, a language is rendered as soon as it is translated
+            on_language_done = None
+            if self.early_write:
 
-                translated = self.translate_text_with_context(text, lang, context)
-                translations[text][lang] = translated
-                # No rate limiting for speed
+                def on_language_done(lang, translations_per_page):
+                    submit_renders([lang], translations_per_page)
 
-        # Save translations
-        translations_file = self.output_dir / f"{html_file.stem}_translations.json"
-        with open(translations_file, "w", encoding="utf-8") as f:
-            json.dump(translations, f, ensure_ascii=False, indent=2)
+            with self.metrics.stage("translate"):
+                translations = self.translate_pages(
+                    pages, target_languages, previous, on_language_done
+                )
 
-        logger.info(f"Saved translations: {translations_file}")
+            # Stage 3: render language files
+            if not self.early_write:
+                submit_renders(target_languages, translations)
+
+            for page, page_translations in zip(pages, translations):
+                try:
+                    with self.metrics.stage("render"):
+                        lang_file_paths = [
+                            path for future in renders[page.html_file] for path in future.result()
+                        ]
+                    for lang_file_path in lang_file_paths:
+                        logger.info(f"Generated: {lang_file_path}")
+                    self._finish_page(
+                        page,
+                        page_translations,
+                        target_languages,
+                        digests[page.html_file],
+                        render=False,
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing {page.html_file}: {e}")
+                    summary["failed"] += 1
+                    continue
+                summary["processed"] += 1
+
+    def _process_files(self, html_files: List[Path], target_languages: List[str]) -> None:
+        """Process a set of files through the staged pipeline, then log a summary."""
+        start_time = time.time()
+        summary = {"processed": 0, "skipped": 0, "failed": 0}
+
+        self._process_files_staged(html_files, target_languages, summary)
+        for status, count in summary.items():
+            self.metrics.increment(f"files_{status}", count)
+
+        # Keep the journal for --resume while any file still has to be redone
+        if self.journal is not None:
+            if summary["failed"]:
+                self.journal.close()
+                logger.info(f"Checkpoint kept for --resume: {self.journal.path}")
+            else:
+                self.journal.clear()
 
-        # Generate language files
-        self.generate_language_files(
-            translations, target_languages, template_path, placeholders_dict
+        logger.info(
+            f"Files: {summary['processed']} processed, {summary['skipped']} skipped, "
+            f"{summary['failed']} failed of {len(html_files)} in {time.time() - start_time:.2f}s"
         )
 
-        # Generate redirect file
-        self.generate_redirect_file(html_file.name, target_languages)
+    def write_run_report(self, prometheus: bool = False) -> Path:
+        """
+        Write stage timings, provider latencies, token usage and per-provider retry counts.
+
+        Args:
+            prometheus: Also write the metrics in Prometheus text format.
+
+        Returns:
+            Path of the JSON run report in the output directory.
+        """
+        return self.metrics.write(
+            self.output_dir,
+            prometheus=prometheus,
+            scheduler={
+                provider: scheduler.stats for provider, scheduler in self.schedulers.items()
+            },
+            budget=self.budget.stats,
+            router=self.router.stats if self.router is not None else None,
+            output=self.output_stats.stats if self.minify or self.precompress else None,
+            cache=self.cache.stats if self.cache is not None else None,
+        )
 
     def process_template_directory(self, target_languages: List[str]) -> None:
         """Process all HTML files in the templates directory."""
@@ -298,16 +1422,12 @@ class LangdingTranslator:
             logger.warning(f"Template directory not found: {self.template_dir}")
             return
 
-        html_files = list(self.template_dir.glob("*.html"))
+        html_files = sorted(self.template_dir.glob("*.html"))
         if not html_files:
             logger.warning("No HTML files found in templates directory")
             return
 
-        for html_file in html_files:
-            try:
-                self.process_html_file(html_file, target_languages)
-            except Exception as e:
-                logger.error(f"Error processing {html_file}: {e}")
+        self._process_files(html_files, target_languages)
 
     def process_input_directory(self, target_languages: List[str]) -> None:
         """Process all HTML files in the input directory."""
@@ -315,16 +1435,12 @@ class LangdingTranslator:
             logger.warning(f"Input directory not found: {self.input_dir}")
             return
 
-        html_files = list(self.input_dir.glob("*.html"))
+        html_files = sorted(self.input_dir.glob("*.html"))
         if not html_files:
             logger.warning("No HTML files found in input directory")
             return
 
-        for html_file in html_files:
-            try:
-                self.process_html_file(html_file, target_languages)
-            except Exception as e:
-                logger.error(f"Error processing {html_file}: {e}")
+        self._process_files(html_files, target_languages)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -362,6 +1478,153 @@ def parse_arguments() -> argparse.Namespace:
         help="Process files from templates directory instead of input directory",
     )
 
+    parser.add_argument(
+        "--batch",
+        action=argparse.BooleanOptionalAction,
+        default=settings.BATCH_ENABLED,
+        help="Translate many texts per API request (--no-batch for one request per text)",
+    )
+
+    parser.add_argument(
+        "--multi-language",
+        action=argparse.BooleanOptionalAction,
+        default=settings.MULTI_LANGUAGE,
+        help="Request every target language at once instead of one request per language",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.CONCURRENCY,
+        help="Maximum number of translation requests running in parallel",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WORKERS,
+        help="Number of processes parsing and rendering files of a directory",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action=argparse.BooleanOptionalAction,
+        default=settings.INCREMENTAL,
+        help="Skip unchanged files and only translate new or changed strings",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=settings.CACHE_DIR,
+        help="Directory of the persistent translation memory",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the translation memory and always call the AI provider",
+    )
+
+    parser.add_argument(
+        "--fallback-provider",
+        choices=("openai", "anthropic", "mock"),
+        default=settings.FALLBACK_PROVIDER or None,
+        help="Second AI provider that requests fail over to",
+    )
+
+    parser.add_argument(
+        "--hedge",
+        action=argparse.BooleanOptionalAction,
+        default=settings.HEDGE_REQUESTS,
+        help="Send slow requests to the fallback provider too and use the first reply",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run from its checkpoint journal",
+    )
+
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=settings.TOKEN_BUDGET,
+        help="Tokens the run may spend before serving only cached translations (0: unlimited)",
+    )
+
+    parser.add_argument(
+        "--cost-budget",
+        type=float,
+        default=settings.COST_BUDGET,
+        help="USD the run may spend before serving only cached translations (0: unlimited)",
+    )
+
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=settings.PARSER_BACKEND,
+        help="HTML parser backend; 'stream' keeps the original markup in templates",
+    )
+
+    parser.add_argument(
+        "--prettify",
+        action=argparse.BooleanOptionalAction,
+        default=settings.PRETTIFY_TEMPLATES,
+        help="Re-indent templates (html.parser and lxml backends only)",
+    )
+
+    parser.add_argument(
+        "--low-memory",
+        action=argparse.BooleanOptionalAction,
+        default=settings.LOW_MEMORY,
+        help="Stream very large files through templating and rendering in chunks",
+    )
+
+    parser.add_argument(
+        "--minify",
+        action=argparse.BooleanOptionalAction,
+        default=settings.MINIFY_OUTPUT,
+        help="Minify generated language files and redirect pages",
+    )
+
+    parser.add_argument(
+        "--precompress",
+        nargs="*",
+        choices=list(COMPRESSION_SUFFIXES),
+        default=settings.PRECOMPRESS,
+        help="Also write precompressed .gz / .br files next to generated files",
+    )
+
+    parser.add_argument(
+        "--negotiation",
+        nargs="*",
+        choices=NEGOTIATION_FORMATS,
+        default=settings.NEGOTIATION,
+        help="Also write server-side Accept-Language negotiation for these servers",
+    )
+
+    parser.add_argument(
+        "--early-write",
+        action=argparse.BooleanOptionalAction,
+        default=settings.EARLY_WRITE,
+        help="Write each language's files as soon as its translations are done",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=settings.STREAM_RESPONSES,
+        help="Read provider replies with the streaming APIs",
+    )
+
+    parser.add_argument(
+        "--prometheus",
+        action=argparse.BooleanOptionalAction,
+        default=settings.PROMETHEUS_REPORT,
+        help="Also write run metrics in Prometheus text format to the output directory",
+    )
+
     return parser.parse_args()
 
 
@@ -377,7 +1640,7 @@ def main():
         if not settings.ANTHROPIC_API_KEY:
             logger.error("ANTHROPIC_API_KEY environment variable not set")
             raise ValueError("Please set the ANTHROPIC_API_KEY environment variable")
-    else:
+    elif settings.AI_PROVIDER.lower() != "mock":
         if not settings.OPENAI_API_KEY:
             logger.error("OPENAI_API_KEY environment variable not set")
             raise ValueError("Please set the OPENAI_API_KEY environment variable")
@@ -385,13 +1648,39 @@ def main():
     # Set target languages
     target_languages = args.languages if args.languages else settings.LANGS
 
+    # Translation memory is on unless disabled in settings or on the command line
+    cache_dir = None if args.no_cache or not settings.CACHE_ENABLED else args.cache_dir
+
     logger.info(f"Starting Langding translation process")
     logger.info(f"Target languages: {', '.join(target_languages)}")
 
+    translator = None
     try:
         # Initialize translator
         translator = LangdingTranslator(
-            input_dir=args.input_dir, output_dir=args.output_dir, template_dir=args.template_dir
+            input_dir=args.input_dir,
+            output_dir=args.output_dir,
+            template_dir=args.template_dir,
+            cache_dir=cache_dir,
+            batch=args.batch,
+            multi_language=args.multi_language,
+            minify=args.minify,
+            precompress=args.precompress,
+            negotiation=args.negotiation,
+            concurrency=args.concurrency,
+            incremental=args.incremental,
+            workers=args.workers,
+            early_write=args.early_write,
+            stream=args.stream,
+            parser=args.parser,
+            prettify=args.prettify,
+            chunk_size=settings.LOW_MEMORY_CHUNK_SIZE if args.low_memory else 0,
+            token_budget=args.token_budget,
+            cost_budget=args.cost_budget,
+            fallback_provider=args.fallback_provider,
+            hedge=args.hedge,
+            checkpoint=settings.CHECKPOINT,
+            resume=args.resume,
         )
 
         # Process files
@@ -409,6 +1698,23 @@ def main():
         raise
 
     finally:
+        if translator is not None:
+            if translator.cache is not None:
+                translator.cache.save()
+                logger.info(translator.cache.summary())
+            for provider, scheduler in translator.schedulers.items():
+                logger.info(f"{provider}: {scheduler.summary()}")
+            logger.info(translator.budget.summary())
+            if translator.minify or translator.precompress:
+                logger.info(translator.output_stats.summary())
+            if translator.router is not None:
+                logger.info(translator.router.summary())
+                translator.router.close()
+            close_http_client()
+            if settings.RUN_REPORT:
+                report_path = translator.write_run_report(prometheus=args.prometheus)
+                logger.info(f"Run report: {report_path}")
+
         elapsed_time = time.time() - start_time
         logger.info(f"Total execution time: {elapsed_time:.2f} seconds")
 
@@ -0,0 +1,140 @@
+"""
+manifest.py
+~~~~~~~~~~~
+
+Build manifest for incremental runs.
+The manifest lives in the output directory and records, per input file, the
+content hash of the file, the hashes of its extracted strings and the
+languages generated, so unchanged work can be skipped on the next run.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from src.logger import logger
+
+
+def content_hash(data: str) -> str:
+    """Return the SHA-256 hex digest of a text."""
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Per-file content hashes, string hashes and languages of the last build."""
+
+    FILENAME = "langding_manifest.json"
+    VERSION = 1
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize the manifest.
+
+        Args:
+            output_dir: Output directory holding the manifest file.
+        """
+        self.path = Path(output_dir) / self.FILENAME
+        self._files: Optional[Dict[str, Dict]] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load the manifest file on first use."""
+        if self._files is not None:
+            return self._files
+
+        self._files = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if data.get("version") == self.VERSION:
+                    self._files = data.get("files", {})
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+        return self._files
+
+    def is_up_to_date(self, name: str, digest: str, languages: List[str]) -> bool:
+        """
+        Check whether a file was already built from the same content and languages.
+
+        Args:
+            name: Input file name.
+            digest: Current content hash of the file.
+            languages: Languages requested for this run.
+
+        Returns:
+            True if the last build used the same content, covered every language
+            and translated every string.
+        """
+        entry = self._load().get(name)
+        return (
+            entry is not None
+            and entry.get("hash") == digest
+            and set(languages) <= set(entry.get("languages", []))
+            and entry.get("complete", True)
+        )
+
+    def known_strings(self, name: str) -> Set[str]:
+        """
+        Hashes of the strings extracted from a file in the last build.
+
+        Args:
+            name: Input file name.
+
+        Returns:
+            Set of string content hashes, empty if the file is unknown.
+        """
+        entry = self._load().get(name, {})
+        return set(entry.get("strings", []))
+
+    def record(
+        self,
+        name: str,
+        digest: str,
+        texts: List[str],
+        languages: List[str],
+        complete: bool = True,
+    ) -> None:
+        """
+        Record a completed build of a file and save the manifest.
+
+        Args:
+            name: Input file name.
+            digest: Content hash of the file.
+            texts: Strings of the file translated into every language.
+            languages: Languages generated for the file.
+            complete: False when some strings kept their source text, so the file
+                is built again on the next run even if it did not change.
+        """
+        entry = {
+            "hash": digest,
+            "strings": [content_hash(text) for text in texts],
+            "languages": list(languages),
+        }
+        if not complete:
+            entry["complete"] = False
+        self._load()[name] = entry
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"version": self.VERSION, "files": self._load()},
+                file,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(temp_path, self.path)
@@ -0,0 +1,278 @@
+"""
+metrics.py
+~~~~~~~~~~
+
+Run instrumentation for the translation pipeline.
+Collects wall time per pipeline stage, per-provider request latencies with
+percentiles, token usage reported by the provider responses and plain
+counters, and writes them as a JSON run report and optionally in the
+Prometheus text exposition format.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.checkpoint import atomic_open
+
+REPORT_FILENAME = "langding_report.json"
+PROMETHEUS_FILENAME = "langding_metrics.prom"
+
+# Latency percentiles included in reports
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+
+    Args:
+        values: Observed values, in any order.
+        q: Quantile between 0 and 1.
+
+    Returns:
+        The percentile, or 0.0 for no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def token_usage(response: Any) -> Tuple[int, int]:
+    """
+    Read (input, output) token counts from an OpenAI or Anthropic response.
+
+    Args:
+        response: Provider response object.
+
+    Returns:
+        Token counts, zero when the response does not report usage.
+    """
+    usage = getattr(response, "usage", None)
+    counts = []
+    for names in (("prompt_tokens", "input_tokens"), ("completion_tokens", "output_tokens")):
+        value = next(
+            (getattr(usage, name) for name in names if isinstance(getattr(usage, name, None), int)),
+            0,
+        )
+        counts.append(value)
+    return counts[0], counts[1]
+
+
+class RunMetrics:
+    """Thread-safe collector of stage timings, provider latencies and counters."""
+
+    def __init__(self):
+        """Initialize empty metrics and start the run clock."""
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self.providers: Dict[str, Dict[str, int]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block of work and add it to a pipeline stage.
+
+        Args:
+            name: Stage name, e.g. "parse", "translate" or "render".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stage = self.stages.setdefault(name, {"count": 0, "seconds": 0.0})
+                stage["count"] += 1
+                stage["seconds"] += elapsed
+
+    def observe_request(
+        self,
+        provider: str,
+        seconds: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        failed: bool = False,
+    ) -> None:
+        """
+        Record one provider API request.
+
+        Args:
+            provider: Provider name.
+            seconds: Request latency.
+            input_tokens: Prompt tokens reported by the provider.
+            output_tokens: Completion tokens reported by the provider.
+            failed: Whether the request raised an error.
+        """
+        with self._lock:
+            self.latencies.setdefault(provider, []).append(seconds)
+            totals = self.providers.setdefault(
+                provider, {"requests": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0}
+            )
+            totals["requests"] += 1
+            totals["errors"] += int(failed)
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add to a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self, **sections: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the run report.
+
+        Args:
+            sections: Extra named sections, such as scheduler or cache stats.
+                None values are left out.
+
+        Returns:
+            JSON-serializable report.
+        """
+        with self._lock:
+            providers = {}
+            for provider, totals in self.providers.items():
+                latencies = self.latencies.get(provider, [])
+                latency = {f"p{round(q * 100)}": percentile(latencies, q) for q in QUANTILES}
+                latency["mean"] = sum(latencies) / len(latencies) if latencies else 0.0
+                latency["max"] = max(latencies, default=0.0)
+                providers[provider] = {
+                    **totals,
+                    "latency_seconds": {key: round(value, 4) for key, value in latency.items()},
+                }
+
+            report = {
+                "started_at": self.started_at.isoformat(),
+                "duration_seconds": round(time.perf_counter() - self._start, 3),
+                "stages": {
+                    name: {"count": stage["count"], "seconds": round(stage["seconds"], 4)}
+                    for name, stage in self.stages.items()
+                },
+                "providers": providers,
+                "counters": dict(self.counters),
+            }
+
+        report.update({name: value for name, value in sections.items() if value is not None})
+        return report
+
+    @staticmethod
+    def to_prometheus(report: Dict[str, Any]) -> str:
+        """
+        Render a run report in the Prometheus text exposition format.
+
+        Args:
+            report: Report built by report().
+
+        Returns:
+            Metrics text, one sample per line.
+        """
+        lines = [
+            "# HELP langding_run_duration_seconds Wall time of the run.",
+            "# TYPE langding_run_duration_seconds gauge",
+            f"langding_run_duration_seconds {report['duration_seconds']}",
+            "# HELP langding_stage_seconds_total Wall time spent per pipeline stage.",
+            "# TYPE langding_stage_seconds_total counter",
+        ]
+        for name, stage in report["stages"].items():
+            lines.append(f'langding_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}')
+
+        lines += [
+            "# HELP langding_provider_request_seconds Provider request latency.",
+            "# TYPE langding_provider_request_seconds summary",
+        ]
+        for provider, stats in report["providers"].items():
+            latency = stats["latency_seconds"]
+            for q in QUANTILES:
+                lines.append(
+                    f'langding_provider_request_seconds{{provider="{provider}",quantile="{q}"}} '
+                    f'{latency[f"p{round(q * 100)}"]}'
+                )
+            lines.append(
+                f'langding_provider_request_seconds_sum{{provider="{provider}"}} '
+                f'{round(latency["mean"] * stats["requests"], 4)}'
+            )
+            lines.append(
+                f'langding_provider_request_seconds_count{{provider="{provider}"}} '
+                f'{stats["requests"]}'
+            )
+
+        lines += [
+            "# HELP langding_provider_tokens_total Tokens reported by the provider.",
+            "# TYPE langding_provider_tokens_total counter",
+        ]
+        for provider, stats in report["providers"].items():
+            for direction in ("input", "output"):
+                lines.append(
+                    f'langding_provider_tokens_total{{provider="{provider}",'
+                    f'direction="{direction}"}} {stats[f"{direction}_tokens"]}'
+                )
+
+        lines += [
+            "# HELP langding_provider_errors_total Failed provider requests.",
+            "# TYPE langding_provider_errors_total counter",
+        ]
+        for provider, stats in report["providers"].items():
+            lines.append(
+                f'langding_provider_errors_total{{provider="{provider}"}} {stats["errors"]}'
+            )
+
+        # Counters and stats sections become one gauge per numeric value
+        for section in ("counters", "cache", "budget"):
+            for key, value in (report.get(section) or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"langding_{section}_{key} {value}")
+        for provider, stats in (report.get("scheduler") or {}).items():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f'langding_scheduler_{key}{{provider="{provider}"}} {value}')
+
+        if report.get("output"):
+            lines += [
+                "# HELP langding_output_bytes Size of the generated files per language and format.",
+                "# TYPE langding_output_bytes gauge",
+            ]
+            for group, stats in report["output"].items():
+                for key, value in stats.items():
+                    if key.endswith("_bytes"):
+                        lines.append(
+                            f'langding_output_bytes{{language="{group}",'
+                            f'format="{key[: -len("_bytes")]}"}} {value}'
+                        )
+
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self, output_dir: Path, prometheus: bool = False, **sections: Optional[Dict[str, Any]]
+    ) -> Path:
+        """
+        Write the JSON run report, and the Prometheus metrics if requested.
+
+        Args:
+            output_dir: Directory receiving the report files.
+            prometheus: Also write the Prometheus text format.
+            sections: Extra report sections, see report().
+
+        Returns:
+            Path of the JSON report.
+        """
+        report = self.report(**sections)
+        report_path = Path(output_dir) / REPORT_FILENAME
+        with atomic_open(report_path) as file:
+            json.dump(report, file, indent=2)
+
+        if prometheus:
+            with atomic_open(Path(output_dir) / PROMETHEUS_FILENAME) as file:
+                file.write(self.to_prometheus(report))
+        return report_path
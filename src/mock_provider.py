@@ -0,0 +1,248 @@
+"""
+mock_provider.py
+~~~~~~~~~~~~~~~~
+
+Offline, deterministic stand-in for an AI provider.
+MockClient answers the same chat.completions.create() calls as the OpenAI
+client, with simulated latency, jitter, transient errors and 429 throttling,
+so the pipeline can be tested and benchmarked without a live API. A text is
+always translated to "[<language>] <text>".
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.batching import estimate_tokens
+from src.config import settings
+
+SINGLE_PATTERN = re.compile(
+    r'Text to translate: "(?P<text>.*)"\n\nReturn ONLY the translated text in (?P<lang>.+?)\. ',
+    re.DOTALL,
+)
+BATCH_PATTERN = re.compile(
+    r"Texts to translate \(JSON array\):\n(?P<texts>\[.*\])\n\n.*translations in (?P<lang>.+?), ",
+    re.DOTALL,
+)
+MULTI_PATTERN = re.compile(
+    r"Texts to translate \(JSON array\):\n(?P<texts>\[.*\])\n\n"
+    r"Target languages \(JSON array\):\n(?P<languages>\[.*?\])\n\n",
+    re.DOTALL,
+)
+
+
+class MockProviderError(Exception):
+    """Simulated provider failure carrying an HTTP status like the SDK errors."""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message.
+            status_code: Simulated HTTP status code.
+            retry_after: Seconds sent in a simulated Retry-After header.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+def mock_translate(text: str, target_language: str) -> str:
+    """Deterministic translation returned by the mock provider."""
+    return f"[{target_language}] {text}"
+
+
+def mock_reply(prompt: str) -> str:
+    """
+    Build the reply to a single, batch or multi-language translation prompt.
+
+    Args:
+        prompt: User prompt built by the translator.
+
+    Returns:
+        The translated text, a JSON array of translations for a batch prompt or a
+        JSON object of them per language for a multi-language prompt. Unknown
+        prompts are echoed back.
+    """
+    match = MULTI_PATTERN.search(prompt)
+    if match:
+        texts = json.loads(match.group("texts"))
+        translated = {
+            lang: [mock_translate(text, lang) for text in texts]
+            for lang in json.loads(match.group("languages"))
+        }
+        return json.dumps(translated, ensure_ascii=False)
+
+    match = BATCH_PATTERN.search(prompt)
+    if match:
+        texts = json.loads(match.group("texts"))
+        translated = [mock_translate(text, match.group("lang")) for text in texts]
+        return json.dumps(translated, ensure_ascii=False)
+
+    match = SINGLE_PATTERN.search(prompt)
+    if match:
+        return mock_translate(match.group("text"), match.group("lang"))
+    return prompt
+
+
+class _Completions:
+    """The chat.completions namespace of MockClient."""
+
+    def __init__(self, client: "MockClient"):
+        """Bind the namespace to its client."""
+        self._client = client
+
+    def create(
+        self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs
+    ) -> Union[SimpleNamespace, Iterator[SimpleNamespace]]:
+        """Answer a chat completion request like the OpenAI client, optionally streamed."""
+        response = self._client.complete(messages[-1]["content"])
+        return stream_chunks(response) if stream else response
+
+
+def stream_chunks(response: SimpleNamespace, size: int = 16) -> Iterator[SimpleNamespace]:
+    """Split a completion into OpenAI-style stream chunks, ending with a usage chunk."""
+    content = response.choices[0].message.content
+    for start in range(0, len(content), size):
+        delta = SimpleNamespace(content=content[start : start + size])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+    yield SimpleNamespace(choices=[], usage=response.usage)
+
+
+class MockClient:
+    """Local provider client with configurable latency and failure injection."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int = 0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            latency: Mean simulated response time in seconds.
+            jitter: Maximum random deviation from latency in seconds.
+            error_rate: Probability of a retryable 503 error per request.
+            rate_limit_rate: Probability of a 429 throttling error per request.
+            seed: Seed of the random generator driving jitter and failures.
+            sleep: Function used to simulate latency.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+
+    @classmethod
+    def from_settings(cls) -> "MockClient":
+        """Build a client from the MOCK_* settings."""
+        return cls(
+            latency=settings.MOCK_LATENCY,
+            jitter=settings.MOCK_JITTER,
+            error_rate=settings.MOCK_ERROR_RATE,
+            rate_limit_rate=settings.MOCK_RATE_LIMIT_RATE,
+            seed=settings.MOCK_SEED,
+        )
+
+    def complete(self, prompt: str) -> SimpleNamespace:
+        """
+        Simulate one API request.
+
+        Args:
+            prompt: User prompt.
+
+        Returns:
+            Response shaped like an OpenAI chat completion.
+
+        Raises:
+            MockProviderError: When a 429 or 503 failure is injected.
+        """
+        delay, roll = self._draw()
+        if delay > 0:
+            self._sleep(delay)
+        return self._respond(prompt, roll)
+
+    def _draw(self) -> Tuple[float, float]:
+        """Count a request and draw its simulated latency and failure roll."""
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            return delay, self._random.random()
+
+    def _respond(self, prompt: str, roll: float) -> SimpleNamespace:
+        """Raise the failure drawn for a request, or answer it."""
+        if roll < self.rate_limit_rate:
+            with self._lock:
+                self.rate_limited += 1
+            raise MockProviderError("Simulated rate limit", 429, retry_after=self.latency)
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.errors += 1
+            raise MockProviderError("Simulated server error", 503)
+
+        reply = mock_reply(prompt)
+        usage = SimpleNamespace(
+            prompt_tokens=estimate_tokens(prompt), completion_tokens=estimate_tokens(reply)
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=usage
+        )
+
+
+class _AsyncCompletions:
+    """The chat.completions namespace of AsyncMockClient."""
+
+    def __init__(self, client: "AsyncMockClient"):
+        """Bind the namespace to its client."""
+        self._client = client
+
+    async def create(
+        self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs
+    ) -> Union[SimpleNamespace, AsyncIterator[SimpleNamespace]]:
+        """Answer a chat completion request like the OpenAI async client."""
+        response = await self._client.acomplete(messages[-1]["content"])
+        return _async_chunks(response) if stream else response
+
+
+async def _async_chunks(response: SimpleNamespace) -> AsyncIterator[SimpleNamespace]:
+    """Stream chunks of a completion as an async iterator."""
+    for chunk in stream_chunks(response):
+        yield chunk
+
+
+class AsyncMockClient(MockClient):
+    """MockClient answering like the OpenAI async client, waiting with asyncio.sleep."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the client, see MockClient."""
+        super().__init__(*args, **kwargs)
+        self.chat = SimpleNamespace(completions=_AsyncCompletions(self))
+
+    async def acomplete(self, prompt: str) -> SimpleNamespace:
+        """Simulate one API request without blocking the event loop, see complete()."""
+        delay, roll = self._draw()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._respond(prompt, roll)
+
+    async def close(self) -> None:
+        """Nothing to release, like the SDK clients' close()."""
@@ -0,0 +1,372 @@
+"""
+negotiation.py
+~~~~~~~~~~~~~~
+
+Server-side language negotiation for generated pages.
+Instead of the JavaScript redirect page, the web server picks the language
+variant of a page from the Accept-Language header on the first request. The
+languages generated for every page are kept in a table in the output
+directory, from which this module writes an nginx map, Apache type maps with
+an .htaccess file, and serves the directory itself as a WSGI application.
+
+Usage:
+    python -m src.negotiation output --port 8000
+"""
+
+import argparse
+import json
+import mimetypes
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from wsgiref.simple_server import make_server
+
+from src.checkpoint import atomic_open
+from src.languages import LanguageRegistry, lookup
+from src.logger import logger
+from src.postprocess import COMPRESSION_SUFFIXES
+
+NEGOTIATION_FORMATS = ("nginx", "apache", "wsgi")
+
+TABLE_FILENAME = "langding_negotiation.json"
+NGINX_MAP_FILENAME = "langding.nginx.map.conf"
+NGINX_FILENAME = "langding.nginx.conf"
+HTACCESS_FILENAME = ".htaccess"
+
+# A quality value such as "q=0.8" in a language range
+QUALITY_PATTERN = re.compile(r"^q=([0-9.]+)$")
+
+
+def parse_accept_language(header: str) -> List[str]:
+    """
+    Parse an Accept-Language header into language ranges by preference.
+
+    Args:
+        header: Header value, e.g. "es-MX,es;q=0.9,en;q=0.5".
+
+    Returns:
+        Lowercased ranges ordered by quality, in header order on ties. Ranges
+        with quality 0 are left out.
+    """
+    ranges = []
+    for position, part in enumerate(header.split(",")):
+        tag, *params = [piece.strip() for piece in part.split(";")]
+        quality = 1.0
+        for param in params:
+            match = QUALITY_PATTERN.match(param)
+            if match:
+                try:
+                    quality = float(match.group(1))
+                except ValueError:
+                    quality = 0.0
+        if tag and quality > 0:
+            ranges.append((-quality, position, tag.lower()))
+    return [tag for _, _, tag in sorted(ranges)]
+
+
+def negotiate(header: str, languages: Dict[str, str], default: str) -> str:
+    """
+    Pick the language variant for an Accept-Language header.
+
+    Ranges are looked up by preference, each one from the full tag down to its
+    primary subtag, so "es-MX" is served by "es" when there is no "es-MX" variant.
+
+    Args:
+        header: Accept-Language header value.
+        languages: Tag lookup table, see LanguageRegistry.tags.
+        default: Prefix served when no range matches.
+
+    Returns:
+        The file prefix of the variant to serve.
+    """
+    for tag in parse_accept_language(header):
+        if tag == "*":
+            return default
+        prefix = lookup(languages, tag)
+        if prefix is not None:
+            return prefix
+    return default
+
+
+def load_table(output_dir: Path) -> Dict[str, Any]:
+    """
+    Read the negotiation table of an output directory.
+
+    Args:
+        output_dir: Directory of generated files.
+
+    Returns:
+        {"pages": {file name: {"default": prefix, "languages": {tag: prefix}}}},
+        empty when no table was written yet.
+    """
+    path = Path(output_dir) / TABLE_FILENAME
+    if not path.exists():
+        return {"pages": {}}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def page_entry(target_languages: Sequence[str]) -> Dict[str, Any]:
+    """
+    Negotiation entry of a page generated in some languages.
+
+    Args:
+        target_languages: Languages of the page.
+
+    Returns:
+        The default prefix and the tag lookup table of the languages, see
+        LanguageRegistry.
+    """
+    registry = LanguageRegistry(target_languages)
+    return {"default": registry.default, "languages": registry.tags}
+
+
+def nginx_map(table: Dict[str, Any]) -> str:
+    """
+    nginx map of the preferred Accept-Language entry to a file prefix.
+
+    nginx cannot weigh quality values, so the first language of the header is
+    used, which is the most preferred one for every mainstream browser.
+
+    Args:
+        table: Negotiation table.
+
+    Returns:
+        Configuration for the http block.
+    """
+    languages: Dict[str, str] = {}
+    for page in table["pages"].values():
+        languages.update(page["languages"])
+
+    lines = [
+        f"# Generated by Langding from {TABLE_FILENAME}; include in the http block.",
+        "map $http_accept_language $langding_lang {",
+        '    default "";',
+    ]
+    # Longer tags first, so a regional variant wins over its language
+    for tag in sorted(languages, key=lambda tag: (-len(tag), tag)):
+        lines.append(f'    "~*^{re.escape(tag)}(?:[-,;]|$)" {languages[tag]};')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def nginx_locations(table: Dict[str, Any]) -> str:
+    """
+    nginx locations serving the negotiated variant of every page.
+
+    Args:
+        table: Negotiation table.
+
+    Returns:
+        Configuration for the server block whose root is the output directory.
+    """
+    lines = [
+        f"# Generated by Langding from {TABLE_FILENAME}; include in the server block",
+        f"# and {NGINX_MAP_FILENAME} in the http block.",
+    ]
+    for name, page in sorted(table["pages"].items()):
+        lines += [
+            f"location = /{name} {{",
+            "    add_header Vary Accept-Language;",
+            f"    try_files /${{langding_lang}}_{name} /{page['default']}_{name} =404;",
+            "}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def apache_type_map(name: str, page: Dict[str, Any]) -> str:
+    """
+    Apache type map listing the language variants of a page.
+
+    Args:
+        name: File name of the page.
+        page: Negotiation entry of the page.
+
+    Returns:
+        Contents of the page's .var file.
+    """
+    tags: Dict[str, List[str]] = {}
+    for tag, prefix in page["languages"].items():
+        tags.setdefault(prefix, []).append(tag)
+    records = [
+        f"URI: {prefix}_{name}\n"
+        f"Content-Type: text/html; charset=utf-8\n"
+        f"Content-Language: {', '.join(prefix_tags)}"
+        for prefix, prefix_tags in tags.items()
+    ]
+    return "\n\n".join(records) + "\n"
+
+
+def apache_htaccess(table: Dict[str, Any]) -> str:
+    """
+    .htaccess routing every page through its type map (mod_negotiation, mod_rewrite).
+
+    Args:
+        table: Negotiation table.
+
+    Returns:
+        Contents of the .htaccess file.
+    """
+    pages = table["pages"]
+    priority: Dict[str, None] = {}
+    for page in pages.values():
+        priority.update({tag: None for tag, p in page["languages"].items() if p == page["default"]})
+    for page in pages.values():
+        priority.update(dict.fromkeys(page["languages"]))
+
+    lines = [
+        f"# Generated by Langding from {TABLE_FILENAME}",
+        "AddHandler type-map .var",
+        f"LanguagePriority {' '.join(priority)}",
+        "ForceLanguagePriority Prefer Fallback",
+        "RewriteEngine On",
+    ]
+    for name in sorted(pages):
+        lines.append(f"RewriteRule ^{re.escape(name)}$ {name}.var [L]")
+    return "\n".join(lines) + "\n"
+
+
+def write_negotiation_files(
+    output_dir: Path, filename: str, target_languages: Sequence[str], formats: Sequence[str]
+) -> List[Path]:
+    """
+    Record a page in the negotiation table and rewrite the server configuration.
+
+    Args:
+        output_dir: Directory of generated files.
+        filename: File name of the page.
+        target_languages: Languages generated for the page.
+        formats: Artifacts to write, see NEGOTIATION_FORMATS. The table, which the
+            WSGI application serves from, is always written.
+
+    Returns:
+        Paths of the written files.
+    """
+    output_dir = Path(output_dir)
+    table = load_table(output_dir)
+    table["pages"][filename] = page_entry(target_languages)
+
+    files = {output_dir / TABLE_FILENAME: json.dumps(table, ensure_ascii=False, indent=2)}
+    if "nginx" in formats:
+        files[output_dir / NGINX_MAP_FILENAME] = nginx_map(table)
+        files[output_dir / NGINX_FILENAME] = nginx_locations(table)
+    if "apache" in formats:
+        files[output_dir / HTACCESS_FILENAME] = apache_htaccess(table)
+        files[output_dir / f"{filename}.var"] = apache_type_map(filename, table["pages"][filename])
+
+    for path, content in files.items():
+        with atomic_open(path) as file:
+            file.write(content)
+    return list(files)
+
+
+class NegotiationApp:
+    """WSGI application serving an output directory with negotiated pages."""
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize the application.
+
+        Args:
+            output_dir: Directory of generated files. Its negotiation table is
+                reloaded whenever it changes.
+        """
+        self.output_dir = Path(output_dir).resolve()
+        self._table: Dict[str, Any] = {"pages": {}}
+        self._table_mtime: Optional[int] = None
+
+    def table(self) -> Dict[str, Any]:
+        """The negotiation table, read again after it was rewritten."""
+        path = self.output_dir / TABLE_FILENAME
+        mtime = path.stat().st_mtime_ns if path.exists() else None
+        if mtime != self._table_mtime:
+            self._table = load_table(self.output_dir)
+            self._table_mtime = mtime
+        return self._table
+
+    def __call__(self, environ: Dict[str, Any], start_response) -> List[bytes]:
+        """Serve a file, picking the language variant of pages and precompressed files."""
+        name = environ.get("PATH_INFO", "/").lstrip("/") or "index.html"
+        headers = []
+        vary = []
+
+        page = self.table()["pages"].get(name)
+        if page is not None:
+            prefix = negotiate(
+                environ.get("HTTP_ACCEPT_LANGUAGE", ""), page["languages"], page["default"]
+            )
+            name = f"{prefix}_{name}"
+            tags = [tag for tag, p in page["languages"].items() if p == prefix]
+            if tags:
+                headers.append(("Content-Language", tags[0]))
+            vary.append("Accept-Language")
+
+        path = (self.output_dir / name).resolve()
+        if not path.is_relative_to(self.output_dir) or not path.is_file():
+            start_response("404 Not Found", [("Content-Type", "text/plain; charset=utf-8")])
+            return [b"Not Found"]
+
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+
+        # Precompressed siblings are served to clients accepting their encoding
+        encodings = [
+            encoding
+            for encoding in ("br", "gzip")
+            if path.with_name(path.name + COMPRESSION_SUFFIXES[encoding]).is_file()
+        ]
+        if encodings:
+            vary.append("Accept-Encoding")
+        accepted = {
+            part.split(";")[0].strip()
+            for part in environ.get("HTTP_ACCEPT_ENCODING", "").split(",")
+        }
+        for encoding in encodings:
+            if encoding in accepted:
+                path = path.with_name(path.name + COMPRESSION_SUFFIXES[encoding])
+                headers.append(("Content-Encoding", encoding))
+                break
+
+        body = path.read_bytes()
+        headers += [("Content-Type", content_type), ("Content-Length", str(len(body)))]
+        if vary:
+            headers.append(("Vary", ", ".join(vary)))
+        start_response("200 OK", headers)
+        return [body]
+
+
+def serve(output_dir: Path, host: str = "127.0.0.1", port: int = 8000) -> None:
+    """
+    Serve an output directory with language negotiation until interrupted.
+
+    Args:
+        output_dir: Directory of generated files.
+        host: Interface to listen on.
+        port: Port to listen on.
+    """
+    with make_server(host, port, NegotiationApp(output_dir)) as server:
+        logger.info(f"Serving {output_dir} with language negotiation on http://{host}:{port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse negotiation server command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve generated pages by Accept-Language")
+    parser.add_argument("output_dir", nargs="?", default="output", help="Generated files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the local negotiation server."""
+    args = parse_arguments(argv)
+    serve(Path(args.output_dir), args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+pipeline.py
+~~~~~~~~~~~
+
+CPU-bound per-file stages of the translation pipeline.
+These functions only take and return picklable values, so directory runs can
+execute them on a process pool while translation requests run in the main
+process. With a chunk size, files are templated and rendered as streams so
+memory does not grow with document size.
+"""
+
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.checkpoint import atomic_open
+from src.config import settings
+from src.document import ParsedDocument, SourceDocument, parse_document, stream_template
+from src.languages import language_prefix
+from src.template import CompiledTemplate
+
+
+@dataclass
+class PreparedPage:
+    """An input file after extraction and templating, ready for translation."""
+
+    html_file: Path
+    texts: List[str] = field(default_factory=list)
+    placeholders_dict: Dict[str, str] = field(default_factory=dict)
+    template_path: Optional[Path] = None
+
+
+def template_options(
+    parser: Optional[str] = None, prettify: Optional[bool] = None
+) -> Tuple[str, bool]:
+    """
+    Resolve the parser backend and template formatting of a run.
+
+    Args:
+        parser: Parser backend, see parse_document(). None uses settings.PARSER_BACKEND.
+        prettify: Re-indent templates. None uses settings.PRETTIFY_TEMPLATES.
+
+    Returns:
+        The parser backend and whether templates are re-indented.
+    """
+    return (
+        parser or settings.PARSER_BACKEND,
+        settings.PRETTIFY_TEMPLATES if prettify is None else prettify,
+    )
+
+
+def write_template(
+    document: Union[ParsedDocument, SourceDocument],
+    placeholders_dict: Dict[str, str],
+    template_path: Path,
+    prettify: Optional[bool] = None,
+) -> Path:
+    """
+    Replace texts with placeholders in a parsed document and save it as a template.
+
+    Args:
+        document: Parsed document. Its tree is modified in place.
+        placeholders_dict: Mapping of an original text to placeholders.
+        template_path: Where to write the template.
+        prettify: Re-indent tree-based documents instead of serializing them as parsed.
+            None uses settings.PRETTIFY_TEMPLATES.
+
+    Returns:
+        Path to the written template.
+    """
+    _, prettify = template_options(prettify=prettify)
+    document.apply_placeholders(placeholders_dict)
+
+    with atomic_open(template_path, newline="") as file:
+        file.write(document.serialize(prettify))
+    return template_path
+
+
+def prepare_page(
+    html_file: Path,
+    output_dir: Path,
+    parser: Optional[str] = None,
+    prettify: Optional[bool] = None,
+    chunk_size: int = 0,
+) -> PreparedPage:
+    """
+    Parse a file once, extract its texts and write its template.
+
+    Args:
+        html_file: Input HTML file.
+        output_dir: Directory where the template is written.
+        parser: Parser backend, see parse_document(). None uses settings.PARSER_BACKEND.
+        prettify: Re-indent the template, see write_template().
+        chunk_size: Stream the file through the stream tokenizer in chunks of this
+            many characters instead of loading it, see stream_template(). Parser
+            and prettify are ignored. 0 loads the whole file.
+
+    Returns:
+        The prepared page. Pages without translatable text have no template.
+    """
+    if chunk_size > 0:
+        template_path = Path(output_dir) / f"template_{html_file.name}"
+        texts = stream_template(html_file, template_path, chunk_size=chunk_size)
+        if not texts:
+            template_path.unlink()
+            return PreparedPage(html_file)
+        placeholders_dict = {text: f"text_{i}" for i, text in enumerate(texts)}
+        return PreparedPage(html_file, texts, placeholders_dict, template_path)
+
+    parser, prettify = template_options(parser, prettify)
+    document = parse_document(html_file, parser)
+    texts = list(document.texts)
+    if not texts:
+        return PreparedPage(html_file)
+
+    placeholders_dict = {text: f"text_{i}" for i, text in enumerate(texts)}
+    template_path = write_template(
+        document, placeholders_dict, Path(output_dir) / f"template_{html_file.name}", prettify
+    )
+    return PreparedPage(html_file, texts, placeholders_dict, template_path)
+
+
+def language_file_path(output_dir: Path, lang: str, filename: str) -> Path:
+    """Path of the generated file of a language."""
+    return Path(output_dir) / f"{language_prefix(lang)}_{filename}"
+
+
+def render_language_files(
+    template_path: Path,
+    translations: Dict[str, Dict[str, str]],
+    target_languages: List[str],
+    placeholders_dict: Dict[str, str],
+    output_dir: Path,
+    chunk_size: int = 0,
+) -> List[Path]:
+    """
+    Render one HTML file per language from a template.
+
+    Args:
+        template_path: Template containing {{placeholder}} markers.
+        translations: Mapping of each text to its translation per language.
+        target_languages: Languages to render.
+        placeholders_dict: Mapping of an original text to placeholders.
+        output_dir: Directory where language files are written.
+        chunk_size: Read the template in chunks of this many characters and write
+            every language file chunk by chunk. 0 loads the whole template.
+
+    Returns:
+        Paths of the generated files, in language order.
+    """
+    filename = template_path.name.replace("template_", "")
+    paths = [language_file_path(output_dir, lang, filename) for lang in target_languages]
+    values_per_language = [
+        {
+            placeholder: translations[original_text][lang]
+            for original_text, placeholder in placeholders_dict.items()
+            if lang in translations.get(original_text, {})
+        }
+        for lang in target_languages
+    ]
+
+    if chunk_size > 0:
+        # One pass over the template feeds all language files at once
+        with ExitStack() as stack:
+            template_file = stack.enter_context(
+                open(template_path, "r", encoding="utf-8", newline="")
+            )
+            files = [stack.enter_context(atomic_open(path, newline="")) for path in paths]
+            for template in CompiledTemplate.compile_chunks(
+                template_file, placeholders_dict.values(), chunk_size
+            ):
+                for file, values in zip(files, values_per_language):
+                    template.render_to(file, values)
+        return paths
+
+    with open(template_path, "r", encoding="utf-8", newline="") as file:
+        template_html = file.read()
+
+    # Split the template into literal segments and slots once for all languages
+    template = CompiledTemplate.compile(template_html, placeholders_dict.values())
+
+    for path, values in zip(paths, values_per_language):
+        with atomic_open(path, newline="") as file:
+            template.render_to(file, values)
+
+    return paths
@@ -0,0 +1,367 @@
+"""
+postprocess.py
+~~~~~~~~~~~~~~
+
+Static output post-processing for generated pages.
+Language files and redirect pages are minified in place and written again as
+precompressed siblings (page.html.gz, page.html.br), so a web server or CDN
+can serve them with gzip_static / brotli_static without compressing on every
+request. Files are streamed in chunks and processed on a thread pool; zlib and
+brotli release the GIL, so the formats of every file compress in parallel.
+Brotli needs the optional brotli package.
+"""
+
+import gzip
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+from src.checkpoint import atomic_open
+from src.logger import logger
+
+# Precompressed formats and the suffix of the file written for each
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+# Elements whose surrounding whitespace is never rendered
+BLOCK_ELEMENTS = {
+    "address",
+    "article",
+    "aside",
+    "base",
+    "blockquote",
+    "body",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "head",
+    "header",
+    "hr",
+    "html",
+    "li",
+    "link",
+    "main",
+    "meta",
+    "nav",
+    "noscript",
+    "ol",
+    "option",
+    "p",
+    "script",
+    "section",
+    "style",
+    "table",
+    "tbody",
+    "td",
+    "tfoot",
+    "th",
+    "thead",
+    "title",
+    "tr",
+    "ul",
+}
+
+# Elements whose content is kept byte for byte
+PRESERVED_ELEMENTS = {"pre", "textarea", "script", "style"}
+
+# HTML whitespace; unlike \s it leaves non-breaking spaces alone
+WHITESPACE = re.compile(r"[ \t\n\r\f]+")
+
+
+class _Minifier(HTMLParser):
+    """Tokenizer writing a minified copy of the markup it is fed."""
+
+    def __init__(self, output: TextIO):
+        """
+        Initialize the minifier.
+
+        Args:
+            output: File receiving the minified markup.
+        """
+        super().__init__(convert_charrefs=False)
+        self.output = output
+        self.text: List[str] = []
+        self.after_block = True
+        self.preserved = 0
+
+    def _markup(self, raw: str, tag: Optional[str] = None) -> None:
+        """Write pending text, trimmed next to block tags, then a piece of markup."""
+        block = tag in BLOCK_ELEMENTS
+        if self.text:
+            text = WHITESPACE.sub(" ", "".join(self.text))
+            if self.after_block:
+                text = text.lstrip(" ")
+            if block:
+                text = text.rstrip(" ")
+            self.output.write(text)
+            self.text = []
+        self.output.write(raw)
+        self.after_block = block
+
+    def _data(self, data: str) -> None:
+        if self.preserved:
+            self.output.write(data)
+        else:
+            self.text.append(data)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._markup(self.get_starttag_text(), tag)
+        if tag in PRESERVED_ELEMENTS:
+            self.preserved += 1
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._markup(self.get_starttag_text(), tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in PRESERVED_ELEMENTS and self.preserved:
+            self.preserved -= 1
+        self._markup(f"</{tag}>", tag)
+
+    def handle_data(self, data: str) -> None:
+        self._data(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self._data(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self._data(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        # Conditional comments are markup for old browsers, other comments are dropped
+        if data.startswith("[if") or data.startswith("<![endif]"):
+            self._markup(f"<!--{data}-->", "html")
+
+    def handle_decl(self, decl: str) -> None:
+        self._markup(f"<!{decl}>", "html")
+
+    def handle_pi(self, data: str) -> None:
+        self._markup(f"<?{data}>")
+
+    def unknown_decl(self, data: str) -> None:
+        self._markup(f"<![{data}]>")
+
+    def close(self) -> None:
+        """Finish parsing and write the trailing text."""
+        super().close()
+        self._markup("", "html")
+
+
+def minify_stream(source: TextIO, output: TextIO, chunk_size: int = 1 << 16) -> None:
+    """
+    Minify HTML read from a file in chunks.
+
+    Comments are dropped and whitespace runs collapse to one space, or disappear
+    next to block-level tags. Tags, attributes, entities and the content of pre,
+    textarea, script and style elements are kept as written.
+
+    Args:
+        source: File to read.
+        output: File receiving the minified markup.
+        chunk_size: Characters read at a time.
+    """
+    minifier = _Minifier(output)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        minifier.feed(chunk)
+    minifier.close()
+
+
+def minify_html(html: str) -> str:
+    """
+    Minify an HTML document, see minify_stream().
+
+    Args:
+        html: HTML source.
+
+    Returns:
+        The minified HTML.
+    """
+    output = StringIO()
+    minify_stream(StringIO(html), output)
+    return output.getvalue()
+
+
+def _brotli():
+    """Import the optional brotli package, None when it is not installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def available_formats(formats: Sequence[str]) -> List[str]:
+    """
+    Keep the precompression formats that can be written here.
+
+    Args:
+        formats: Requested formats ("gzip", "br").
+
+    Returns:
+        The known formats, without "br" when brotli is not installed.
+    """
+    available = []
+    for name in dict.fromkeys(formats):
+        if name not in COMPRESSION_SUFFIXES:
+            logger.warning(f"Unknown precompression format '{name}', ignoring it")
+        elif name == "br" and _brotli() is None:
+            logger.warning("brotli is not installed, .br files are not written")
+        else:
+            available.append(name)
+    return available
+
+
+def minify_file(path: Path, chunk_size: int = 1 << 16) -> None:
+    """Minify a file in place through an atomic rename."""
+    path = Path(path)
+    with atomic_open(path, newline="") as output:
+        with open(path, "r", encoding="utf-8", newline="") as source:
+            minify_stream(source, output, chunk_size)
+
+
+def compress_file(path: Path, name: str, chunk_size: int = 1 << 16) -> int:
+    """
+    Write the precompressed sibling of a file.
+
+    Output is deterministic: gzip headers carry no name or timestamp, so an
+    unchanged page produces an identical file and a stable CDN ETag.
+
+    Args:
+        path: File to compress.
+        name: Format, "gzip" (maximum level) or "br" (quality 11).
+        chunk_size: Bytes read at a time.
+
+    Returns:
+        Size of the compressed file in bytes.
+    """
+    path = Path(path)
+    target = path.with_name(path.name + COMPRESSION_SUFFIXES[name])
+    with open(path, "rb") as source, atomic_open(target, binary=True) as output:
+        if name == "gzip":
+            with gzip.GzipFile(filename="", mode="wb", fileobj=output, mtime=0) as compressed:
+                shutil.copyfileobj(source, compressed, chunk_size)
+        else:
+            compressor = _brotli().Compressor(quality=11)
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                output.write(compressor.process(chunk))
+            output.write(compressor.finish())
+    return target.stat().st_size
+
+
+def postprocess_files(
+    paths: Sequence[Path],
+    minify: bool = True,
+    formats: Sequence[str] = (),
+    max_workers: Optional[int] = None,
+) -> Dict[Path, Dict[str, int]]:
+    """
+    Minify generated files and write their precompressed siblings in parallel.
+
+    Args:
+        paths: Generated files. Missing files are skipped.
+        minify: Minify each file in place before compressing it.
+        formats: Precompressed formats to write, see available_formats().
+        max_workers: Threads minifying and compressing.
+
+    Returns:
+        Sizes in bytes of each file: "original", "html" after minification, and
+        one entry per format.
+    """
+    paths = [Path(path) for path in paths if Path(path).exists()]
+    sizes = {path: {"original": path.stat().st_size} for path in paths}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if minify:
+            for _ in executor.map(minify_file, paths):
+                pass
+        for path in paths:
+            sizes[path]["html"] = path.stat().st_size
+
+        futures = {
+            (path, name): executor.submit(compress_file, path, name)
+            for path in paths
+            for name in formats
+        }
+        for (path, name), future in futures.items():
+            sizes[path][name] = future.result()
+    return sizes
+
+
+class OutputStats:
+    """Thread-safe totals of output sizes, grouped by language."""
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self._groups: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, group: str, sizes: Dict[str, int]) -> None:
+        """
+        Add the sizes of one file.
+
+        Args:
+            group: Language of the file, or "redirect".
+            sizes: Sizes returned by postprocess_files() for the file.
+        """
+        with self._lock:
+            totals = self._groups.setdefault(group, {"files": 0})
+            totals["files"] += 1
+            for key, value in sizes.items():
+                totals[key] = totals.get(key, 0) + value
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Bytes per group and the percentage each step saves over the original size."""
+        with self._lock:
+            groups = {group: dict(totals) for group, totals in self._groups.items()}
+
+        report = {}
+        for group, totals in groups.items():
+            stats = report[group] = {"files": totals["files"]}
+            for key in ("original", "html", *COMPRESSION_SUFFIXES):
+                if key in totals:
+                    stats[f"{key}_bytes"] = totals[key]
+                    if key != "original":
+                        saved = 1 - totals[key] / (totals["original"] or 1)
+                        stats[f"{key}_saved_percent"] = round(100 * saved, 1)
+        return report
+
+    def summary(self) -> str:
+        """Human readable size savings over all groups for the end-of-run log."""
+        totals: Dict[str, int] = {}
+        for group in self.stats.values():
+            for key, value in group.items():
+                if key.endswith("_bytes"):
+                    totals[key] = totals.get(key, 0) + value
+        original = totals.get("original_bytes", 0) or 1
+        parts = [f"{totals.get('original_bytes', 0)} bytes generated"]
+        if "html_bytes" in totals:
+            parts.append(f"minified {100 * (1 - totals['html_bytes'] / original):.1f}% smaller")
+        for name in COMPRESSION_SUFFIXES:
+            if f"{name}_bytes" in totals:
+                parts.append(
+                    f"{name} {100 * (1 - totals[f'{name}_bytes'] / original):.1f}% smaller"
+                )
+        return "Output: " + ", ".join(parts)
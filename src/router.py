@@ -0,0 +1,247 @@
+"""
+router.py
+~~~~~~~~~
+
+Failover and hedged requests across two AI providers.
+The router sends each request to the preferred healthy provider. A provider
+whose attempts fail FAILOVER_ERROR_THRESHOLD times in a row is skipped for
+FAILOVER_COOLDOWN seconds, and a request that fails on one provider is retried
+on the other. When a reply takes longer than the HEDGE_PERCENTILE of the
+provider's recent latencies, a duplicate request is sent to the other provider
+and the first successful reply wins, so tail latency does not depend on a
+single vendor.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, TypeVar
+
+from src.config import settings
+from src.logger import logger
+from src.metrics import percentile
+
+T = TypeVar("T")
+
+# Recent latencies kept per provider for the hedge delay
+LATENCY_WINDOW = 200
+
+
+class ProviderUnavailable(RuntimeError):
+    """Raised for an attempt on a provider whose circuit is open."""
+
+
+class ProviderHealth:
+    """Error streak, circuit state and recent latencies of one provider."""
+
+    def __init__(self):
+        """Initialize a healthy provider without history."""
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.failovers = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+
+class ProviderRouter:
+    """Routes provider calls with a circuit breaker, failover and hedging."""
+
+    def __init__(
+        self,
+        providers: List[str],
+        error_threshold: int = 3,
+        cooldown: float = 30.0,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        max_workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            providers: Provider names in order of preference.
+            error_threshold: Consecutive failed attempts that open a provider's circuit.
+            cooldown: Seconds a provider is skipped once its circuit opened.
+            hedge: Send a duplicate request to the other provider when a reply is slow.
+            hedge_percentile: Latency quantile of a provider after which a request hedges.
+            hedge_min_samples: Latencies needed before hedging starts.
+            max_workers: Threads running routed requests.
+            clock: Monotonic time source.
+        """
+        self.providers = providers
+        self.error_threshold = max(1, error_threshold)
+        self.cooldown = cooldown
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.health = {provider: ProviderHealth() for provider in providers}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="langding-router"
+        )
+
+    @classmethod
+    def from_settings(
+        cls, providers: List[str], hedge: bool = False, max_workers: int = 8
+    ) -> "ProviderRouter":
+        """
+        Build a router with the FAILOVER_* and HEDGE_* settings.
+
+        Args:
+            providers: Provider names in order of preference.
+            hedge: Enable hedged requests.
+            max_workers: Threads running routed requests.
+
+        Returns:
+            The router.
+        """
+        return cls(
+            providers,
+            error_threshold=settings.FAILOVER_ERROR_THRESHOLD,
+            cooldown=settings.FAILOVER_COOLDOWN,
+            hedge=hedge,
+            hedge_percentile=settings.HEDGE_PERCENTILE,
+            hedge_min_samples=settings.HEDGE_MIN_SAMPLES,
+            max_workers=max_workers,
+        )
+
+    def is_available(self, provider: str) -> bool:
+        """Check whether a provider's circuit is closed."""
+        with self._lock:
+            return self.health[provider].open_until <= self._clock()
+
+    def observe(self, provider: str, seconds: float, failed: bool = False) -> None:
+        """
+        Record one attempt on a provider and open its circuit on an error streak.
+
+        Args:
+            provider: Provider name.
+            seconds: Duration of the attempt.
+            failed: Whether the attempt raised an error.
+        """
+        with self._lock:
+            health = self.health[provider]
+            health.requests += 1
+            if not failed:
+                health.consecutive_errors = 0
+                health.latencies.append(seconds)
+                return
+
+            health.errors += 1
+            health.consecutive_errors += 1
+            if health.consecutive_errors >= self.error_threshold:
+                health.consecutive_errors = 0
+                health.open_until = self._clock() + self.cooldown
+                health.trips += 1
+                logger.warning(
+                    f"{provider} failed {self.error_threshold} times in a row, "
+                    f"routing around it for {self.cooldown:.0f}s"
+                )
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """Seconds to wait for a provider before hedging, None when not hedging."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            latencies = list(self.health[provider].latencies)
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        return percentile(latencies, self.hedge_percentile)
+
+    def _order(self) -> List[str]:
+        """Providers with a closed circuit first, each group in order of preference."""
+        available = [provider for provider in self.providers if self.is_available(provider)]
+        return available + [provider for provider in self.providers if provider not in available]
+
+    def _count(self, provider: str, name: str) -> None:
+        with self._lock:
+            setattr(self.health[provider], name, getattr(self.health[provider], name) + 1)
+
+    def call(self, request: Callable[[str], T]) -> T:
+        """
+        Run a request on the best provider, hedging and failing over as configured.
+
+        Args:
+            request: Function sending the request to the provider it is given.
+
+        Returns:
+            The first successful result.
+
+        Raises:
+            Exception: The last error when every provider failed.
+        """
+        primary, *others = self._order()
+        secondary = others[0] if others else None
+
+        future = self._executor.submit(request, primary)
+        delay = self.hedge_delay(primary) if secondary is not None else None
+        pending = {future: primary}
+        hedged = False
+        if delay is not None:
+            done, _ = wait([future], timeout=delay)
+            if not done and self.is_available(secondary):
+                hedged = True
+                self._count(primary, "hedges")
+                pending[self._executor.submit(request, secondary)] = secondary
+
+        error: Optional[BaseException] = None
+        tried = set(pending.values())
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for finished in done:
+                provider = pending.pop(finished)
+                if finished.exception() is None:
+                    if provider != primary:
+                        self._count(primary, "hedge_wins" if hedged else "failovers")
+                    return finished.result()
+                error = finished.exception()
+
+            # Fail over once the tried providers have all failed
+            if not pending and secondary is not None and secondary not in tried:
+                logger.warning(f"{primary} request failed ({error}), failing over to {secondary}")
+                tried.add(secondary)
+                pending[self._executor.submit(request, secondary)] = secondary
+
+        raise error
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Health, hedging and failover counters per provider."""
+        with self._lock:
+            now = self._clock()
+            return {
+                provider: {
+                    "requests": health.requests,
+                    "errors": health.errors,
+                    "circuit_trips": health.trips,
+                    "available": health.open_until <= now,
+                    "hedges": health.hedges,
+                    "hedge_wins": health.hedge_wins,
+                    "failovers": health.failovers,
+                    f"p{round(self.hedge_percentile * 100)}_seconds": round(
+                        percentile(list(health.latencies), self.hedge_percentile), 4
+                    ),
+                }
+                for provider, health in self.health.items()
+            }
+
+    def summary(self) -> str:
+        """Human readable provider health for the end-of-run log."""
+        return "Provider health: " + "; ".join(
+            f"{provider} {stats['requests']} attempts, {stats['errors']} errors, "
+            f"{stats['circuit_trips']} trips, {stats['hedges']} hedges "
+            f"({stats['hedge_wins']} won), {stats['failovers']} failovers"
+            for provider, stats in self.stats.items()
+        )
+
+    def close(self) -> None:
+        """Stop the request threads once in-flight requests finish."""
+        self._executor.shutdown(wait=False)
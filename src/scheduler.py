@@ -0,0 +1,327 @@
+"""
+scheduler.py
+~~~~~~~~~~~~
+
+Provides a rate-limit-aware request scheduler for AI provider calls.
+Requests wait for per-provider requests-per-minute and tokens-per-minute
+budgets (token buckets) and are retried with jittered exponential backoff
+on throttling and transient errors. submit_async applies the same budgets
+and retries to coroutines, waiting with asyncio.sleep.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from src.config import settings
+from src.logger import logger
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeouts, conflicts, throttling and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# SDK exception class names for transient failures that carry no status code
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "RateLimitError", "OverloadedError"}
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """Return the HTTP status code carried by a provider error, if any."""
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Check whether an error is a provider throttling response."""
+    return error_status(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an error is transient and the request may be retried."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return error_status(error) in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_ERRORS
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Return the delay requested by a Retry-After response header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers or not hasattr(headers, "get"):
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the bucket full.
+
+        Args:
+            per_minute: Refill rate. Zero or less disables the limit.
+            capacity: Maximum burst size. Defaults to one minute of budget.
+            clock: Monotonic time source.
+        """
+        self.rate = per_minute / 60
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, going into debt if needed.
+
+        Args:
+            amount: Number of tokens to take.
+
+        Returns:
+            Seconds the caller must wait before the reservation is covered.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+
+class RequestScheduler:
+    """Enforces rate budgets and retries for calls to a single provider."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request budget. Zero or less disables it.
+            tokens_per_minute: Token budget. Zero or less disables it.
+            max_retries: Retries for a request before giving up.
+            base_delay: First backoff delay in seconds.
+            max_delay: Upper bound for a single backoff delay in seconds.
+            clock: Monotonic time source.
+            sleep: Function used to wait.
+        """
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.completed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.throttled = 0
+        self.throttle_seconds = 0.0
+
+    @classmethod
+    def for_provider(cls, provider: str) -> "RequestScheduler":
+        """
+        Build a scheduler with the configured budgets of a provider.
+
+        Args:
+            provider: AI provider name ("openai" or "anthropic").
+
+        Returns:
+            Scheduler using settings.<PROVIDER>_RPM / _TPM and the retry settings.
+        """
+        prefix = provider.upper()
+        return cls(
+            requests_per_minute=getattr(settings, f"{prefix}_RPM", 0),
+            tokens_per_minute=getattr(settings, f"{prefix}_TPM", 0),
+            max_retries=settings.MAX_RETRIES,
+            base_delay=settings.RETRY_BASE_DELAY,
+            max_delay=settings.RETRY_MAX_DELAY,
+        )
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Jittered exponential delay before the next attempt."""
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        requested = retry_after(error)
+        return max(delay, min(requested, self.max_delay)) if requested else delay
+
+    def _enqueue(self, estimated_tokens: int) -> float:
+        """Queue a request and reserve its rate budgets; returns the seconds to wait."""
+        with self._lock:
+            self.queue_depth += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+            paused = max(0.0, self._paused_until - self._clock())
+
+        wait = max(paused, self.requests.reserve(1), self.tokens.reserve(max(1, estimated_tokens)))
+        if wait > 0:
+            with self._lock:
+                self.throttled += 1
+                self.throttle_seconds += wait
+        return wait
+
+    def _dequeue(self) -> None:
+        """Take a request off the queue once it may be sent."""
+        with self._lock:
+            self.queue_depth -= 1
+
+    def _wait_for_budget(self, estimated_tokens: int) -> None:
+        """Block until the request fits the rate budgets and any throttling pause is over."""
+        try:
+            wait = self._enqueue(estimated_tokens)
+            if wait > 0:
+                self._sleep(wait)
+        finally:
+            self._dequeue()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Count a failed attempt and decide whether to retry it.
+
+        Args:
+            attempt: Number of retries already made for the request.
+            error: Error raised by the attempt.
+
+        Returns:
+            Seconds to wait before the next attempt, None to give up.
+        """
+        if not is_retryable(error) or attempt >= self.max_retries:
+            with self._lock:
+                self.failures += 1
+            return None
+
+        delay = self._backoff(attempt, error)
+        with self._lock:
+            self.retries += 1
+            if is_rate_limited(error):
+                # Hold back every queued request, not just this one
+                self.rate_limited += 1
+                self._paused_until = max(self._paused_until, self._clock() + delay)
+        logger.warning(
+            f"Transient provider error ({error}), retry {attempt + 1}/{self.max_retries} "
+            f"in {delay:.1f}s"
+        )
+        return delay
+
+    def submit(self, call: Callable[[], T], estimated_tokens: int = 1) -> T:
+        """
+        Run a provider call within the rate budgets, retrying transient failures.
+
+        Args:
+            call: Function performing the API request.
+            estimated_tokens: Estimated prompt plus completion tokens of the request.
+
+        Returns:
+            Result of call.
+
+        Raises:
+            Exception: The last error once it is not retryable or retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self._wait_for_budget(estimated_tokens)
+            try:
+                result = call()
+            except Exception as e:
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                self._sleep(delay)
+                continue
+
+            with self._lock:
+                self.completed += 1
+            return result
+
+    async def submit_async(self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 1) -> T:
+        """
+        Await a provider call within the rate budgets, retrying transient failures.
+
+        Waits for budgets and backoff with asyncio.sleep, so other tasks of the
+        event loop keep running.
+
+        Args:
+            call: Function returning a new awaitable API request on each attempt.
+            estimated_tokens: Estimated prompt plus completion tokens of the request.
+
+        Returns:
+            Result of call.
+
+        Raises:
+            Exception: The last error once it is not retryable or retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            try:
+                wait = self._enqueue(estimated_tokens)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            finally:
+                self._dequeue()
+
+            try:
+                result = await call()
+            except Exception as e:
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            with self._lock:
+                self.completed += 1
+            return result
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, throttling and retry counters for the current run."""
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "failures": self.failures,
+                "throttled": self.throttled,
+                "throttle_seconds": round(self.throttle_seconds, 3),
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+            }
+
+    def summary(self) -> str:
+        """Human readable counters for the end-of-run log."""
+        stats = self.stats
+        return (
+            f"Provider requests: {stats['completed']} completed, {stats['failures']} failed, "
+            f"{stats['retries']} retries ({stats['rate_limited']} rate limited), "
+            f"throttled {stats['throttled']} times for {stats['throttle_seconds']:.1f}s, "
+            f"peak queue depth {stats['peak_queue_depth']}"
+        )
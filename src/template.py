@@ -0,0 +1,146 @@
+"""
+template.py
+~~~~~~~~~~~
+
+Precompiled placeholder templates.
+A template is split once into literal segments and placeholder slots, so each
+language file is rendered with a single join (or streamed to disk) instead of
+one full-document string replace per placeholder. Values are HTML-escaped
+for the context of their slot (text or quoted attribute value). Large template
+files can be compiled and rendered chunk by chunk with compile_chunks().
+"""
+
+import html
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([A-Za-z0-9_]+)\}\}")
+
+# The start of a placeholder cut off at the end of a chunk
+PARTIAL_PLACEHOLDER = re.compile(r"\{(?:\{[A-Za-z0-9_]*\}?)?\Z")
+
+# Text right before a slot that opens a quoted attribute value
+QUOTES = ('="', "='")
+
+
+class CompiledTemplate:
+    """Template split into literal segments and placeholder slots."""
+
+    def __init__(self, segments: List[str], slots: List[str], in_attribute: List[bool]):
+        """
+        Initialize the compiled template.
+
+        Args:
+            segments: Literal text around the slots; one more item than slots.
+            slots: Placeholder names, in document order.
+            in_attribute: Whether each slot is a quoted attribute value.
+        """
+        self.segments = segments
+        self.slots = slots
+        self.in_attribute = in_attribute
+
+    @classmethod
+    def compile(
+        cls,
+        template_html: str,
+        placeholders: Optional[Iterable[str]] = None,
+        lookbehind: str = "",
+    ) -> "CompiledTemplate":
+        """
+        Split a template into segments and slots.
+
+        Args:
+            template_html: Template text containing {{placeholder}} markers.
+            placeholders: Placeholder names to treat as slots. Other markers are
+                kept as literal text. None treats every marker as a slot.
+            lookbehind: Text preceding template_html, when it is a chunk of a larger
+                template, used to tell whether a leading slot is an attribute value.
+
+        Returns:
+            The compiled template.
+        """
+        names = set(placeholders) if placeholders is not None else None
+        segments: List[str] = []
+        slots: List[str] = []
+        in_attribute: List[bool] = []
+        position = 0
+
+        for match in PLACEHOLDER_PATTERN.finditer(template_html):
+            if names is not None and match.group(1) not in names:
+                continue
+            segments.append(template_html[position : match.start()])
+            slots.append(match.group(1))
+            before = lookbehind + template_html[max(0, match.start() - 2) : match.start()]
+            in_attribute.append(before[-2:] in QUOTES)
+            position = match.end()
+
+        segments.append(template_html[position:])
+        return cls(segments, slots, in_attribute)
+
+    @classmethod
+    def compile_chunks(
+        cls,
+        file: TextIO,
+        placeholders: Optional[Iterable[str]] = None,
+        chunk_size: int = 1 << 16,
+    ) -> Iterator["CompiledTemplate"]:
+        """
+        Compile a template file piece by piece.
+
+        Rendering the pieces in order gives the same output as rendering the whole
+        file, while only one chunk is held in memory at a time.
+
+        Args:
+            file: Template file opened for reading.
+            placeholders: Placeholder names to treat as slots, see compile().
+            chunk_size: Characters read per chunk.
+
+        Yields:
+            Compiled templates of consecutive parts of the file.
+        """
+        names = set(placeholders) if placeholders is not None else None
+        lookbehind = carry = ""
+
+        for chunk in iter(lambda: file.read(chunk_size), ""):
+            text = carry + chunk
+            # Hold back a marker that may be completed by the next chunk
+            partial = PARTIAL_PLACEHOLDER.search(text)
+            cut = partial.start() if partial else len(text)
+            text, carry = text[:cut], text[cut:]
+            if text:
+                yield cls.compile(text, names, lookbehind)
+                lookbehind = (lookbehind + text)[-2:]
+
+        if carry:
+            yield cls.compile(carry, names, lookbehind)
+
+    def _pieces(self, values: Dict[str, str]) -> Iterable[str]:
+        """Yield the rendered output piece by piece."""
+        yield self.segments[0]
+        for slot, quote, segment in zip(self.slots, self.in_attribute, self.segments[1:]):
+            value = values.get(slot)
+            # Slots without a value keep their marker, like an unmatched replace
+            yield f"{{{{{slot}}}}}" if value is None else html.escape(value, quote=quote)
+            yield segment
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Render the template in one join.
+
+        Args:
+            values: Mapping of placeholder names to their text.
+
+        Returns:
+            Rendered document.
+        """
+        return "".join(self._pieces(values))
+
+    def render_to(self, file: TextIO, values: Dict[str, str]) -> None:
+        """
+        Stream the rendered template to an open file.
+
+        Args:
+            file: Text file opened for writing.
+            values: Mapping of placeholder names to their text.
+        """
+        file.writelines(self._pieces(values))
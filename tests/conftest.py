@@ -2,6 +2,11 @@
 Pytest configuration and fixtures for Langding tests.
 """
 
+import os
+
+# Keep test runs from writing the application log file; set before src is imported
+os.environ["LOG_FILE"] = ""
+
 import pytest
 import tempfile
 import shutil
@@ -9,6 +14,10 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 from typing import Dict, Any
 
+from src.async_translator import AsyncLangdingTranslator
+from src.main import LangdingTranslator
+from src.mock_provider import AsyncMockClient, MockClient
+
 
 @pytest.fixture
 def temp_dir():
@@ -18,6 +27,32 @@ def temp_dir():
     shutil.rmtree(temp_path)
 
 
+@pytest.fixture
+def make_translator(temp_dir):
+    """
+    Factory of translators on the mock provider writing to temp_dir / "output".
+
+    Keyword arguments go to the translator; input_dir defaults to temp_dir / "input",
+    client replaces the provider client (a MockClient without latency by default)
+    and asynchronous builds an AsyncLangdingTranslator with an AsyncMockClient.
+    """
+
+    def make(input_dir=None, client=None, asynchronous=False, **kwargs):
+        kwargs.setdefault("provider", "mock")
+        input_dir = str(input_dir or temp_dir / "input")
+        if asynchronous:
+            translator = AsyncLangdingTranslator(input_dir, str(temp_dir / "output"), **kwargs)
+            translator.client = client or AsyncMockClient(latency=0)
+        else:
+            translator = LangdingTranslator(
+                input_dir=input_dir, output_dir=str(temp_dir / "output"), **kwargs
+            )
+            translator.client = client or MockClient(latency=0)
+        return translator
+
+    return make
+
+
 @pytest.fixture
 def sample_html():
     """Sample HTML content for testing."""
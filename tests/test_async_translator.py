@@ -0,0 +1,136 @@
+"""
+Tests for the async translator API.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.async_translator import AsyncLangdingTranslator
+from src.mock_provider import AsyncMockClient
+
+LANGUAGES = ["Spanish", "French"]
+
+
+@pytest.fixture
+def input_pages(temp_dir, sample_html):
+    """Input directory with a few pages sharing their markup."""
+    input_dir = temp_dir / "input"
+    input_dir.mkdir()
+    for index in range(4):
+        page = sample_html.replace("Test Page", f"Test Page {index}")
+        (input_dir / f"page{index}.html").write_text(page, encoding="utf-8")
+    return input_dir
+
+
+class TestAsyncTranslator:
+    """Test cases for AsyncLangdingTranslator."""
+
+    def test_translate_text_uses_cache(self, make_translator, temp_dir):
+        """Test that a translation is requested once and then served from the cache."""
+        translator = make_translator(asynchronous=True, cache_dir=str(temp_dir / "cache"))
+        client = translator.client
+
+        async def run():
+            first = await translator.translate_text_with_context("Hello", "Spanish", "Website")
+            second = await translator.translate_text_with_context("Hello", "Spanish", "Website")
+            await translator.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == second == "[Spanish] Hello"
+        assert client.calls == 1
+        assert (temp_dir / "cache").exists()
+
+    def test_translate_batch_keeps_order(self, make_translator):
+        """Test that batched texts come back in their order."""
+        translator = make_translator(asynchronous=True, batch=True)
+        client = translator.client
+        texts = [f"Text {index}" for index in range(5)]
+
+        result = asyncio.run(translator.translate_batch(texts, "French", "Website"))
+
+        assert result == [f"[French] {text}" for text in texts]
+        assert client.calls == 1
+
+    def test_failed_batch_is_not_fanned_out(self, make_translator):
+        """Test that a batch failing after the scheduler's retries keeps its source texts."""
+        client = AsyncMockClient(latency=0, error_rate=1.0)
+        translator = make_translator(asynchronous=True, client=client, batch=True)
+        scheduler = translator.translator.scheduler
+        scheduler.max_retries = 1
+        scheduler.base_delay = scheduler.max_delay = 0.0
+
+        result = asyncio.run(translator.translate_batch(["Hello", "Goodbye"], "French", "Website"))
+
+        assert result == ["Hello", "Goodbye"]
+        assert client.calls == 2
+
+    def test_pages_share_the_event_loop(self, make_translator, temp_dir, input_pages):
+        """Test that many pages are processed at once while other tasks keep running."""
+        client = AsyncMockClient(latency=0.02)
+        translator = make_translator(input_pages, client, asynchronous=True, concurrency=8)
+        ticks = []
+
+        async def ticker(done):
+            while not done.is_set():
+                ticks.append(None)
+                await asyncio.sleep(0.005)
+
+        async def run():
+            done = asyncio.Event()
+            ticking = asyncio.create_task(ticker(done))
+            async with translator:
+                summary = await translator.process_input_directory(LANGUAGES)
+            done.set()
+            await ticking
+            return summary
+
+        summary = asyncio.run(run())
+
+        assert summary == {"processed": 4, "skipped": 0, "failed": 0}
+        output = temp_dir / "output"
+        for index in range(4):
+            spanish = (output / f"spanish_page{index}.html").read_text(encoding="utf-8")
+            assert f"[Spanish] Test Page {index}" in spanish
+            assert (output / f"page{index}.html").exists()
+            translations = json.loads(
+                (output / f"page{index}_translations.json").read_text(encoding="utf-8")
+            )
+            assert translations["Welcome to Our Website"]["French"] == (
+                "[French] Welcome to Our Website"
+            )
+        # The ticker ran throughout instead of waiting for the translations
+        assert len(ticks) >= 5
+        assert translator.translator.scheduler.stats["completed"] == client.calls
+
+    def test_incremental_skips_unchanged_pages(self, make_translator, input_pages):
+        """Test that the manifest written by the async API skips unchanged pages."""
+        first = make_translator(input_pages, asynchronous=True, incremental=True)
+        asyncio.run(first.process_input_directory(LANGUAGES))
+        translator = make_translator(input_pages, asynchronous=True, incremental=True)
+        client = translator.client
+
+        summary = asyncio.run(translator.process_input_directory(LANGUAGES))
+
+        assert summary == {"processed": 0, "skipped": 4, "failed": 0}
+        assert client.calls == 0
+
+    def test_sdk_retries_are_disabled(self, make_translator):
+        """Test that the async SDK client leaves retries to the scheduler."""
+        translator = make_translator(asynchronous=True, provider="openai")
+
+        with patch("openai.AsyncOpenAI") as mock_openai:
+            translator._create_client()
+
+        assert mock_openai.call_args.kwargs["max_retries"] == 0
+
+    def test_unsupported_options(self, temp_dir):
+        """Test that options relying on thread pools are refused."""
+        with pytest.raises(ValueError, match="fallback_provider"):
+            AsyncLangdingTranslator(
+                str(temp_dir), str(temp_dir / "output"), provider="mock", fallback_provider="mock"
+            )
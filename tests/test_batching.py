@@ -0,0 +1,132 @@
+"""
+Tests for batched multi-string translation.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+from src.batching import BatchResponseError, parse_batch_response, plan_batches
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+
+
+def _openai_reply(content):
+    """Build a mock OpenAI chat completion with the given content."""
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    return response
+
+
+class TestBatching:
+    """Test cases for batch planning, parsing and translation."""
+
+    def test_plan_batches_respects_limits(self):
+        """Test that batches are bounded by item count and estimated tokens."""
+        texts = ["short text"] * 5 + ["x" * 400]
+
+        assert plan_batches(texts, max_tokens=1000, max_items=2) == [[0, 1], [2, 3], [4, 5]]
+        assert plan_batches(texts, max_tokens=20, max_items=10) == [[0, 1, 2, 3, 4], [5]]
+
+    def test_parse_batch_response_with_code_fence(self):
+        """Test parsing a JSON array wrapped in a markdown code fence."""
+        raw = '```json\n["Hola", " Adiós "]\n```'
+
+        assert parse_batch_response(raw, 2) == ["Hola", "Adiós"]
+
+    @pytest.mark.parametrize(
+        "raw",
+        ["Hola, Adiós", '["Hola"]', '["Hola", 3]', '["Hola", "Adiós"'],
+    )
+    def test_parse_batch_response_malformed(self, raw):
+        """Test that malformed replies are rejected."""
+        with pytest.raises(BatchResponseError):
+            parse_batch_response(raw, 2)
+
+    @patch("src.main.settings")
+    def test_translate_batch_single_request(self, mock_settings, temp_dir):
+        """Test that a batch of texts is translated with one API call."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create.return_value = _openai_reply(
+                json.dumps(["Hola", "Adiós", "Gracias"])
+            )
+            mock_openai_class.return_value = mock_client
+
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output"), batch=True
+            )
+
+            result = translator.translate_batch(["Hello", "Goodbye", "Thanks"], "Spanish", "ctx")
+
+            assert result == ["Hola", "Adiós", "Gracias"]
+            mock_client.chat.completions.create.assert_called_once()
+
+    @patch("src.main.settings")
+    def test_translate_batch_falls_back_on_malformed_reply(self, mock_settings, temp_dir):
+        """Test that a malformed batch reply is retried as single requests."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create.side_effect = [
+                _openai_reply("Sorry, here you go: Hola / Adiós"),
+                _openai_reply("Hola"),
+                _openai_reply("Adiós"),
+            ]
+            mock_openai_class.return_value = mock_client
+
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output"), batch=True
+            )
+
+            result = translator.translate_batch(["Hello", "Goodbye"], "Spanish", "ctx")
+
+            assert result == ["Hola", "Adiós"]
+            assert mock_client.chat.completions.create.call_count == 3
+
+    def test_failed_batch_is_not_fanned_out(self, make_translator):
+        """Test that a batch failing after the scheduler's retries keeps its source texts."""
+        client = MockClient(error_rate=1.0)
+        translator = make_translator(client=client, batch=True)
+        translator.scheduler.max_retries = 1
+        translator.scheduler.base_delay = translator.scheduler.max_delay = 0.0
+
+        result = translator.translate_batch(["Hello", "Goodbye", "Thanks"], "Spanish", "ctx")
+
+        assert result == ["Hello", "Goodbye", "Thanks"]
+        # One attempt and one retry of the batch, no single-text requests
+        assert client.calls == 2
+
+    @patch("src.main.settings")
+    def test_process_html_file_batches_per_language(self, mock_settings, temp_dir, sample_html):
+        """Test that batch mode issues one request per language for a page."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+
+        with patch("openai.OpenAI"):
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), batch=True
+            )
+            translator._complete = Mock(
+                side_effect=lambda system, prompt, max_tokens: (
+                    json.dumps(["translated"] * len(translator.extract_text_from_html(html_file))),
+                    "openai",
+                )
+            )
+
+            translator.process_html_file(html_file, ["Spanish", "French"])
+
+            assert translator._complete.call_count == 2
+            spanish = (temp_dir / "output" / "spanish_index.html").read_text(encoding="utf-8")
+            assert "translated" in spanish
@@ -0,0 +1,147 @@
+"""
+Tests for the token and cost planner and the per-run budget.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.batching import reply_max_tokens
+from src.budget import BudgetExceeded, RunBudget, model_prices
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+
+
+class TestBudget:
+    """Test cases for RunBudget and budget-aware translation."""
+
+    def test_prices_and_cost(self):
+        """Test the longest-prefix price lookup and USD cost."""
+        assert model_prices("gpt-4o-mini-2024-07-18") == (0.15, 0.60)
+        assert model_prices("gpt-4o-2024-08-06") == (2.50, 10.00)
+        assert model_prices("unknown-model") is None
+
+        budget = RunBudget(prices=(1.0, 2.0))
+        assert budget.cost(1_000_000, 500_000) == 2.0
+        assert RunBudget().cost(1_000_000, 1_000_000) == 0.0
+
+    def test_reservations_and_exhaustion(self):
+        """Test that in-flight reservations count and only a spent budget stays closed."""
+        budget = RunBudget(max_tokens=100)
+
+        first = budget.reserve(30, 30)
+        with pytest.raises(BudgetExceeded):
+            budget.reserve(30, 20)
+        second = budget.reserve(10, 10)
+        budget.release(first)
+        budget.release(second)
+        budget.record(10, 5)
+
+        # An oversized request is refused alone, smaller ones still fit
+        with pytest.raises(BudgetExceeded):
+            budget.reserve(50, 50)
+        assert not budget.stats["exhausted"]
+        budget.release(budget.reserve(40, 40))
+        budget.record(40, 44)
+
+        # Not even the smallest request fits the spend, every later request is refused
+        with pytest.raises(BudgetExceeded):
+            budget.reserve(1, 1)
+        stats = budget.stats
+        assert stats["exhausted"] and stats["refused"] == 3
+        assert (stats["input_tokens"], stats["output_tokens"], stats["requests"]) == (50, 49, 2)
+
+    def test_oversized_request_does_not_close_budget(self):
+        """Test that concurrent small requests proceed next to a refused oversized one."""
+        budget = RunBudget(max_tokens=200)
+        started = threading.Barrier(6)
+
+        def request(size):
+            started.wait()
+            reservation = budget.reserve(size, size)
+            time.sleep(0.01)
+            budget.record(size, size)
+            budget.release(reservation)
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            oversized = pool.submit(request, 150)
+            small = [pool.submit(request, 10) for _ in range(5)]
+
+            with pytest.raises(BudgetExceeded):
+                oversized.result()
+            for future in small:
+                future.result()
+
+        stats = budget.stats
+        assert stats["requests"] == 5 and stats["refused"] == 1
+        assert not stats["exhausted"]
+
+    def test_cost_budget(self):
+        """Test that a cost budget refuses requests priced over the limit."""
+        budget = RunBudget(max_cost=0.01, prices=(1.0, 1.0))
+
+        budget.release(budget.reserve(5_000, 4_000))
+        with pytest.raises(BudgetExceeded):
+            budget.reserve(6_000, 5_000)
+
+    def test_reply_limit_follows_source_length(self, temp_dir):
+        """Test that single requests ask for a reply sized to the source text."""
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), provider="mock"
+        )
+        client = translator.client = MockClient(latency=0)
+        calls = []
+        create = client.chat.completions.create
+        client.chat.completions.create = lambda **kwargs: calls.append(kwargs) or create(**kwargs)
+
+        translator.translate_text_with_context("Hello", "Spanish", "Ctx")
+        translator.translate_text_with_context("Long paragraph. " * 100, "Spanish", "Ctx")
+
+        assert calls[0]["max_tokens"] == reply_max_tokens("Hello") == 64
+        assert calls[1]["max_tokens"] == reply_max_tokens("Long paragraph. " * 100) > 500
+
+    def test_run_degrades_to_cache_only(self, temp_dir):
+        """Test that a run stops calling the provider at its budget and keeps cached texts."""
+        texts = [f"Sentence number {i} of the page" for i in range(10)]
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir),
+            output_dir=str(temp_dir / "output"),
+            provider="mock",
+            cache_dir=str(temp_dir / "cache"),
+            token_budget=450,
+        )
+        translator.client = MockClient(latency=0)
+        context = translator._translation_context("Spanish")
+        translator.cache.set(translator._cache_key(texts[9], "Spanish", context), "Cached")
+
+        translations = translator.translate_texts(texts, ["Spanish"])
+
+        stats = translator.budget.stats
+        translated = [text for text in texts[:9] if translations[text]["Spanish"] != text]
+        assert stats["refused"] > 0 and 0 < len(translated) < 9
+        assert stats["requests"] == translator.client.calls == len(translated)
+        assert stats["input_tokens"] + stats["output_tokens"] <= 450
+        assert translations[texts[9]]["Spanish"] == "Cached"
+
+        report_path = translator.write_run_report()
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        assert report["budget"]["refused"] == 9 - len(translated)
+
+    def test_refused_translations_are_not_saved(self, make_translator, temp_dir, sample_html):
+        """Test that texts refused over budget are left out of the saved translations."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+        translator = make_translator(token_budget=300)
+
+        translator.process_html_file(html_file, ["Spanish"])
+
+        saved = json.loads(
+            (temp_dir / "output" / "index_translations.json").read_text(encoding="utf-8")
+        )
+        refused = translator.budget.stats["refused"]
+        assert refused > 0 and saved
+        assert all(by_language["Spanish"] != text for text, by_language in saved.items())
+        assert translator.metrics.counters["translations_missing"] == refused
@@ -0,0 +1,124 @@
+"""
+Tests for the persistent translation memory.
+"""
+
+import json
+import time
+from unittest.mock import Mock, patch
+
+from src.cache import TranslationCache
+from src.main import LangdingTranslator
+
+
+class TestTranslationCache:
+    """Test cases for TranslationCache."""
+
+    def test_make_key_is_content_addressed(self):
+        """Test that keys change with every input that affects the translation."""
+        key = TranslationCache.make_key("Hello", "Spanish", "openai", "gpt-3.5-turbo", "1")
+
+        assert key == TranslationCache.make_key("Hello", "Spanish", "openai", "gpt-3.5-turbo", "1")
+        assert key != TranslationCache.make_key("Hello", "French", "openai", "gpt-3.5-turbo", "1")
+        assert key != TranslationCache.make_key("Hello", "Spanish", "anthropic", "gpt", "1")
+        assert key != TranslationCache.make_key("Hello", "Spanish", "openai", "gpt-3.5-turbo", "2")
+
+    def test_persists_across_instances(self, temp_dir):
+        """Test that saved translations are served by a new cache instance."""
+        cache = TranslationCache(str(temp_dir), max_entries=10, max_age_days=1)
+        assert cache.get("key") is None
+        cache.set("key", "Hola")
+        cache.save()
+
+        reloaded = TranslationCache(str(temp_dir), max_entries=10, max_age_days=1)
+        assert reloaded.get("key") == "Hola"
+        assert reloaded.stats == {"hits": 1, "misses": 0, "writes": 0, "evictions": 0}
+
+    def test_alternative_keys_count_one_lookup(self, temp_dir):
+        """Test that a lookup over several keys counts one hit or one miss."""
+        cache = TranslationCache(str(temp_dir), max_entries=10, max_age_days=1)
+        cache.set("fallback", "Hola")
+
+        assert cache.get("primary", "fallback") == "Hola"
+        assert cache.get("primary", "other") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_age_eviction(self, temp_dir):
+        """Test that entries older than the maximum age are treated as misses."""
+        cache = TranslationCache(str(temp_dir), max_entries=10, max_age_days=1)
+        cache.set("old", "Viejo")
+        cache._entries["old"]["created"] = time.time() - 2 * 86400
+
+        assert cache.get("old") is None
+        cache.save()
+
+        assert cache.evictions == 1
+        assert "old" not in json.loads(cache.path.read_text(encoding="utf-8"))
+
+    def test_size_eviction_drops_least_recently_used(self, temp_dir):
+        """Test that the least recently used entries are dropped above the size limit."""
+        cache = TranslationCache(str(temp_dir), max_entries=2, max_age_days=1)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.set(key, key.upper())
+            cache._entries[key]["accessed"] = 1000 + i
+        cache._entries["a"]["accessed"] = 2000
+
+        cache.save()
+
+        stored = json.loads(cache.path.read_text(encoding="utf-8"))
+        assert set(stored) == {"a", "c"}
+        assert cache.evictions == 1
+
+    def test_unreadable_file_starts_empty(self, temp_dir):
+        """Test that a corrupt memory file does not break the run."""
+        (temp_dir / TranslationCache.FILENAME).write_text("{not json", encoding="utf-8")
+
+        cache = TranslationCache(str(temp_dir), max_entries=10, max_age_days=1)
+
+        assert cache.get("key") is None
+
+    @patch("src.main.settings")
+    def test_translator_uses_cache_before_api(self, mock_settings, temp_dir, mock_openai_response):
+        """Test that a cached translation skips the API call."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create.return_value = mock_openai_response
+            mock_openai_class.return_value = mock_client
+
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"),
+                output_dir=str(temp_dir / "output"),
+                cache_dir=str(temp_dir / "cache"),
+            )
+
+            first = translator.translate_text_with_context("Hello", "Spanish", "Test context")
+            second = translator.translate_text_with_context("Hello", "Spanish", "Test context")
+
+            assert first == second == "Translated text"
+            mock_client.chat.completions.create.assert_called_once()
+            assert translator.cache.hits == 1
+            assert translator.cache.misses == 1
+
+    @patch("src.main.settings")
+    def test_translator_does_not_cache_errors(self, mock_settings, temp_dir):
+        """Test that a failed call is not stored as a translation."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create.side_effect = Exception("API Error")
+            mock_openai_class.return_value = mock_client
+
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"),
+                output_dir=str(temp_dir / "output"),
+                cache_dir=str(temp_dir / "cache"),
+            )
+
+            assert translator.translate_text_with_context("Hello", "Spanish", "ctx") == "Hello"
+            assert translator.cache.writes == 0
@@ -0,0 +1,116 @@
+"""
+Tests for the checkpoint journal, resumed runs and atomic output writes.
+"""
+
+import json
+
+import pytest
+
+from src.batching import Untranslated
+from src.checkpoint import CheckpointJournal, atomic_open
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+
+SIGNATURE = {"provider": "mock", "model": "mock", "prompt": "1"}
+
+
+class _CrashingClient(MockClient):
+    """Mock client whose process is killed during a given request."""
+
+    def __init__(self, crash_on: int):
+        super().__init__()
+        self.crash_on = crash_on
+
+    def complete(self, prompt):
+        if self.calls + 1 == self.crash_on:
+            self.calls += 1
+            raise KeyboardInterrupt
+        return super().complete(prompt)
+
+
+class TestCheckpoint:
+    """Test cases for CheckpointJournal, --resume and atomic_open."""
+
+    def test_atomic_open_keeps_old_file_on_failure(self, temp_dir):
+        """Test that an interrupted write leaves the previous file and no temporary file."""
+        path = temp_dir / "page.html"
+        path.write_text("old", encoding="utf-8")
+
+        with pytest.raises(RuntimeError):
+            with atomic_open(path) as file:
+                file.write("half written")
+                raise RuntimeError("killed")
+
+        assert path.read_text(encoding="utf-8") == "old"
+        assert [p.name for p in temp_dir.iterdir()] == ["page.html"]
+
+        with atomic_open(path) as file:
+            file.write("new")
+        assert path.read_text(encoding="utf-8") == "new"
+
+    def test_journal_replay(self, temp_dir):
+        """Test replay of a journal with a torn last record and a foreign signature."""
+        journal = CheckpointJournal(temp_dir, SIGNATURE)
+        journal.record(
+            "Spanish",
+            ["Hello", "World", "Brand", "Failed"],
+            ["Hola", "Mundo", "Brand", Untranslated("Failed")],
+        )
+        journal.record("French", ["Hello"], ["Bonjour"])
+        journal.close()
+        with open(journal.path, "a", encoding="utf-8") as file:
+            file.write('{"text": "Cut", "lang": "Spa')
+
+        resumed = CheckpointJournal(temp_dir, SIGNATURE, resume=True)
+        # Identity translations are kept, untranslated texts are requested again
+        assert resumed.known(["Hello", "World", "Brand", "Failed", "Cut"]) == {
+            "Hello": {"Spanish": "Hola", "French": "Bonjour"},
+            "World": {"Spanish": "Mundo"},
+            "Brand": {"Spanish": "Brand"},
+        }
+
+        # Replayed records are carried over when the journal is written again
+        resumed.record("German", ["Hello"], ["Hallo"])
+        resumed.close()
+        lines = journal.path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0]) == SIGNATURE and len(lines) == 6
+
+        other = CheckpointJournal(temp_dir, {**SIGNATURE, "model": "other"}, resume=True)
+        assert other.recovered == {}
+
+    def test_resume_only_requests_missing_translations(self, temp_dir, sample_html):
+        """Test that a killed run resumes with the missing calls and the same output."""
+        (temp_dir / "input").mkdir()
+        (temp_dir / "input" / "index.html").write_text(sample_html, encoding="utf-8")
+        languages = ["Spanish", "French"]
+
+        def translator(output_dir, **kwargs):
+            return LangdingTranslator(
+                input_dir=str(temp_dir / "input"),
+                output_dir=str(temp_dir / output_dir),
+                provider="mock",
+                **kwargs,
+            )
+
+        clean = translator("clean")
+        clean.client = MockClient()
+        clean.process_input_directory(languages)
+        total = clean.client.calls
+
+        killed = translator("output", checkpoint=True)
+        killed.client = _CrashingClient(crash_on=6)
+        with pytest.raises(KeyboardInterrupt):
+            killed.process_input_directory(languages)
+        assert not (temp_dir / "output" / "spanish_index.html").exists()
+        assert not list((temp_dir / "output").glob("*.tmp"))
+
+        resumed = translator("output", resume=True)
+        resumed.client = MockClient()
+        resumed.process_input_directory(languages)
+
+        assert resumed.client.calls == total - 5
+        for name in ("spanish_index.html", "french_index.html", "index_translations.json"):
+            assert (temp_dir / "output" / name).read_text(encoding="utf-8") == (
+                temp_dir / "clean" / name
+            ).read_text(encoding="utf-8")
+        assert not (temp_dir / "output" / CheckpointJournal.FILENAME).exists()
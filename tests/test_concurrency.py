@@ -0,0 +1,77 @@
+"""
+Tests for concurrent translation fan-out.
+"""
+
+import random
+import threading
+import time
+from unittest.mock import patch
+
+from src.main import parse_arguments
+
+
+class TestConcurrency:
+    """Test cases for the bounded translation worker pool."""
+
+    def test_output_order_is_deterministic(self, make_translator):
+        """Test that results keep text and language order regardless of completion order."""
+        translator = make_translator(concurrency=8)
+
+        def slow_translate(text, target_language, context):
+            time.sleep(random.uniform(0, 0.02))
+            return f"{target_language}:{text}"
+
+        translator.translate_text_with_context = slow_translate
+        texts = [f"Text number {i}" for i in range(10)]
+
+        translations = translator.translate_texts(texts, ["Spanish", "French", "German"])
+
+        assert list(translations) == texts
+        for text in texts:
+            assert list(translations[text]) == ["Spanish", "French", "German"]
+            assert translations[text]["French"] == f"French:{text}"
+
+    def test_concurrency_limit_is_respected(self, make_translator):
+        """Test that no more than the configured number of calls run at once."""
+        translator = make_translator(concurrency=3)
+
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def tracked_translate(text, target_language, context):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return text
+
+        translator.translate_text_with_context = tracked_translate
+
+        translator.translate_texts([f"Text {i}" for i in range(12)], ["Spanish"])
+
+        assert state["peak"] == 3
+
+    def test_requests_run_in_parallel(self, make_translator):
+        """Test that all requests are in flight at once when the pool is large enough."""
+        translator = make_translator(concurrency=8)
+        barrier = threading.Barrier(8, timeout=5)
+        passed = []
+
+        def waiting_translate(text, target_language, context):
+            barrier.wait()
+            passed.append(text)
+            return text
+
+        translator.translate_text_with_context = waiting_translate
+
+        translator.translate_texts([f"Text {i}" for i in range(4)], ["Spanish", "French"])
+
+        assert len(passed) == 8
+
+    def test_parse_arguments_concurrency(self):
+        """Test the --concurrency command-line option."""
+        with patch("sys.argv", ["langding.py", "--concurrency", "16"]):
+            args = parse_arguments()
+            assert args.concurrency == 16
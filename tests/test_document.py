@@ -0,0 +1,261 @@
+"""
+Tests and parse-count / backend benchmarks for single-pass HTML processing.
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.document import PARSER_BACKENDS, ExtractionRules, parse_document
+from src.main import LangdingTranslator
+from src.template import CompiledTemplate
+
+INDEX_HTML = Path(__file__).resolve().parent.parent / "templates" / "index.html"
+
+
+class TestDocument:
+    """Test cases for ParsedDocument and parse_document."""
+
+    def test_extraction_skips_scripts_and_indexes_nodes(self, temp_dir):
+        """Test that one walk collects texts and their text nodes."""
+        html_file = temp_dir / "page.html"
+        html_file.write_text(
+            "<html><head><title>My Portfolio</title>"
+            "<script>var t = 'Hidden script text';</script></head>"
+            "<body><h1>Welcome to Our Website</h1><p>Welcome to Our Website</p>"
+            "<p>Short</p><!-- Welcome to Our Website --></body></html>",
+            encoding="utf-8",
+        )
+
+        document = parse_document(html_file)
+
+        assert document.texts == ["My Portfolio", "Welcome to Our Website", "Short"]
+        assert len(document.nodes["Welcome to Our Website"]) == 2
+        assert "var t = 'Hidden script text';" not in document.nodes
+
+    def test_skip_rules(self, temp_dir):
+        """Test that translate="no", code blocks and the notranslate class stay untouched."""
+        html_file = temp_dir / "page.html"
+        html_file.write_text(
+            "<html><body><p>Visible paragraph</p>"
+            '<div translate="no"><p>Brand name inside</p></div>'
+            "<pre>npm install langding</pre><code>print(value)</code>"
+            '<span class="badge notranslate">Product X</span>'
+            "<p>42</p><p>x</p></body></html>",
+            encoding="utf-8",
+        )
+
+        document = parse_document(html_file)
+
+        assert document.texts == ["Visible paragraph"]
+
+    def test_attribute_and_meta_extraction(self, temp_dir):
+        """Test that attributes, meta and Open Graph content are extracted and templated."""
+        html_file = temp_dir / "page.html"
+        html_file.write_text(
+            '<html><head><meta name="description" content="Page description">'
+            '<meta property="og:title" content="Shared title">'
+            '<meta name="viewport" content="width=device-width"></head>'
+            '<body><img src="a.png" alt="A mountain view">'
+            '<input type="text" placeholder="Your email">'
+            '<input type="submit" value="Subscribe now"></body></html>',
+            encoding="utf-8",
+        )
+
+        document = parse_document(html_file)
+        assert document.texts == [
+            "Page description",
+            "Shared title",
+            "A mountain view",
+            "Your email",
+            "Subscribe now",
+        ]
+
+        document.apply_placeholders({"A mountain view": "text_2"})
+        assert document.soup.img["alt"] == "{{text_2}}"
+
+    def test_extraction_rules_are_configurable(self, temp_dir):
+        """Test custom selectors and the optional max_texts cap."""
+        html_file = temp_dir / "page.html"
+        html_file.write_text(
+            "<html><head><title>Page title</title></head><body><main><p>First text</p>"
+            "<p>Second text</p><p>Third text</p></main><footer>Footer text</footer></body></html>",
+            encoding="utf-8",
+        )
+        rules = ExtractionRules(
+            tags={"main"}, attributes=set(), meta=set(), skip_tags=set(), skip_classes=set()
+        )
+
+        assert parse_document(html_file, rules=rules).texts == [
+            "First text",
+            "Second text",
+            "Third text",
+        ]
+        rules.max_texts = 2
+        assert parse_document(html_file, rules=rules).texts == ["First text", "Second text"]
+
+    def test_extracts_all_strings_of_index_html(self):
+        """Test that every translatable string of templates/index.html is extracted."""
+        document = parse_document(INDEX_HTML)
+
+        assert len(document.texts) > 15
+        assert "Tools and languages I work with" in document.texts
+
+    @pytest.mark.parametrize("backend", PARSER_BACKENDS)
+    def test_fragment_without_body(self, temp_dir, backend):
+        """Test that a page fragment without <body> is extracted like body content."""
+        html_file = temp_dir / "fragment.html"
+        html_file.write_text(
+            "<h1>Welcome</h1>\n<p>Intro text</p>\n<script>var x = 'Hidden';</script>",
+            encoding="utf-8",
+        )
+
+        assert parse_document(html_file, backend).texts == ["Welcome", "Intro text"]
+
+    def test_acronyms_and_identifiers_are_kept(self):
+        """Test the default skip pattern on the unmodified templates/index.html."""
+        texts = parse_document(INDEX_HTML).texts
+
+        for token in ("AWS", "Node.js", "TypeScript", "PostgreSQL", "__init__", "say_hi"):
+            assert token not in texts
+        assert "Cloud and deployment tools" in texts
+        assert "GitHub Actions" in texts
+
+        rules = ExtractionRules.from_settings()
+        rules.keep_terms = set()
+        assert "AWS" in parse_document(INDEX_HTML, rules=rules).texts
+
+    def test_capitalized_words_are_extracted(self, temp_dir):
+        """Test that navigation labels in capitals are translated, unlike S3 or CI/CD."""
+        html_file = temp_dir / "nav.html"
+        html_file.write_text(
+            "<body><a>HOME</a><a>CONTACT US</a><a>FAQ</a><b>FREE</b><i>S3</i><i>CI/CD</i></body>",
+            encoding="utf-8",
+        )
+
+        texts = parse_document(html_file).texts
+
+        assert texts == ["HOME", "CONTACT US", "FAQ", "FREE"]
+
+    def test_apply_placeholders(self, temp_dir, sample_html):
+        """Test that placeholders replace the indexed nodes in the shared tree."""
+        html_file = temp_dir / "page.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+
+        document = parse_document(html_file)
+        document.apply_placeholders({"Section Title": "text_0"})
+
+        assert document.soup.h2.string == "{{text_0}}"
+
+    @patch("src.main.settings")
+    def test_process_html_file_parses_once(self, mock_settings, temp_dir):
+        """Test that processing templates/index.html builds a single tree instead of two."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+
+        with patch("openai.OpenAI"):
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"),
+                output_dir=str(temp_dir / "output"),
+                parser="html.parser",
+            )
+        translator.translate_text_with_context = lambda text, lang, context: text
+
+        with patch.object(
+            BeautifulSoup, "__init__", autospec=True, side_effect=BeautifulSoup.__init__
+        ) as counted:
+            texts = translator.extract_text_from_html(INDEX_HTML)
+            translator.create_template(INDEX_HTML, {t: f"text_{i}" for i, t in enumerate(texts)})
+            separate_parses = counted.call_count
+
+            counted.reset_mock()
+            translator.process_html_file(INDEX_HTML, ["Spanish"])
+            single_pass_parses = counted.call_count
+
+        assert separate_parses == 2
+        assert single_pass_parses == 1
+        assert (temp_dir / "output" / "spanish_index.html").exists()
+
+    def test_backends_extract_the_same_texts(self, temp_dir):
+        """Test that every parser backend finds the same texts and skip rules."""
+        html_file = temp_dir / "page.html"
+        html_file.write_text(
+            "<!DOCTYPE html><html><head><title>Page &amp; title</title>"
+            "<meta property='og:title' content='Shared title'></head>"
+            "<body><p>Intro <b>bold words</b> outro text</p><br/>"
+            '<img alt = "Spaced alt text" src=a.png><input type=submit value=Subscribe>'
+            '<div translate="no"><p>Brand name</p></div><script>var x = "Hidden";</script>'
+            "<ul><li>First item<li>Second item</ul></body></html>",
+            encoding="utf-8",
+        )
+
+        texts = {backend: parse_document(html_file, backend).texts for backend in PARSER_BACKENDS}
+
+        assert texts["stream"] == texts["html.parser"] == texts["lxml"]
+        assert texts["stream"][:3] == ["Page & title", "Shared title", "Intro"]
+        assert "Subscribe" in texts["stream"] and "Brand name" not in texts["stream"]
+
+    def test_stream_backend_preserves_markup(self, temp_dir):
+        """Test that stream templates only differ from the source in their slots."""
+        source = (
+            "<!DOCTYPE html>\r\n<html>\r\n<head><TITLE>My  Page</TITLE></head>\r\n"
+            "<body class=main>\r\n  <p>\r\n    Hello <em>world</em>!\r\n  </p>\r\n"
+            "  <img src=x.png alt=Landscape><br>\r\n</body>\r\n</html>\r\n"
+        )
+        html_file = temp_dir / "page.html"
+        html_file.write_bytes(source.encode("utf-8"))
+
+        document = parse_document(html_file, "stream")
+        placeholders = {text: f"text_{i}" for i, text in enumerate(document.texts)}
+        document.apply_placeholders(placeholders)
+        template = document.serialize()
+
+        assert document.texts == ["My  Page", "Hello", "world", "Landscape"]
+        assert template == source.replace("My  Page", "{{text_0}}").replace(
+            "Hello <em>world", "{{text_1}} <em>{{text_2}}"
+        ).replace("alt=Landscape", 'alt="{{text_3}}"')
+
+        rendered = CompiledTemplate.compile(template, placeholders.values()).render(
+            {placeholder: text for text, placeholder in placeholders.items()}
+        )
+        assert rendered == source.replace("alt=Landscape", 'alt="Landscape"')
+
+    @patch("src.main.settings")
+    def test_translator_stream_backend_output(self, mock_settings, temp_dir, sample_html):
+        """Test that a stream-backend run keeps the page layout in the language files."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), parser="stream"
+        )
+        translator.translate_text_with_context = lambda text, lang, context: text.upper()
+        translator.process_html_file(html_file, ["Spanish"])
+
+        expected = sample_html
+        for text in translator.extract_text_from_html(html_file):
+            expected = expected.replace(text, text.upper())
+        spanish = (temp_dir / "output" / "spanish_index.html").read_text(encoding="utf-8")
+        assert spanish == expected
+
+    def test_backends_agree_on_large_page(self, temp_dir):
+        """Test that every backend extracts and templates a large page the same way."""
+        source = INDEX_HTML.read_text(encoding="utf-8")
+        body = source.split("<body>")[1].split("</body>")[0]
+        large_page = temp_dir / "large.html"
+        large_page.write_text(source.replace(body, body * 20), encoding="utf-8")
+
+        texts = {}
+        for backend in PARSER_BACKENDS:
+            document = parse_document(large_page, backend)
+            placeholders = {t: f"text_{i}" for i, t in enumerate(document.texts)}
+            document.apply_placeholders(placeholders)
+            template = document.serialize(prettify=backend == "html.parser")
+            texts[backend] = document.texts
+            assert all(f"{{{{{name}}}}}" in template for name in placeholders.values())
+
+        assert len({tuple(extracted) for extracted in texts.values()}) == 1
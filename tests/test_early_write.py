@@ -0,0 +1,107 @@
+"""
+Tests for per-language early write and streamed provider replies.
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+
+
+class TestEarlyWrite:
+    """Test cases for early_write and stream modes."""
+
+    def test_fast_language_is_written_before_slow_one_finishes(
+        self, make_translator, temp_dir, sample_html
+    ):
+        """Test that a finished language's file exists while another is still translating."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+        translator = make_translator(early_write=True, concurrency=4)
+        spanish_file = temp_dir / "output" / "spanish_index.html"
+        seen = []
+
+        def translate(text, target_language, context):
+            if target_language == "French":
+                # Hold French back until Spanish has been written, or give up
+                for _ in range(200):
+                    if spanish_file.exists():
+                        break
+                    threading.Event().wait(0.01)
+                seen.append(spanish_file.exists())
+            return f"{target_language}: {text}"
+
+        translator.translate_text_with_context = translate
+        translator.process_html_file(html_file, ["Spanish", "French"])
+
+        assert seen and all(seen)
+        assert "French: Section Title" in (temp_dir / "output" / "french_index.html").read_text(
+            encoding="utf-8"
+        )
+
+    def test_early_write_matches_regular_output(self, temp_dir, sample_html):
+        """Test that early write produces the same files in file and directory mode."""
+        (temp_dir / "input").mkdir()
+        for i in range(3):
+            (temp_dir / "input" / f"page{i}.html").write_text(
+                sample_html.replace("Section Title", f"Section Title {i}"), encoding="utf-8"
+            )
+
+        outputs = {}
+        for early_write, workers in ((False, 1), (True, 1), (True, 2)):
+            output_dir = temp_dir / f"output_{early_write}_{workers}"
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"),
+                output_dir=str(output_dir),
+                provider="mock",
+                early_write=early_write,
+                workers=workers,
+                concurrency=4,
+            )
+            translator.client = MockClient()
+            translator.process_input_directory(["Spanish", "French", "German"])
+            translator.process_html_file(temp_dir / "input" / "page0.html", ["Italian"])
+            outputs[(early_write, workers)] = {
+                path.name: path.read_text(encoding="utf-8") for path in output_dir.iterdir()
+            }
+
+        assert outputs[(False, 1)] == outputs[(True, 1)] == outputs[(True, 2)]
+        assert "italian_page0.html" in outputs[(True, 2)]
+
+    def test_streamed_replies_match_regular_replies(self, make_translator):
+        """Test that OpenAI-style streaming gives the same text and token usage."""
+        replies = {}
+        for stream in (False, True):
+            translator = make_translator(stream=stream)
+            replies[stream] = translator.translate_text_with_context(
+                "A fairly long sentence that spans several stream chunks.", "Spanish", "Context"
+            )
+            usage = translator.metrics.report()["providers"]["mock"]
+            assert usage["input_tokens"] > 0 and usage["output_tokens"] > 0
+
+        assert replies[True] == replies[False]
+        assert replies[True].startswith("[Spanish] A fairly long sentence")
+
+    @patch("src.main.settings")
+    def test_anthropic_streaming(self, mock_settings, temp_dir):
+        """Test that Anthropic replies are read from the message stream."""
+        mock_settings.AI_PROVIDER = "anthropic"
+        mock_settings.ANTHROPIC_API_KEY = "test-key"
+
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), stream=True
+        )
+        stream = MagicMock()
+        stream.text_stream = iter(["Hola ", "mundo "])
+        stream.get_final_message.return_value = SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=20, output_tokens=4)
+        )
+        translator.client = MagicMock()
+        translator.client.messages.stream.return_value.__enter__.return_value = stream
+
+        assert translator.translate_text_with_context("Hello world", "Spanish", "Ctx") == (
+            "Hola mundo"
+        )
+        assert translator.metrics.report()["providers"]["anthropic"]["input_tokens"] == 20
@@ -0,0 +1,68 @@
+"""
+Tests for the shared, tuned HTTP client of the provider SDKs.
+"""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src import http_client
+from src.main import LangdingTranslator
+
+
+class TestHttpClient:
+    """Test cases for build_http_client, shared_http_client and SDK wiring."""
+
+    @pytest.mark.parametrize(
+        "provider, sdk_class",
+        [("openai", "openai.OpenAI"), ("anthropic", "anthropic.Anthropic")],
+    )
+    @patch("src.main.settings")
+    def test_sdk_clients_use_shared_http_client(self, mock_settings, provider, sdk_class, temp_dir):
+        """Test that every provider client is built on the one shared HTTP client."""
+        mock_settings.AI_PROVIDER = provider
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.ANTHROPIC_API_KEY = "test-key"
+        shared = object()
+
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), concurrency=32
+        )
+        with (
+            patch("src.main.shared_http_client", return_value=shared) as mock_shared,
+            patch(sdk_class) as mock_sdk,
+        ):
+            translator.client
+
+        mock_shared.assert_called_once_with(32)
+        mock_sdk.assert_called_once_with(api_key="test-key", max_retries=0, http_client=shared)
+
+    def test_missing_httpx_falls_back_to_sdk_defaults(self):
+        """Test that no client is built when httpx cannot be imported."""
+        with patch.dict(sys.modules, {"httpx": None}):
+            assert http_client.build_http_client() is None
+
+    def test_shared_client_is_tuned_and_reused(self):
+        """Test pool limits, timeouts and that one client is shared until closed."""
+        httpx = pytest.importorskip("httpx")
+
+        with patch("src.http_client.settings") as mock_settings:
+            mock_settings.HTTP_MAX_CONNECTIONS = 10
+            mock_settings.HTTP_MAX_KEEPALIVE = 5
+            mock_settings.HTTP_KEEPALIVE_EXPIRY = 15.0
+            mock_settings.HTTP_TIMEOUT = 30.0
+            mock_settings.HTTP_CONNECT_TIMEOUT = 3.0
+            mock_settings.HTTP2 = False
+
+            with patch("httpx.Limits", wraps=httpx.Limits) as limits:
+                client = http_client.shared_http_client(max_connections=25)
+            assert http_client.shared_http_client() is client
+            http_client.close_http_client()
+
+        limits.assert_called_once_with(
+            max_connections=25, max_keepalive_connections=5, keepalive_expiry=15.0
+        )
+        assert client.timeout == httpx.Timeout(30.0, connect=3.0)
+        assert client.is_closed
+        assert http_client._client is None
@@ -81,7 +81,7 @@ class TestIntegration:
                 return mock_responses[target_lang]
             return text
 
-        with patch("src.main.OpenAI") as mock_openai_class:
+        with patch("openai.OpenAI") as mock_openai_class:
             mock_client = Mock()
             mock_openai_class.return_value = mock_client
 
@@ -116,7 +116,7 @@ class TestIntegration:
         mock_settings.AI_PROVIDER = "openai"
         mock_settings.OPENAI_API_KEY = "test-key"
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "nonexistent"), output_dir=str(temp_dir / "output")
             )
@@ -139,7 +139,7 @@ class TestIntegration:
         html_file = template_dir / "empty.html"
         html_file.write_text(empty_html, encoding="utf-8")
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"),
                 output_dir=str(temp_dir / "output"),
@@ -161,11 +161,11 @@ class TestIntegration:
 
         with (
             patch("sys.argv", test_args),
-            patch("src.main.OpenAI"),
+            patch("openai.OpenAI"),
             patch("src.main.LangdingTranslator") as mock_translator_class,
         ):
 
-            mock_translator = Mock()
+            mock_translator = Mock(schedulers={})
             mock_translator_class.return_value = mock_translator
 
             main()
@@ -188,11 +188,11 @@ class TestIntegration:
 
         with (
             patch("sys.argv", test_args),
-            patch("src.main.Anthropic"),
+            patch("anthropic.Anthropic"),
             patch("src.main.LangdingTranslator") as mock_translator_class,
         ):
 
-            mock_translator = Mock()
+            mock_translator = Mock(schedulers={})
             mock_translator_class.return_value = mock_translator
 
             main()
@@ -231,11 +231,11 @@ class TestIntegration:
 
         with (
             patch("sys.argv", test_args),
-            patch("src.main.OpenAI"),
+            patch("openai.OpenAI"),
             patch("src.main.LangdingTranslator") as mock_translator_class,
         ):
 
-            mock_translator = Mock()
+            mock_translator = Mock(schedulers={})
             mock_translator_class.return_value = mock_translator
 
             main()
@@ -258,7 +258,7 @@ class TestIntegration:
         html_file = template_dir / "invalid.html"
         html_file.write_text("Invalid HTML content", encoding="utf-8")
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"),
                 output_dir=str(temp_dir / "output"),
@@ -0,0 +1,99 @@
+"""
+Tests for the language registry and the redirect page built from it.
+"""
+
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from src.languages import LanguageRegistry, language_code
+from src.main import LangdingTranslator
+from src.negotiation import apache_type_map, page_entry
+
+# Runs the redirect script with a stubbed browser and prints the redirect target
+NODE_HARNESS = """
+const store = {};
+global.window = {location: {search: process.argv[1], href: ''}};
+global.localStorage = {getItem: (k) => store[k] || null, setItem: (k, v) => { store[k] = v; }};
+Object.defineProperty(global, 'navigator', {
+    value: {languages: JSON.parse(process.argv[2]), language: undefined},
+    configurable: true,
+});
+eval(require('fs').readFileSync(0, 'utf8'));
+console.log(window.location.href);
+"""
+
+
+class TestLanguages:
+    """Test cases for LanguageRegistry and the redirect page lookup."""
+
+    def test_language_codes(self):
+        """Test names, regional names and tags given as target languages."""
+        assert language_code("Spanish") == "es"
+        assert language_code("Brazilian Portuguese") == "pt-br"
+        assert language_code("pt_BR") == "pt-br"
+        assert language_code("Klingon") == "klingon"
+
+    def test_region_fallback(self):
+        """Test that regional tags fall back to their language and names resolve."""
+        registry = LanguageRegistry(["Spanish", "French", "English"])
+
+        assert registry.resolve("es-MX") == "spanish"
+        assert registry.resolve("fr_CA") == "french"
+        assert registry.resolve("SPANISH") == "spanish"
+        assert registry.resolve("zh-Hant-TW") is None
+        assert registry.default == "english"
+        assert registry.codes("spanish") == ["es"]
+
+    def test_regional_variants(self):
+        """Test that exact variants win and a lone variant serves its whole language."""
+        registry = LanguageRegistry(["Mexican Spanish", "Spanish", "Brazilian Portuguese"])
+
+        assert registry.resolve("es-MX") == "mexican spanish"
+        assert registry.resolve("es-AR") == "spanish"
+        assert registry.resolve("pt-PT") == "brazilian portuguese"
+        assert registry.tags == {
+            "es-mx": "mexican spanish",
+            "es": "spanish",
+            "pt-br": "brazilian portuguese",
+            "pt": "brazilian portuguese",
+        }
+        # Without English among the languages, the first one is the default
+        assert registry.default == "mexican spanish"
+
+        type_map = apache_type_map("index.html", page_entry(["Brazilian Portuguese"]))
+        assert "Content-Language: pt-br, pt" in type_map
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+    @pytest.mark.parametrize(
+        "search, languages, expected",
+        [
+            ("", ["es-MX", "en-US"], "spanish_index.html"),
+            ("", ["de-DE", "fr-FR"], "french_index.html"),
+            ("", ["ja-JP"], "english_index.html"),
+            ("?lang=fr", ["es-MX"], "french_index.html"),
+            ("?lang=spanish", ["fr"], "spanish_index.html"),
+        ],
+    )
+    def test_redirect_page_resolves_browser_languages(self, temp_dir, search, languages, expected):
+        """Test the redirect script of the generated page with browser languages."""
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), provider="mock"
+        )
+        translator.generate_redirect_file("index.html", ["Spanish", "French", "English"])
+        html = (temp_dir / "output" / "index.html").read_text(encoding="utf-8")
+        script = re.search(r"<script>(.*)</script>", html, re.DOTALL).group(1)
+
+        result = subprocess.run(
+            ["node", "-e", NODE_HARNESS, search, json.dumps(languages)],
+            input=script,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=True,
+        )
+
+        assert result.stdout.strip() == expected
@@ -58,14 +58,20 @@ class TestLogger:
         assert logger1 is logger2  # Same logger instance
 
     def test_logs_directory_creation(self):
-        """Test that logs directory is created."""
-        logs_dir = Path("logs")
+        """Test that the log directory and file are created on the first record."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logs_dir = Path(temp_dir) / "logs"
 
-        # Even if directory doesn't exist, setup_logger should create it
-        setup_logger("test_dir_creation", log_file="logs/test.log")
+            test_logger = setup_logger("test_dir_creation", log_file=str(logs_dir / "test.log"))
+            assert not logs_dir.exists()
 
-        assert logs_dir.exists()
-        assert logs_dir.is_dir()
+            # Even if directory doesn't exist, the first record creates it
+            test_logger.info("First record")
+            for handler in test_logger.handlers:
+                handler.close()
+
+            assert logs_dir.is_dir()
+            assert (logs_dir / "test.log").read_text(encoding="utf-8").endswith("First record\n")
 
     def test_global_logger_exists(self):
         """Test that global logger is available."""
@@ -101,7 +107,7 @@ class TestLogger:
 
             # Should not raise encoding errors
 
-    @patch("src.logger.logging.FileHandler")
+    @patch("src.logger.LazyFileHandler")
     @patch("src.logger.logging.StreamHandler")
     def test_handler_formatters(self, mock_stream_handler, mock_file_handler):
         """Test that proper formatters are applied to handlers."""
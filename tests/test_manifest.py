@@ -0,0 +1,131 @@
+"""
+Tests for the build manifest and incremental rebuilds.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from src.batching import Untranslated
+from src.manifest import BuildManifest, content_hash, file_hash
+
+
+@pytest.fixture
+def incremental_translator(make_translator):
+    """Factory of incremental translators with a recording translate mock."""
+
+    def make():
+        translator = make_translator(incremental=True)
+        translator.translate_text_with_context = Mock(
+            side_effect=lambda text, lang, context: f"{lang}: {text}"
+        )
+        return translator
+
+    return make
+
+
+class TestIncrementalBuild:
+    """Test cases for BuildManifest and incremental process_html_file."""
+
+    def test_manifest_up_to_date(self, temp_dir):
+        """Test hash and language-set checks of the manifest."""
+        manifest = BuildManifest(temp_dir)
+        manifest.record("index.html", "abc", ["Hello world"], ["Spanish", "French"])
+
+        reloaded = BuildManifest(temp_dir)
+        assert reloaded.is_up_to_date("index.html", "abc", ["French"])
+        assert not reloaded.is_up_to_date("index.html", "def", ["French"])
+        assert not reloaded.is_up_to_date("index.html", "abc", ["German"])
+        assert reloaded.known_strings("index.html") == {content_hash("Hello world")}
+
+    def test_unchanged_file_is_skipped(self, incremental_translator, temp_dir, sample_html):
+        """Test that a second run over an unchanged file makes no calls."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+
+        incremental_translator().process_html_file(html_file, ["Spanish"])
+
+        translator = incremental_translator()
+        translator.process_html_file(html_file, ["Spanish"])
+
+        translator.translate_text_with_context.assert_not_called()
+        manifest = json.loads((temp_dir / "output" / BuildManifest.FILENAME).read_text())
+        assert manifest["files"]["index.html"]["hash"] == file_hash(html_file)
+
+    def test_failed_strings_are_requested_again(
+        self, incremental_translator, temp_dir, sample_html
+    ):
+        """Test that strings kept in their source text are not reused by the next run."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+        failing = incremental_translator()
+        failing.translate_text_with_context.side_effect = lambda text, lang, context: (
+            Untranslated(text) if text == "Section content goes here." else f"{lang}: {text}"
+        )
+        failing.process_html_file(html_file, ["Spanish"])
+
+        manifest = BuildManifest(temp_dir / "output")
+        assert not manifest.is_up_to_date("index.html", file_hash(html_file), ["Spanish"])
+        assert content_hash("Section content goes here.") not in manifest.known_strings(
+            "index.html"
+        )
+
+        translator = incremental_translator()
+        translator.process_html_file(html_file, ["Spanish"])
+
+        sent = [call.args[0] for call in translator.translate_text_with_context.call_args_list]
+        assert sent == ["Section content goes here."]
+        spanish = (temp_dir / "output" / "spanish_index.html").read_text(encoding="utf-8")
+        assert "Spanish: Section content goes here." in spanish
+        manifest = BuildManifest(temp_dir / "output")
+        assert manifest.is_up_to_date("index.html", file_hash(html_file), ["Spanish"])
+
+    def test_identity_translations_are_reused(self, incremental_translator, temp_dir):
+        """Test that saved translations equal to their source text, e.g. names, are reused."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text("<p>GitHub Actions</p>", encoding="utf-8")
+        (temp_dir / "output").mkdir()
+        saved = {"GitHub Actions": {"Spanish": "GitHub Actions", "French": "GitHub Actions"}}
+        (temp_dir / "output" / "index_translations.json").write_text(json.dumps(saved))
+        BuildManifest(temp_dir / "output").record("index.html", "old", ["GitHub Actions"], [])
+
+        previous = incremental_translator()._previous_translations(html_file, ["GitHub Actions"])
+
+        assert previous == saved
+
+    def test_changed_file_only_translates_new_strings(
+        self, incremental_translator, temp_dir, sample_html
+    ):
+        """Test that only new strings of a changed file are sent to the provider."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+        incremental_translator().process_html_file(html_file, ["Spanish"])
+
+        html_file.write_text(
+            sample_html.replace("Section content goes here.", "Brand new section content."),
+            encoding="utf-8",
+        )
+        translator = incremental_translator()
+        translator.process_html_file(html_file, ["Spanish"])
+
+        sent = [call.args[0] for call in translator.translate_text_with_context.call_args_list]
+        assert sent == ["Brand new section content."]
+        spanish = (temp_dir / "output" / "spanish_index.html").read_text(encoding="utf-8")
+        assert "Spanish: Welcome to Our Website" in spanish
+        assert "Spanish: Brand new section content." in spanish
+
+    def test_new_language_only_translates_that_language(
+        self, incremental_translator, temp_dir, sample_html
+    ):
+        """Test that adding a language only issues calls for that language."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+        incremental_translator().process_html_file(html_file, ["Spanish"])
+
+        translator = incremental_translator()
+        translator.process_html_file(html_file, ["Spanish", "French"])
+
+        languages = {call.args[1] for call in translator.translate_text_with_context.call_args_list}
+        assert languages == {"French"}
+        assert (temp_dir / "output" / "french_index.html").exists()
@@ -0,0 +1,77 @@
+"""
+Tests for run instrumentation and the JSON / Prometheus run report.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.main import LangdingTranslator
+from src.metrics import PROMETHEUS_FILENAME, REPORT_FILENAME, RunMetrics, percentile, token_usage
+from src.mock_provider import MockClient
+
+
+class TestMetrics:
+    """Test cases for RunMetrics and translator instrumentation."""
+
+    def test_percentiles_and_token_usage(self):
+        """Test nearest-rank percentiles and usage of both SDK response shapes."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) == 0.0
+
+        openai_response = SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=3)
+        )
+        anthropic_response = SimpleNamespace(usage=SimpleNamespace(input_tokens=7, output_tokens=2))
+        assert token_usage(openai_response) == (12, 3)
+        assert token_usage(anthropic_response) == (7, 2)
+        assert token_usage(SimpleNamespace()) == (0, 0)
+
+    def test_report_and_prometheus_format(self):
+        """Test the report sections and the Prometheus exposition text."""
+        metrics = RunMetrics()
+        with metrics.stage("parse"):
+            pass
+        metrics.observe_request("openai", 0.2, 10, 4)
+        metrics.observe_request("openai", 0.4, failed=True)
+        metrics.increment("files_processed", 2)
+
+        report = metrics.report(scheduler={"openai": {"retries": 3}}, cache=None)
+        text = RunMetrics.to_prometheus(report)
+
+        assert report["stages"]["parse"]["count"] == 1
+        assert report["providers"]["openai"]["requests"] == 2
+        assert report["providers"]["openai"]["errors"] == 1
+        assert report["providers"]["openai"]["latency_seconds"]["p99"] == 0.4
+        assert "cache" not in report
+        assert 'langding_provider_request_seconds{provider="openai",quantile="0.5"} 0.2' in text
+        assert 'langding_provider_tokens_total{provider="openai",direction="input"} 10' in text
+        assert 'langding_scheduler_retries{provider="openai"} 3' in text
+        assert "langding_counters_files_processed 2" in text
+
+    @patch("src.main.settings")
+    def test_translator_writes_run_report(self, mock_settings, temp_dir, sample_html):
+        """Test that a run records every stage, latencies, tokens and retries."""
+        mock_settings.AI_PROVIDER = "mock"
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+
+        translator = LangdingTranslator(input_dir=str(temp_dir), output_dir=str(temp_dir / "out"))
+        translator.client = MockClient(rate_limit_rate=0.2, seed=3)
+        translator.scheduler.base_delay = translator.scheduler.max_delay = 0.0
+
+        translator.process_html_file(html_file, ["Spanish", "French"])
+        report_path = translator.write_run_report(prometheus=True)
+
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        assert report_path.name == REPORT_FILENAME
+        assert set(report["stages"]) == {"parse", "template", "translate", "render", "write"}
+        provider = report["providers"]["mock"]
+        assert provider["requests"] == translator.client.calls
+        assert provider["input_tokens"] > 0 and provider["output_tokens"] > 0
+        assert report["scheduler"]["mock"]["retries"] == translator.client.rate_limited > 0
+        assert (temp_dir / "out" / PROMETHEUS_FILENAME).exists()
@@ -0,0 +1,85 @@
+"""
+Tests for the offline mock provider and the throughput benchmark.
+"""
+
+from unittest.mock import patch
+
+from src.batching import BATCH_SYSTEM_PROMPT, build_batch_prompt
+from src.benchmark import make_corpus, run_benchmark
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient, MockProviderError, mock_reply
+from src.scheduler import RequestScheduler, is_rate_limited, is_retryable
+
+
+class TestMockProvider:
+    """Test cases for MockClient and the benchmark suite."""
+
+    def test_replies_are_deterministic(self):
+        """Test single and batch prompts get stable translations."""
+        batch_prompt = build_batch_prompt(['Say "hi"', "Bye"], "French", "Context")
+
+        assert mock_reply(batch_prompt) == '["[French] Say \\"hi\\"", "[French] Bye"]'
+
+        client = MockClient()
+        response = client.chat.completions.create(
+            model="mock",
+            messages=[
+                {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": batch_prompt},
+            ],
+        )
+        assert response.choices[0].message.content == mock_reply(batch_prompt)
+        assert client.calls == 1
+
+    def test_injected_failures_are_retried(self):
+        """Test that simulated 429s and 503s are transient errors for the scheduler."""
+        client = MockClient(rate_limit_rate=0.3, error_rate=0.3, seed=1)
+        errors = []
+        for _ in range(50):
+            try:
+                client.complete("hello")
+            except MockProviderError as e:
+                errors.append(e)
+
+        assert client.rate_limited > 0 and client.errors > 0
+        assert all(is_retryable(e) for e in errors)
+        assert any(is_rate_limited(e) for e in errors)
+
+        scheduler = RequestScheduler(0, 0, max_retries=20, sleep=lambda seconds: None)
+        reply = scheduler.submit(lambda: client.complete("hello"))
+        assert reply.choices[0].message.content == "hello"
+
+    @patch("src.main.settings")
+    def test_mock_provider_translates_directory(self, mock_settings, temp_dir, sample_html):
+        """Test a full directory run on the mock provider without API keys."""
+        mock_settings.AI_PROVIDER = "mock"
+        mock_settings.OPENAI_API_KEY = None
+
+        (temp_dir / "input").mkdir()
+        (temp_dir / "input" / "index.html").write_text(sample_html, encoding="utf-8")
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
+        )
+        translator.client = MockClient()
+
+        translator.process_input_directory(["Spanish"])
+
+        spanish = (temp_dir / "output" / "spanish_index.html").read_text(encoding="utf-8")
+        assert translator.provider == "mock"
+        assert "[Spanish] Welcome to Our Website" in spanish
+        assert translator.client.calls == len(
+            translator.extract_text_from_html(temp_dir / "input" / "index.html")
+        )
+
+    def test_benchmark_reports_throughput(self, temp_dir):
+        """Test that a small corpus benchmark reports pages/sec, calls/sec and peak memory."""
+        assert len(make_corpus(temp_dir / "corpus", 3)) == 3
+
+        result = run_benchmark(pages=5, languages=2, workdir=temp_dir, batch=True)
+
+        assert result["pages"] == 5
+        assert result["calls"] > 0
+        assert result["pages_per_sec"] > 0
+        assert result["calls_per_sec"] > 0
+        assert result["peak_memory_mb"] > 0
+        assert (temp_dir / "p5_l2" / "output" / "french_page_0004.html").exists()
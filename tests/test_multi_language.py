@@ -0,0 +1,133 @@
+"""
+Tests for multi-language requests returning every target language at once.
+"""
+
+import pytest
+
+from src.batching import (
+    MAX_REPLY_TOKENS,
+    BatchResponseError,
+    _multi_reply_tokens,
+    estimate_tokens,
+    parse_multi_response,
+    plan_batches,
+)
+from src.mock_provider import MockClient
+
+LANGUAGES = ["Spanish", "French", "German"]
+
+
+class TestMultiLanguage:
+    """Test cases for multi-language parsing, planning and translation."""
+
+    def test_parse_multi_response(self):
+        """Test parsing a reply keyed by language, with loose keys and a bare string."""
+        raw = '```json\n{"spanish": ["Hola", " Adiós "], "French": ["Salut", "Au revoir"]}\n```'
+
+        assert parse_multi_response(raw, ["Spanish", "French"], 2) == {
+            "Spanish": ["Hola", "Adiós"],
+            "French": ["Salut", "Au revoir"],
+        }
+        assert parse_multi_response('{"Spanish": "Hola"}', ["Spanish"], 1) == {"Spanish": ["Hola"]}
+
+    @pytest.mark.parametrize(
+        "raw",
+        ['["Hola", "Adiós"]', '{"Spanish": ["Hola", "Adiós"]}', '{"Spanish": ["Hola"], "French"'],
+    )
+    def test_parse_multi_response_malformed(self, raw):
+        """Test that replies missing a language or a translation are rejected."""
+        with pytest.raises(BatchResponseError):
+            parse_multi_response(raw, ["Spanish", "French"], 2)
+
+    def test_batches_share_token_bound_between_languages(self):
+        """Test that multi-language batches hold fewer source tokens per request."""
+        texts = ["x" * 40] * 6
+
+        assert plan_batches(texts, max_tokens=60, max_items=10) == [[0, 1, 2, 3, 4, 5]]
+        assert plan_batches(texts, max_tokens=60, max_items=10, languages=3) == [
+            [0, 1],
+            [2, 3],
+            [4, 5],
+        ]
+
+    def test_batches_fit_reply_limit_for_many_languages(self):
+        """Test that the expected reply of a batch for many languages is not truncated."""
+        texts = [f"Menu item {i}" for i in range(40)]
+        languages = [f"Language {i}" for i in range(12)]
+
+        batches = plan_batches(texts, languages=len(languages))
+
+        assert len(batches) > 1
+        for batch in batches:
+            tokens = sum(estimate_tokens(texts[index]) for index in batch)
+            assert _multi_reply_tokens(tokens, len(batch), len(languages)) <= MAX_REPLY_TOKENS
+
+    def test_one_request_per_text_for_all_languages(self, make_translator):
+        """Test that each text is requested once and split into every language."""
+        texts = ["Hello", "World"]
+        translator = make_translator(multi_language=True)
+
+        translations = translator.translate_texts(texts, LANGUAGES)
+
+        assert translator.client.calls == 2
+        assert translations == {
+            text: {lang: f"[{lang}] {text}" for lang in LANGUAGES} for text in texts
+        }
+
+    def test_batch_requests_only_missing_languages(self, make_translator, temp_dir):
+        """Test that texts are grouped by their missing languages in batch mode."""
+        texts = ["Hello", "World", "Contact"]
+        translator = make_translator(
+            multi_language=True, batch=True, cache_dir=str(temp_dir / "cache")
+        )
+        context = translator._translation_context("French")
+        translator.cache.set(translator._cache_key("Contact", "French", context), "Contactez")
+        existing = {"World": {"German": "Welt"}}
+
+        translations = translator.translate_texts(texts, LANGUAGES, existing)
+
+        # One request for the texts missing every language, one for "World"
+        assert translator.client.calls == 2
+        assert translations["World"] == {
+            "Spanish": "[Spanish] World",
+            "French": "[French] World",
+            "German": "Welt",
+        }
+        assert translations["Contact"]["French"] == "Contactez"
+
+        # Translations are cached per language, shared with single-language requests
+        spanish = translator._translation_context("Spanish")
+        translator.client.calls = 0
+        assert translator.translate_text_with_context("Hello", "Spanish", spanish) == (
+            "[Spanish] Hello"
+        )
+        assert translator.client.calls == 0
+
+    def test_malformed_reply_falls_back_per_language(self, make_translator):
+        """Test that an unparseable reply is retried with one request per language."""
+        translator = make_translator(multi_language=True, batch=True)
+        replies = iter(['{"Spanish": ["Hola"]}'])
+        original = translator._complete
+
+        def complete(system, prompt, max_tokens):
+            reply = next(replies, None)
+            return (reply, "mock") if reply is not None else original(system, prompt, max_tokens)
+
+        translator._complete = complete
+
+        translations = translator.translate_texts(["Hello"], LANGUAGES)
+
+        assert translations["Hello"] == {lang: f"[{lang}] Hello" for lang in LANGUAGES}
+        assert translator.client.calls == len(LANGUAGES)
+
+    def test_failed_request_is_not_split_per_language(self, make_translator):
+        """Test that a request failing after the scheduler's retries keeps its source texts."""
+        client = MockClient(error_rate=1.0)
+        translator = make_translator(client=client, multi_language=True)
+        translator.scheduler.max_retries = 1
+        translator.scheduler.base_delay = translator.scheduler.max_delay = 0.0
+
+        translations = translator.translate_multi(["Hello"], LANGUAGES)
+
+        assert translations == {lang: ["Hello"] for lang in LANGUAGES}
+        assert client.calls == 2
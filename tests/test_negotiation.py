@@ -0,0 +1,129 @@
+"""
+Tests for server-side language negotiation and the local negotiation server.
+"""
+
+import gzip
+import http.client
+import json
+import threading
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import pytest
+
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+from src.negotiation import (
+    TABLE_FILENAME,
+    NegotiationApp,
+    negotiate,
+    parse_accept_language,
+)
+
+LANGUAGES = {"es": "spanish", "fr": "french", "en": "english"}
+
+
+class _QuietHandler(WSGIRequestHandler):
+    """Request handler without access logs on stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def generated_site(temp_dir, sample_html):
+    """Output directory translated into three languages with every negotiation artifact."""
+    (temp_dir / "input").mkdir()
+    (temp_dir / "input" / "index.html").write_text(sample_html, encoding="utf-8")
+    translator = LangdingTranslator(
+        input_dir=str(temp_dir / "input"),
+        output_dir=str(temp_dir / "output"),
+        provider="mock",
+        precompress=["gzip"],
+        negotiation=["nginx", "apache", "wsgi"],
+    )
+    translator.client = MockClient(latency=0)
+    translator.process_input_directory(["Spanish", "French", "English"])
+    return temp_dir / "output"
+
+
+class TestNegotiation:
+    """Test cases for Accept-Language negotiation and the generated server configuration."""
+
+    def test_parse_accept_language(self):
+        """Test that ranges are ordered by quality and refused ranges are dropped."""
+        header = "fr;q=0.5, es-MX, de;q=0, en;q=0.8, *;q=0.1"
+
+        assert parse_accept_language(header) == ["es-mx", "en", "fr", "*"]
+        assert parse_accept_language("") == []
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("es-MX,es;q=0.9", "spanish"),
+            ("de-DE, fr;q=0.7", "french"),
+            ("de, it", "english"),
+            ("fr;q=0.2, es;q=0.4", "spanish"),
+            ("*", "english"),
+            ("", "english"),
+        ],
+    )
+    def test_negotiate(self, header, expected):
+        """Test region fallback, quality order and the default variant."""
+        assert negotiate(header, LANGUAGES, "english") == expected
+
+    def test_generated_server_configuration(self, generated_site):
+        """Test the table, nginx and Apache files written next to the redirect page."""
+        table = json.loads((generated_site / TABLE_FILENAME).read_text(encoding="utf-8"))
+        assert table["pages"]["index.html"] == {"default": "english", "languages": LANGUAGES}
+
+        nginx_map = (generated_site / "langding.nginx.map.conf").read_text(encoding="utf-8")
+        assert '"~*^es(?:[-,;]|$)" spanish;' in nginx_map
+        nginx = (generated_site / "langding.nginx.conf").read_text(encoding="utf-8")
+        assert "try_files /${langding_lang}_index.html /english_index.html =404;" in nginx
+
+        htaccess = (generated_site / ".htaccess").read_text(encoding="utf-8")
+        assert "LanguagePriority en es fr" in htaccess
+        assert "RewriteRule ^index\\.html$ index.html.var [L]" in htaccess
+        type_map = (generated_site / "index.html.var").read_text(encoding="utf-8")
+        assert "URI: french_index.html\nContent-Type: text/html; charset=utf-8\n" in type_map
+
+    def test_local_server_routes_accept_language(self, generated_site):
+        """Test that the first request is answered with the visitor's language."""
+        server = make_server(
+            "127.0.0.1", 0, NegotiationApp(generated_site), handler_class=_QuietHandler
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def get(path, headers):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            connection.close()
+            return response, body
+
+        try:
+            response, body = get("/index.html", {"Accept-Language": "es-MX,es;q=0.9"})
+            assert response.status == 200
+            assert body == (generated_site / "spanish_index.html").read_bytes()
+            assert response.getheader("Content-Language") == "es"
+            assert "Accept-Language" in response.getheader("Vary")
+
+            response, body = get("/", {"Accept-Language": "de, fr;q=0.8"})
+            assert body == (generated_site / "french_index.html").read_bytes()
+
+            response, body = get("/index.html", {"Accept-Language": "ja"})
+            assert body == (generated_site / "english_index.html").read_bytes()
+
+            response, body = get(
+                "/index.html", {"Accept-Language": "fr", "Accept-Encoding": "gzip"}
+            )
+            assert response.getheader("Content-Encoding") == "gzip"
+            assert gzip.decompress(body) == (generated_site / "french_index.html").read_bytes()
+
+            response, _ = get("/../secret.txt", {})
+            assert response.status == 404
+        finally:
+            server.shutdown()
+            server.server_close()
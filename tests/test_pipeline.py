@@ -0,0 +1,240 @@
+"""
+Tests for the per-file pipeline stages and process-pool directory mode.
+"""
+
+import tracemalloc
+from unittest.mock import Mock, patch
+
+from src.main import LangdingTranslator
+from src.pipeline import prepare_page, render_language_files, template_options
+
+
+def _catalog_page(sections: int) -> str:
+    """A generated page whose size grows with sections while its texts repeat."""
+    items = "".join(
+        f'<li class="item"><img alt="Product photo {i % 20}"><h3>Product {i % 20}</h3>'
+        f"<p>Description of the product number {i % 20}.</p></li>\r\n"
+        for i in range(sections)
+    )
+    return f"<!DOCTYPE html>\r\n<html><head><title>Catalog</title></head><body><ul>{items}</ul></body></html>"
+
+
+def _peak_memory(function, *args, **kwargs) -> int:
+    """Peak traced allocation in bytes while a function runs."""
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestPipeline:
+    """Test cases for prepare_page, render_language_files and parallel directories."""
+
+    def test_prepare_and_render_page(self, temp_dir, sample_html):
+        """Test the picklable stages used by the process pool."""
+        html_file = temp_dir / "index.html"
+        html_file.write_text(sample_html, encoding="utf-8")
+
+        page = prepare_page(html_file, temp_dir)
+        translations = {text: {"Spanish": text.upper()} for text in page.texts}
+        paths = render_language_files(
+            page.template_path, translations, ["Spanish"], page.placeholders_dict, temp_dir
+        )
+
+        assert page.template_path == temp_dir / "template_index.html"
+        assert paths == [temp_dir / "spanish_index.html"]
+        assert "WELCOME TO OUR WEBSITE" in paths[0].read_text(encoding="utf-8")
+
+    def test_template_defaults_follow_settings(self, make_translator):
+        """Test that a translator built in code templates pages like a CLI run."""
+        with patch("src.pipeline.settings") as mock_settings:
+            mock_settings.PARSER_BACKEND = "lxml"
+            mock_settings.PRETTIFY_TEMPLATES = True
+            translator = make_translator()
+
+            assert (translator.parser, translator.prettify) == ("lxml", True)
+            assert template_options("stream", False) == ("stream", False)
+
+    def test_streaming_matches_loaded_output(self, temp_dir):
+        """Test that chunked templating and rendering write the same files as loading them."""
+        html_file = temp_dir / "catalog.html"
+        html_file.write_text(_catalog_page(50), encoding="utf-8", newline="")
+        languages = ["Spanish", "French"]
+
+        outputs = {}
+        for chunk_size in (0, 7, 4096):
+            output_dir = temp_dir / f"output_{chunk_size}"
+            output_dir.mkdir()
+            page = prepare_page(html_file, output_dir, "stream", chunk_size=chunk_size)
+            translations = {
+                text: {lang: f"{lang} {text}" for lang in languages} for text in page.texts
+            }
+            render_language_files(
+                page.template_path,
+                translations,
+                languages,
+                page.placeholders_dict,
+                output_dir,
+                chunk_size,
+            )
+            outputs[chunk_size] = {
+                path.name: path.read_bytes() for path in sorted(output_dir.iterdir())
+            }
+
+        assert outputs[0] == outputs[7] == outputs[4096]
+        assert b"\r\n" in outputs[7]["french_catalog.html"]
+        (temp_dir / "empty.html").write_text("<html><body></body></html>", encoding="utf-8")
+        assert prepare_page(temp_dir / "empty.html", temp_dir, chunk_size=64).template_path is None
+        assert not (temp_dir / "template_empty.html").exists()
+
+    def test_translator_low_memory_mode(self, temp_dir, sample_html):
+        """Test that a chunked translator writes the same files as the stream parser."""
+        (temp_dir / "input").mkdir()
+        (temp_dir / "input" / "index.html").write_text(sample_html, encoding="utf-8")
+
+        outputs = {}
+        for options in ({"parser": "stream"}, {"chunk_size": 16}, {"chunk_size": 16, "workers": 2}):
+            output_dir = temp_dir / f"output_{len(outputs)}"
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"),
+                output_dir=str(output_dir),
+                provider="mock",
+                early_write=True,
+                **options,
+            )
+            translator.process_input_directory(["Spanish", "French"])
+            translator.process_html_file(temp_dir / "input" / "index.html", ["German"])
+            outputs[len(outputs)] = {
+                path.name: path.read_text(encoding="utf-8") for path in output_dir.iterdir()
+            }
+
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert "[German] Section Title" in outputs[1]["german_index.html"]
+
+    def test_streaming_memory_is_flat(self, temp_dir):
+        """Test that streaming peak memory stays flat as the document grows 16x."""
+        languages = ["Spanish", "French", "German"]
+        peaks = {}
+        for sections in (250, 4_000):
+            html_file = temp_dir / f"catalog_{sections}.html"
+            html_file.write_text(_catalog_page(sections), encoding="utf-8")
+
+            def run(chunk_size):
+                page = prepare_page(html_file, temp_dir, "stream", chunk_size=chunk_size)
+                translations = {
+                    text: {lang: f"{lang} {text}" for lang in languages} for text in page.texts
+                }
+                render_language_files(
+                    page.template_path,
+                    translations,
+                    languages,
+                    page.placeholders_dict,
+                    temp_dir,
+                    chunk_size,
+                )
+
+            peaks[sections] = (_peak_memory(run, 0), _peak_memory(run, 1 << 14))
+
+        assert peaks[4_000][1] < 2 * peaks[250][1]
+        assert peaks[4_000][1] < peaks[4_000][0] / 10
+
+    @patch("src.main.settings")
+    def test_parallel_directory_with_error_isolation(self, mock_settings, temp_dir, sample_html):
+        """Test that workers process a directory and a broken file only fails itself."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+
+        input_dir = temp_dir / "input"
+        input_dir.mkdir()
+        for name in ["a.html", "b.html", "c.html"]:
+            (input_dir / name).write_text(sample_html, encoding="utf-8")
+        (input_dir / "broken.html").write_bytes(b"\xff\xfe<p>not utf-8 \xff</p>")
+        (input_dir / "empty.html").write_text("<html></html>", encoding="utf-8")
+
+        with patch("openai.OpenAI"):
+            translator = LangdingTranslator(
+                input_dir=str(input_dir), output_dir=str(temp_dir / "output"), workers=2
+            )
+        translator.translate_text_with_context = Mock(
+            side_effect=lambda text, lang, context: f"{lang}: {text}"
+        )
+
+        with patch("src.main.logger") as mock_logger:
+            translator.process_input_directory(["Spanish", "French"])
+
+        for name in ["a", "b", "c"]:
+            assert (temp_dir / "output" / f"spanish_{name}.html").exists()
+            assert (temp_dir / "output" / f"french_{name}.html").exists()
+            assert (temp_dir / "output" / f"{name}_translations.json").exists()
+        assert not (temp_dir / "output" / "spanish_broken.html").exists()
+
+        messages = [call.args[0] for call in mock_logger.info.call_args_list]
+        assert any("Files: 3 processed, 1 skipped, 1 failed of 5" in m for m in messages)
+
+    @patch("src.main.settings")
+    def test_parallel_matches_sequential_output(self, mock_settings, temp_dir, sample_html):
+        """Test that the process pool produces the same files as a sequential run."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+
+        input_dir = temp_dir / "input"
+        input_dir.mkdir()
+        for i in range(3):
+            (input_dir / f"page{i}.html").write_text(
+                sample_html.replace("Section Title", f"Section Title {i}"), encoding="utf-8"
+            )
+
+        outputs = {}
+        for workers in (1, 3):
+            output_dir = temp_dir / f"output_{workers}"
+            with patch("openai.OpenAI"):
+                translator = LangdingTranslator(
+                    input_dir=str(input_dir), output_dir=str(output_dir), workers=workers
+                )
+            translator.translate_text_with_context = lambda text, lang, context: text[::-1]
+            translator.process_input_directory(["Spanish"])
+            outputs[workers] = {
+                path.name: path.read_text(encoding="utf-8") for path in output_dir.iterdir()
+            }
+
+        assert outputs[1] == outputs[3]
+
+    @patch("src.main.settings")
+    def test_shared_strings_translated_once(self, mock_settings, temp_dir):
+        """Test that strings shared across files are translated once per language."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+
+        input_dir = temp_dir / "input"
+        input_dir.mkdir()
+        for i in range(3):
+            (input_dir / f"page{i}.html").write_text(
+                "<html><body><h1>Shared navigation header</h1>"
+                f"<p>Unique content for page {i}</p>"
+                "<p>Shared footer text here</p></body></html>",
+                encoding="utf-8",
+            )
+
+        with patch("openai.OpenAI"):
+            translator = LangdingTranslator(
+                input_dir=str(input_dir), output_dir=str(temp_dir / "output")
+            )
+        translator.translate_text_with_context = Mock(
+            side_effect=lambda text, lang, context: f"{lang}: {text}"
+        )
+
+        with patch("src.main.logger") as mock_logger:
+            translator.process_input_directory(["Spanish", "French"])
+
+        sent = [call.args[:2] for call in translator.translate_text_with_context.call_args_list]
+        assert len(sent) == len(set(sent)) == 2 * 5
+        assert sent.count(("Shared footer text here", "Spanish")) == 1
+        for i in range(3):
+            page = (temp_dir / "output" / f"french_page{i}.html").read_text(encoding="utf-8")
+            assert "French: Shared footer text here" in page
+            assert f"French: Unique content for page {i}" in page
+
+        messages = [call.args[0] for call in mock_logger.info.call_args_list]
+        assert any("10 translation requests instead of 18, 8 saved" in m for m in messages)
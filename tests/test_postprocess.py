@@ -0,0 +1,113 @@
+"""
+Tests for minified and precompressed static output.
+"""
+
+import gzip
+import json
+from io import StringIO
+
+import pytest
+
+from src.main import LangdingTranslator
+from src.mock_provider import MockClient
+from src.postprocess import available_formats, compress_file, minify_html, minify_stream
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>  Tom &amp; Jerry  </title>
+    <style>
+      p  >  b { color: red; }
+    </style>
+</head>
+<body>
+    <!-- navigation -->
+    <p class="lead"  data-x="a  b">Hello   <b>big</b>
+        world&nbsp;!</p>
+    <pre>  keep
+   this </pre>
+    <!--[if IE]><p>Old browser</p><![endif]-->
+</body>
+</html>
+"""
+
+
+class TestPostprocess:
+    """Test cases for minification, precompression and output size reporting."""
+
+    def test_minify_keeps_meaningful_markup(self):
+        """Test that whitespace and comments go while content, attributes and pre stay."""
+        assert minify_html(PAGE) == (
+            '<!DOCTYPE html><html><head><meta charset="UTF-8"><title>Tom &amp; Jerry</title>'
+            "<style>\n      p  >  b { color: red; }\n    </style></head><body>"
+            '<p class="lead"  data-x="a  b">Hello <b>big</b> world&nbsp;!</p>'
+            "<pre>  keep\n   this </pre><!--[if IE]><p>Old browser</p><![endif]--></body></html>"
+        )
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64])
+    def test_minify_stream_matches_in_chunks(self, chunk_size):
+        """Test that the result does not depend on where chunks are cut."""
+        output = StringIO()
+        minify_stream(StringIO(PAGE), output, chunk_size)
+
+        assert output.getvalue() == minify_html(PAGE)
+
+    def test_gzip_is_deterministic(self, temp_dir):
+        """Test that .gz siblings decompress to the file and are reproducible."""
+        page = temp_dir / "spanish_index.html"
+        page.write_text(PAGE * 20, encoding="utf-8")
+
+        size = compress_file(page, "gzip")
+        first = (temp_dir / "spanish_index.html.gz").read_bytes()
+        compress_file(page, "gzip")
+
+        assert size == len(first) < page.stat().st_size
+        assert (temp_dir / "spanish_index.html.gz").read_bytes() == first
+        assert gzip.decompress(first) == page.read_bytes()
+
+    def test_brotli(self, temp_dir):
+        """Test that .br siblings decompress to the file when brotli is installed."""
+        brotli = pytest.importorskip("brotli")
+        page = temp_dir / "index.html"
+        page.write_text(PAGE, encoding="utf-8")
+
+        assert available_formats(["gzip", "br"]) == ["gzip", "br"]
+        compress_file(page, "br")
+        assert brotli.decompress((temp_dir / "index.html.br").read_bytes()) == page.read_bytes()
+
+    def test_translator_writes_minified_precompressed_output(self, temp_dir, sample_html):
+        """Test that generated files are minified, compressed and reported per language."""
+        (temp_dir / "input").mkdir()
+        (temp_dir / "input" / "index.html").write_text(sample_html, encoding="utf-8")
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir / "input"),
+            output_dir=str(temp_dir / "output"),
+            provider="mock",
+            minify=True,
+            precompress=["gzip", "unknown"],
+        )
+        translator.client = MockClient(latency=0)
+
+        translator.process_input_directory(["Spanish", "French"])
+
+        output = temp_dir / "output"
+        spanish = output / "spanish_index.html"
+        assert "\n" not in spanish.read_text(encoding="utf-8").strip()
+        for name in ("spanish_index.html", "french_index.html", "index.html"):
+            assert (
+                gzip.decompress((output / f"{name}.gz").read_bytes())
+                == (output / name).read_bytes()
+            )
+        assert not list(output.glob("*.br"))
+
+        report = json.loads(translator.write_run_report().read_text(encoding="utf-8"))
+        stats = report["output"]
+        assert set(stats) == {"Spanish", "French", "redirect"}
+        assert stats["Spanish"]["html_bytes"] == spanish.stat().st_size
+        assert stats["Spanish"]["original_bytes"] > stats["Spanish"]["html_bytes"]
+        assert stats["Spanish"]["gzip_bytes"] < stats["Spanish"]["html_bytes"]
+        assert stats["Spanish"]["gzip_saved_percent"] > stats["Spanish"]["html_saved_percent"] > 0
+        assert 'langding_output_bytes{language="Spanish",format="gzip"}' in (
+            translator.metrics.to_prometheus(report)
+        )
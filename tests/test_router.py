@@ -0,0 +1,144 @@
+"""
+Tests for provider failover, hedged requests and provider health reporting.
+"""
+
+import json
+from unittest.mock import patch
+
+from src.mock_provider import MockClient
+from src.router import ProviderRouter
+
+
+class TestRouter:
+    """Test cases for ProviderRouter and routed translation."""
+
+    def _translator(self, make_translator, mock_settings, primary, fallback, **kwargs):
+        """Create an OpenAI translator falling back to the mock provider, without backoff."""
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.OPENAI_MODEL = "gpt-4o-mini"
+        translator = make_translator(
+            provider="openai", fallback_provider="mock", client=primary, **kwargs
+        )
+        translator._fallback_client = fallback
+        for scheduler in translator.schedulers.values():
+            scheduler.base_delay = scheduler.max_delay = 0.0
+        return translator
+
+    def test_circuit_opens_after_error_streak(self):
+        """Test that consecutive errors open a circuit until the cooldown ends."""
+        now = [0.0]
+        router = ProviderRouter(["openai", "anthropic"], error_threshold=2, clock=lambda: now[0])
+
+        router.observe("openai", 0.1, failed=True)
+        router.observe("openai", 0.1)
+        router.observe("openai", 0.1, failed=True)
+        assert router.is_available("openai")
+
+        router.observe("openai", 0.1, failed=True)
+        assert not router.is_available("openai")
+        assert router._order() == ["anthropic", "openai"]
+
+        now[0] = 31.0
+        assert router.is_available("openai")
+        assert router.stats["openai"]["circuit_trips"] == 1
+        router.close()
+
+    def test_hedge_delay_follows_latency_percentile(self):
+        """Test that hedging starts once enough latencies are known."""
+        router = ProviderRouter(["openai", "anthropic"], hedge=True, hedge_min_samples=10)
+        for i in range(9):
+            router.observe("openai", 0.1 * (i + 1))
+        assert router.hedge_delay("openai") is None
+
+        router.observe("openai", 1.0)
+        assert router.hedge_delay("openai") == 1.0
+        router.hedge_percentile = 0.5
+        assert router.hedge_delay("openai") == 0.5
+        router.close()
+
+    @patch("src.main.settings")
+    def test_failover_to_second_provider(self, mock_settings, make_translator):
+        """Test that a failing provider is routed around and every text is still translated."""
+        primary = MockClient(error_rate=1.0)
+        translator = self._translator(make_translator, mock_settings, primary, MockClient())
+        texts = [f"Text number {i}" for i in range(5)]
+
+        translations = translator.translate_texts(texts, ["Spanish"])
+
+        assert all(translations[text]["Spanish"] == f"[Spanish] {text}" for text in texts)
+        stats = translator.router.stats
+        # The circuit opens after three failed attempts; later requests skip the provider
+        assert primary.calls == 3
+        assert stats["openai"]["circuit_trips"] == 1
+        assert stats["openai"]["failovers"] == 1
+        assert stats["mock"]["requests"] == translator._fallback_client.calls == 5
+        assert not stats["openai"]["available"]
+
+        # Both providers' schedulers are reported
+        report = json.loads(translator.write_run_report().read_text(encoding="utf-8"))
+        assert report["scheduler"]["openai"]["failures"] > 0
+        assert report["scheduler"]["mock"]["completed"] == 5
+
+    @patch("src.main.settings")
+    def test_slow_request_is_hedged(self, mock_settings, make_translator):
+        """Test that a reply slower than the latency percentile is raced on the other provider."""
+        primary = MockClient()
+        translator = self._translator(
+            make_translator, mock_settings, primary, MockClient(), hedge=True
+        )
+        translator.router.hedge_min_samples = 5
+        for i in range(5):
+            translator.translate_text_with_context(f"Warm up {i}", "Spanish", "Ctx")
+        reserved = []
+        reserve = translator.budget.reserve
+        translator.budget.reserve = lambda *args: reserved.append(args[2]) or reserve(*args)
+
+        primary.latency = 1.0
+        reply = translator.translate_text_with_context("Slow text", "Spanish", "Ctx")
+
+        assert reply == "[Spanish] Slow text"
+        stats = translator.router.stats["openai"]
+        assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+        assert reserved == ["gpt-4o-mini", "mock"]
+
+        report = json.loads(translator.write_run_report().read_text(encoding="utf-8"))
+        assert report["router"]["mock"]["requests"] == 1
+        assert report["providers"]["mock"]["requests"] == 1
+
+    @patch("src.main.settings")
+    def test_fallback_reply_is_cached_and_priced_for_its_provider(
+        self, mock_settings, make_translator, temp_dir
+    ):
+        """Test that a failed-over reply is cached and budgeted under the provider that answered."""
+        fallback = MockClient()
+        translator = self._translator(
+            make_translator,
+            mock_settings,
+            MockClient(error_rate=1.0),
+            fallback,
+            cache_dir=str(temp_dir / "cache"),
+            cost_budget=1.0,
+        )
+        reserved = []
+        reserve = translator.budget.reserve
+        translator.budget.reserve = lambda *args: reserved.append(args[2]) or reserve(*args)
+
+        assert (
+            translator.translate_text_with_context("Hello", "Spanish", "Ctx") == "[Spanish] Hello"
+        )
+
+        cache = translator.cache
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert cache.get(translator._cache_key("Hello", "Spanish", "Ctx", "mock")) is not None
+        assert cache.get(translator._cache_key("Hello", "Spanish", "Ctx")) is None
+        assert reserved == ["gpt-4o-mini", "mock"]
+        stats = translator.budget.stats
+        assert stats["requests"] == 1 and stats["cost_usd"] == 0.0
+
+        # The fallback's entry is served from the translation memory as one hit
+        hits, misses = cache.hits, cache.misses
+        assert (
+            translator.translate_text_with_context("Hello", "Spanish", "Ctx") == "[Spanish] Hello"
+        )
+        assert fallback.calls == 1
+        assert (cache.hits - hits, cache.misses - misses) == (1, 0)
@@ -0,0 +1,154 @@
+"""
+Tests for the rate-limit-aware request scheduler.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.main import LangdingTranslator
+from src.scheduler import RequestScheduler, TokenBucket, is_retryable
+
+
+class ProviderError(Exception):
+    """Provider error carrying an HTTP status code and response headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = Mock(headers=headers or {})
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock, rpm=0, tpm=0, max_retries=3):
+    """Create a scheduler driven by a fake clock."""
+    return RequestScheduler(
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        max_retries=max_retries,
+        base_delay=1.0,
+        max_delay=30.0,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+class TestScheduler:
+    """Test cases for TokenBucket and RequestScheduler."""
+
+    def test_token_bucket_refill(self):
+        """Test that an empty bucket reports the time until tokens are refilled."""
+        clock = FakeClock()
+        bucket = TokenBucket(per_minute=60, capacity=2, clock=clock)
+
+        assert bucket.reserve(2) == 0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        clock.now += 5
+        assert bucket.reserve(1) == 0
+
+    def test_request_budget_throttles(self):
+        """Test that requests above the per-minute budget wait for the bucket."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, rpm=60)
+        scheduler.requests = TokenBucket(per_minute=60, capacity=1, clock=clock)
+
+        for _ in range(3):
+            scheduler.submit(lambda: "ok")
+
+        assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+        assert scheduler.stats["throttled"] == 2
+
+    def test_retries_rate_limited_request(self):
+        """Test that a 429 is retried after a backoff that honours Retry-After."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock)
+        call = Mock(side_effect=[ProviderError(429, {"retry-after": "7"}), "ok"])
+
+        assert scheduler.submit(call) == "ok"
+
+        assert call.call_count == 2
+        assert clock.sleeps[0] >= 7
+        assert scheduler.stats["rate_limited"] == 1
+        assert scheduler.stats["retries"] == 1
+
+    def test_submit_async_retries_without_blocking(self):
+        """Test that coroutines are retried with the same backoff, waiting with asyncio.sleep."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock)
+        call = AsyncMock(side_effect=[ProviderError(429, {"retry-after": "7"}), "ok"])
+
+        with patch("src.scheduler.asyncio.sleep", new=AsyncMock()) as sleep:
+            assert asyncio.run(scheduler.submit_async(call)) == "ok"
+
+        assert call.await_count == 2
+        assert sleep.await_args_list[0].args[0] >= 7
+        assert clock.sleeps == []
+        assert scheduler.stats["rate_limited"] == 1
+        assert scheduler.stats["retries"] == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test that persistent transient errors are raised once retries are exhausted."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock, max_retries=2)
+        call = Mock(side_effect=ProviderError(503))
+
+        with pytest.raises(ProviderError):
+            scheduler.submit(call)
+
+        assert call.call_count == 3
+        assert scheduler.stats["failures"] == 1
+        assert all(0.5 <= delay <= 30 for delay in clock.sleeps)
+
+    def test_non_retryable_error_is_raised_immediately(self):
+        """Test that client errors are not retried."""
+        clock = FakeClock()
+        scheduler = _scheduler(clock)
+        call = Mock(side_effect=ProviderError(400))
+
+        with pytest.raises(ProviderError):
+            scheduler.submit(call)
+
+        call.assert_called_once()
+        assert not is_retryable(ValueError("bad"))
+        assert is_retryable(TimeoutError())
+
+    @patch("src.main.settings")
+    def test_translator_retries_through_scheduler(
+        self, mock_settings, temp_dir, mock_openai_response
+    ):
+        """Test that a throttled translation is retried instead of returning the source."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create.side_effect = [
+                ProviderError(429),
+                mock_openai_response,
+            ]
+            mock_openai_class.return_value = mock_client
+
+            translator = LangdingTranslator(
+                input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
+            )
+            translator.scheduler = _scheduler(FakeClock())
+
+            result = translator.translate_text_with_context("Hello", "Spanish", "Test context")
+
+            assert result == "Translated text"
+            assert translator.scheduler.stats["rate_limited"] == 1
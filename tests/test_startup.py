@@ -0,0 +1,64 @@
+"""
+Import cost and lazy loading tests.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from src.main import LangdingTranslator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("openai", "anthropic", "bs4")
+
+
+def _run(args, cwd=ROOT):
+    """Run a Python subprocess with dummy API keys and the repository on the path."""
+    env = {**os.environ, "OPENAI_API_KEY": "x", "ANTHROPIC_API_KEY": "x", "PYTHONPATH": str(ROOT)}
+    return subprocess.run(
+        [sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+
+
+class TestStartup:
+    """Test cases for import cost and deferred SDK loading."""
+
+    def test_import_loads_no_sdk_or_parser(self):
+        """Test that importing src.main loads no SDK or parser."""
+        result = _run(
+            [
+                "-c",
+                f"import sys, src.main; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])",
+            ]
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_help_has_no_side_effects(self, temp_dir):
+        """Test that --help neither loads an SDK nor creates the log directory."""
+        result = _run(["-X", "importtime", str(ROOT / "langding.py"), "--help"], cwd=temp_dir)
+
+        imported = {line.split("|")[2].strip() for line in result.stderr.splitlines()[1:]}
+        assert "usage:" in result.stdout
+        assert not imported.intersection(HEAVY_MODULES)
+        assert not (temp_dir / "logs").exists()
+
+    @patch("src.main.settings")
+    def test_cached_run_never_creates_client(self, mock_settings, temp_dir):
+        """Test that translations served from the cache do not build a provider client."""
+        mock_settings.AI_PROVIDER = "openai"
+        mock_settings.OPENAI_API_KEY = "test-key"
+        mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
+        translator = LangdingTranslator(
+            input_dir=str(temp_dir), output_dir=str(temp_dir / "output"), cache_dir=str(temp_dir)
+        )
+        translator.cache.set(translator._cache_key("Hello", "Spanish", "ctx"), "Hola")
+
+        with patch("openai.OpenAI") as mock_openai:
+            assert translator.translate_text_with_context("Hello", "Spanish", "ctx") == "Hola"
+
+        mock_openai.assert_not_called()
+        assert translator._client is None
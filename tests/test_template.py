@@ -0,0 +1,80 @@
+"""
+Tests and rendering benchmark for precompiled placeholder templates.
+"""
+
+import io
+
+from src.template import CompiledTemplate
+
+
+class TestCompiledTemplate:
+    """Test cases for CompiledTemplate."""
+
+    def test_compile_and_render(self):
+        """Test that slots are filled in one render."""
+        template = CompiledTemplate.compile("<h1>{{text_0}}</h1><p>{{text_1}} {{text_0}}</p>")
+
+        assert template.slots == ["text_0", "text_1", "text_0"]
+        assert template.render({"text_0": "Hola", "text_1": "Mundo"}) == (
+            "<h1>Hola</h1><p>Mundo Hola</p>"
+        )
+
+    def test_missing_values_and_unknown_markers_are_kept(self):
+        """Test that unfilled slots and non-placeholder markers stay in the output."""
+        template = CompiledTemplate.compile(
+            "{{text_0}} {{text_1}} {{ user }} {{other}}", ["text_0", "text_1"]
+        )
+
+        assert template.render({"text_0": "Hola"}) == "Hola {{text_1}} {{ user }} {{other}}"
+
+    def test_values_are_escaped_for_their_context(self):
+        """Test that text and attribute slots escape translated values."""
+        template = CompiledTemplate.compile('<img alt="{{text_0}}"><p>{{text_1}}</p>')
+
+        assert template.in_attribute == [True, False]
+        assert template.render({"text_0": 'Say "hi"', "text_1": "Fish & <chips>"}) == (
+            '<img alt="Say &quot;hi&quot;"><p>Fish &amp; &lt;chips&gt;</p>'
+        )
+
+    def test_render_to_streams_same_output(self):
+        """Test that streaming to a file matches the in-memory render."""
+        template = CompiledTemplate.compile("<p>{{text_0}}</p>" * 3)
+        buffer = io.StringIO()
+
+        template.render_to(buffer, {"text_0": "Bonjour"})
+
+        assert buffer.getvalue() == template.render({"text_0": "Bonjour"})
+
+    def test_compile_chunks_matches_whole_template(self):
+        """Test that chunked rendering equals a whole render at any chunk boundary."""
+        template_html = '<img alt="{{text_0}}"><p>{{text_1}} {{other}} {{text_0}}</p>{' * 3
+        values = {"text_0": 'Say "hi"', "text_1": "Fish & chips"}
+        expected = CompiledTemplate.compile(template_html, ["text_0", "text_1"]).render(values)
+
+        for chunk_size in (1, 2, 5, 11, 1 << 16):
+            pieces = CompiledTemplate.compile_chunks(
+                io.StringIO(template_html), ["text_0", "text_1"], chunk_size
+            )
+            assert "".join(piece.render(values) for piece in pieces) == expected
+
+    def test_matches_repeated_replace(self):
+        """Test that one compiled render per language equals one replace per placeholder."""
+        placeholders = [f"text_{i}" for i in range(300)]
+        template_html = "".join(
+            f"<section><h2>{{{{{name}}}}}</h2><p>{'Lorem ipsum dolor sit amet. ' * 20}</p></section>"
+            for name in placeholders
+        )
+        languages = [f"lang_{i}" for i in range(20)]
+        values = {lang: {name: f"{lang} {name}" for name in placeholders} for lang in languages}
+
+        replaced = {}
+        for lang in languages:
+            html = template_html
+            for name in placeholders:
+                html = html.replace(f"{{{{{name}}}}}", values[lang][name])
+            replaced[lang] = html
+
+        template = CompiledTemplate.compile(template_html, placeholders)
+        rendered = {lang: template.render(values[lang]) for lang in languages}
+
+        assert rendered == replaced
@@ -21,12 +21,19 @@ class TestLangdingTranslator:
         mock_settings.OPENAI_API_KEY = "test-key"
         mock_settings.ANTHROPIC_API_KEY = None
 
-        with patch("src.main.OpenAI") as mock_openai:
+        with patch("openai.OpenAI") as mock_openai:
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
             )
             assert translator.provider == "openai"
-            mock_openai.assert_called_once_with(api_key="test-key")
+            # The client is only created for the first request
+            mock_openai.assert_not_called()
+            assert translator.client is mock_openai.return_value
+            assert translator.client is mock_openai.return_value
+            mock_openai.assert_called_once()
+            assert mock_openai.call_args.kwargs["api_key"] == "test-key"
+            # Retries are left to the scheduler
+            assert mock_openai.call_args.kwargs["max_retries"] == 0
 
     @patch("src.main.settings")
     def test_init_anthropic_provider(self, mock_settings, temp_dir):
@@ -35,12 +42,19 @@ class TestLangdingTranslator:
         mock_settings.ANTHROPIC_API_KEY = "test-key"
         mock_settings.OPENAI_API_KEY = None
 
-        with patch("src.main.Anthropic") as mock_anthropic:
+        with patch("anthropic.Anthropic") as mock_anthropic:
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
             )
             assert translator.provider == "anthropic"
-            mock_anthropic.assert_called_once_with(api_key="test-key")
+            # The client is only created for the first request
+            mock_anthropic.assert_not_called()
+            assert translator.client is mock_anthropic.return_value
+            assert translator.client is mock_anthropic.return_value
+            mock_anthropic.assert_called_once()
+            assert mock_anthropic.call_args.kwargs["api_key"] == "test-key"
+            # Retries are left to the scheduler
+            assert mock_anthropic.call_args.kwargs["max_retries"] == 0
 
     @patch("src.main.settings")
     def test_init_missing_api_key(self, mock_settings, temp_dir):
@@ -59,7 +73,7 @@ class TestLangdingTranslator:
         mock_settings.AI_PROVIDER = "openai"
         mock_settings.OPENAI_API_KEY = "test-key"
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
             )
@@ -83,7 +97,7 @@ class TestLangdingTranslator:
         mock_settings.AI_PROVIDER = "openai"
         mock_settings.OPENAI_API_KEY = "test-key"
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
             )
@@ -115,7 +129,7 @@ class TestLangdingTranslator:
         mock_settings.OPENAI_API_KEY = "test-key"
         mock_settings.OPENAI_MODEL = "gpt-3.5-turbo"
 
-        with patch("src.main.OpenAI") as mock_openai_class:
+        with patch("openai.OpenAI") as mock_openai_class:
             mock_client = Mock()
             mock_client.chat.completions.create.return_value = mock_openai_response
             mock_openai_class.return_value = mock_client
@@ -136,7 +150,7 @@ class TestLangdingTranslator:
         mock_settings.ANTHROPIC_API_KEY = "test-key"
         mock_settings.ANTHROPIC_MODEL = "claude-3-haiku-20240307"
 
-        with patch("src.main.Anthropic") as mock_anthropic_class:
+        with patch("anthropic.Anthropic") as mock_anthropic_class:
             mock_client = Mock()
             mock_client.messages.create.return_value = mock_anthropic_response
             mock_anthropic_class.return_value = mock_client
@@ -156,7 +170,7 @@ class TestLangdingTranslator:
         mock_settings.AI_PROVIDER = "openai"
         mock_settings.OPENAI_API_KEY = "test-key"
 
-        with patch("src.main.OpenAI") as mock_openai_class:
+        with patch("openai.OpenAI") as mock_openai_class:
             mock_client = Mock()
             mock_client.chat.completions.create.side_effect = Exception("API Error")
             mock_openai_class.return_value = mock_client
@@ -176,7 +190,7 @@ class TestLangdingTranslator:
         mock_settings.AI_PROVIDER = "openai"
         mock_settings.OPENAI_API_KEY = "test-key"
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
             )
@@ -197,7 +211,7 @@ class TestLangdingTranslator:
         mock_settings.AI_PROVIDER = "openai"
         mock_settings.OPENAI_API_KEY = "test-key"
 
-        with patch("src.main.OpenAI"):
+        with patch("openai.OpenAI"):
             translator = LangdingTranslator(
                 input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output")
             )